@@ -7,30 +7,29 @@
 #include <stdbool.h>
 
 /**
- * @brief Calculates the LZ76 complexity of a single input string.
+ * @brief Counts the LZ76 phrases (dictionary size) of a single input string.
  *
  * This function implements the Lempel-Ziv 76 algorithm. It parses the input
- * string from left to right, building a dictionary of encountered substrings.
- * The complexity is the number of distinct substrings in this dictionary,
- * often normalized by log2 of the string length.
+ * string from left to right, building a dictionary of encountered substrings,
+ * and returns the number of distinct substrings in this dictionary.
  *
- * @param input_string The null-terminated C string to analyze.
- * @param length The length of the input string (excluding the null terminator).
- * @return The LZ76 complexity value. If length is 0 or input_string is NULL, returns 0.0.
- *         The result is dictionary_size * log2(length).
+ * @param input_string The string to analyze (only `length` bytes are read).
+ * @param length The length of the input string.
+ * @return The LZ76 phrase count, 0 if length is 0 or input_string is NULL,
+ *         or -1 if a memory allocation fails.
  */
-double lz76_complexity(const char* input_string, size_t length) {
-    if (!input_string || length == 0) return 0.0;
+static long long lz76_phrase_count(const char* input_string, size_t length) {
+    if (!input_string || length == 0) return 0;
     
     char* parsed = (char*)malloc((length + 1) * sizeof(char));
-    if (!parsed) return -1.0; // Error handling for malloc
+    if (!parsed) return -1; // Error handling for malloc
     size_t parsed_len = 0;
     size_t pos = 0;
     size_t dictionary_size = 0;
     char* current_word = (char*)malloc((length + 1) * sizeof(char));
     if (!current_word) { // Error handling for malloc
         free(parsed);
-        return -1.0;
+        return -1;
     }
     size_t current_len = 0;
     
@@ -48,7 +47,7 @@ double lz76_complexity(const char* input_string, size_t length) {
         if (!temp_dict_buffer) { // Error handling
             free(parsed);
             free(current_word);
-            return -1.0;
+            return -1;
         }
         size_t temp_dict_buffer_len = 0;
         
@@ -88,10 +87,153 @@ double lz76_complexity(const char* input_string, size_t length) {
     free(parsed);
     free(current_word);
     
-    if (length == 0) return 0.0; // Avoid log2(0) or log2(1) if desired (original returned log2(length))
+    return (long long)dictionary_size;
+}
+
+/**
+ * @brief Calculates the LZ76 complexity of a single input string.
+ *
+ * The complexity is the LZ76 phrase count (see `lz76_phrase_count`),
+ * normalized by log2 of the string length.
+ *
+ * @param input_string The null-terminated C string to analyze.
+ * @param length The length of the input string (excluding the null terminator).
+ * @return The LZ76 complexity value. If length is 0 or input_string is NULL, returns 0.0.
+ *         The result is dictionary_size * log2(length), or -1.0 on allocation failure.
+ */
+double lz76_complexity(const char* input_string, size_t length) {
+    if (!input_string || length == 0) return 0.0;
+    long long dictionary_size = lz76_phrase_count(input_string, length);
+    if (dictionary_size < 0) return -1.0;
     return dictionary_size * log2((double)length); // Cast length to double for log2
 }
 
+/**
+ * @brief Writes the L-bit binary representation of `value` (MSB first, ASCII '0'/'1') into `buffer`.
+ */
+static void write_binary_string(long long value, int L, char* buffer) {
+    for (int k = 0; k < L; k++) {
+        buffer[k] = ((value >> (L - 1 - k)) & 1) ? '1' : '0';
+    }
+}
+
+/**
+ * @brief Verifies LZ76 phrase counts of all 2^L binary strings of length L against expected values.
+ *
+ * String `i` is the L-bit binary representation of `i` (most significant bit first, as
+ * ASCII '0'/'1'). It is written into a stack buffer and its phrase count is computed
+ * with `lz76_phrase_count`, so no strings cross the library boundary. The strings are
+ * checked in parallel with OpenMP. Every thread records its first `max_report` mismatches
+ * while it checks its (ascending) share of the indices; these per-thread lists are then
+ * merged into the first `max_report` mismatching indices overall, in ascending order, so
+ * no string is parsed twice.
+ *
+ * With `stop_at_first`, the first thread to find a mismatch raises a shared flag and all
+ * threads skip their remaining strings. The result then only tells whether a mismatch
+ * exists: the count covers the strings checked so far, and the reported indices are the
+ * lowest of the mismatches found, not necessarily the first overall.
+ *
+ * @param L The length of the binary strings (1 <= L <= 30).
+ * @param expected_phrase_counts Array of 2^L expected phrase counts (e.g. from lz76_exhaustive_generate).
+ * @param max_report Maximum number of mismatches to report in the output arrays.
+ * @param first_mismatch_indices Output array (size >= max_report) for the first mismatching indices.
+ * @param first_mismatch_phrase_counts Output array (size >= max_report) for the phrase counts
+ *                                     computed here for those indices (-1 on allocation failure).
+ * @param n_threads The number of threads to use for parallel computation.
+ * @param stop_at_first If nonzero, stop checking as soon as any mismatch has been found.
+ * @return The total number of mismatches (of the strings checked, with `stop_at_first`),
+ *         or -1 if the arguments are invalid or the per-thread mismatch lists cannot be allocated.
+ */
+long long lz76_verify_exhaustive(int L, const int* expected_phrase_counts, int max_report,
+                                 long long* first_mismatch_indices, int* first_mismatch_phrase_counts,
+                                 int n_threads, int stop_at_first) {
+    if (L <= 0 || L > 30 || !expected_phrase_counts || max_report < 0) return -1;
+    if (max_report > 0 && (!first_mismatch_indices || !first_mismatch_phrase_counts)) return -1;
+
+    long long num_strings = 1LL << L;
+    long long mismatches = 0;
+    if (n_threads > 0) omp_set_num_threads(n_threads);
+
+    // Per-thread lists of the first `max_report` mismatches (slot t * max_report onwards).
+    int max_threads = omp_get_max_threads();
+    long long* thread_indices = NULL;
+    int* thread_phrase_counts = NULL;
+    int* thread_found = (int*)calloc((size_t)max_threads, sizeof(int));
+    if (!thread_found) return -1;
+    if (max_report > 0) {
+        thread_indices = (long long*)malloc((size_t)max_threads * (size_t)max_report * sizeof(long long));
+        thread_phrase_counts = (int*)malloc((size_t)max_threads * (size_t)max_report * sizeof(int));
+        if (!thread_indices || !thread_phrase_counts) {
+            free(thread_indices);
+            free(thread_phrase_counts);
+            free(thread_found);
+            return -1;
+        }
+    }
+
+    int stop = 0; // Raised by the first mismatch when stop_at_first is set
+
+    #pragma omp parallel
+    {
+        int tid = omp_get_thread_num();
+        int found = 0; // Mismatches recorded by this thread (at most max_report)
+
+        // Static schedule: every thread visits its indices in ascending order.
+        #pragma omp for schedule(static) reduction(+:mismatches)
+        for (long long i = 0; i < num_strings; i++) {
+            if (stop_at_first) {
+                int stop_now;
+                #pragma omp atomic read
+                stop_now = stop;
+                if (stop_now) continue; // An OpenMP loop cannot break; skip the remaining strings
+            }
+            char buffer[32];
+            write_binary_string(i, L, buffer);
+            long long phrase_count = lz76_phrase_count(buffer, (size_t)L);
+            if (phrase_count != expected_phrase_counts[i]) {
+                mismatches++;
+                if (stop_at_first) {
+                    #pragma omp atomic write
+                    stop = 1;
+                }
+                if (found < max_report) {
+                    thread_indices[(size_t)tid * max_report + found] = i;
+                    thread_phrase_counts[(size_t)tid * max_report + found] = (int)phrase_count;
+                    found++;
+                }
+            }
+        }
+        thread_found[tid] = found;
+    }
+
+    // Merge the ascending per-thread lists: the overall first `max_report` mismatches are
+    // each among the first `max_report` of the thread that checked them.
+    int* next = (int*)calloc((size_t)max_threads, sizeof(int));
+    int reported = 0;
+    while (next && reported < max_report) {
+        int best_thread = -1;
+        for (int t = 0; t < max_threads; t++) {
+            if (next[t] < thread_found[t] &&
+                (best_thread < 0 || thread_indices[(size_t)t * max_report + next[t]] <
+                                    thread_indices[(size_t)best_thread * max_report + next[best_thread]])) {
+                best_thread = t;
+            }
+        }
+        if (best_thread < 0) break; // All lists exhausted
+        size_t slot = (size_t)best_thread * max_report + next[best_thread]++;
+        first_mismatch_indices[reported] = thread_indices[slot];
+        first_mismatch_phrase_counts[reported] = thread_phrase_counts[slot];
+        reported++;
+    }
+    if (!next && mismatches > 0 && max_report > 0) mismatches = -1; // Could not merge the lists
+
+    free(next);
+    free(thread_indices);
+    free(thread_phrase_counts);
+    free(thread_found);
+    return mismatches;
+}
+
 /**
  * @brief Calculates LZ76 complexity for multiple strings in parallel using OpenMP.
  * @param input_strings An array of null-terminated C strings.
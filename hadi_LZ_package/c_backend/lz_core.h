@@ -30,6 +30,26 @@ extern "C" {
  */
 double lz76_complexity(const char* input_string, size_t length);
 
+/**
+ * @brief Verifies the LZ76 phrase counts of all 2^L binary strings against expected values.
+ *
+ * Generates every L-bit binary string (string `i` is `i` written MSB first as '0'/'1')
+ * inside C, computes its phrase count with the same parser as `lz76_complexity`, and
+ * compares it with `expected_phrase_counts[i]`. Only summary results are returned.
+ *
+ * @param L The length of the binary strings (1 <= L <= 30).
+ * @param expected_phrase_counts Array of 2^L expected phrase counts.
+ * @param max_report Maximum number of mismatches to report.
+ * @param first_mismatch_indices Output array (size >= max_report) for the first mismatching indices, ascending.
+ * @param first_mismatch_phrase_counts Output array (size >= max_report) for the phrase counts computed for them.
+ * @param n_threads The number of threads to use for parallel computation.
+ * @param stop_at_first If nonzero, stop at the first mismatch found (the count then covers only the strings checked).
+ * @return The total number of mismatches, or -1 if the arguments are invalid or an allocation fails.
+ */
+long long lz76_verify_exhaustive(int L, const int* expected_phrase_counts, int max_report,
+                                 long long* first_mismatch_indices, int* first_mismatch_phrase_counts,
+                                 int n_threads, int stop_at_first);
+
 // Parallel implementations
 /**
  * @brief Calculates LZ76 complexity for multiple strings in parallel.
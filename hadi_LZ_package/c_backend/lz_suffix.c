@@ -83,10 +83,11 @@ void free_lz_suffix_tree_c(LZSuffixTreeCState* lz_tree) {
  * Resets `current_word_len`, `dictionary_size`, `last_char_processed_by_lz`, 
  * `has_last_char_processed_by_lz`, and the LZ-specific active point (`lz_active_node`, etc.)
  * to their initial states for processing a new string.
- * If `reset_base_tree_also` is true, it also fully frees and re-creates the `base_tree`.
+ * If `reset_base_tree_also` is true, it also empties the `base_tree` (via `reset_suffix_tree_c`,
+ * which keeps its root node and text buffer allocated), or creates it if it is missing.
  *
  * @param lz_tree Pointer to the LZSuffixTreeCState to reset.
- * @param reset_base_tree_also If true, the `base_tree` is also reset (freed and re-created).
+ * @param reset_base_tree_also If true, the `base_tree` is also reset to an empty tree.
  *                             If false, the `base_tree` is assumed to be in a valid state (e.g., newly created).
  * @note Exits on failure if `reset_base_tree_also` is true and re-creation of `base_tree` fails.
  */
@@ -94,11 +95,11 @@ static void internal_reset_lz_state(LZSuffixTreeCState* lz_tree, bool reset_base
     if (!lz_tree) return;
 
     if (reset_base_tree_also) {
-        if (lz_tree->base_tree) { // If it exists, free and recreate
-            free_suffix_tree_c(lz_tree->base_tree);
-            lz_tree->base_tree = NULL; // Nullify before attempting re-creation
+        if (lz_tree->base_tree) { // If it exists, empty it in place (keeps its root node and text buffer)
+            reset_suffix_tree_c(lz_tree->base_tree);
+        } else {
+            lz_tree->base_tree = create_suffix_tree_c();
         }
-        lz_tree->base_tree = create_suffix_tree_c();
         if (!lz_tree->base_tree) {
             // This is a critical failure during a reset operation.
             perror("Failed to re-create base_tree during internal_reset_lz_state");
@@ -314,6 +315,23 @@ bool add_char_lz_c(LZSuffixTreeCState* lz_tree, char current_ch) {
     return added_new_phrase_to_dictionary;
 }
 
+// Documented in lz_suffix.h
+int add_string_lz_c(LZSuffixTreeCState* lz_tree, const char* s, size_t len, unsigned char* phrase_completed) {
+    if (!lz_tree || (!s && len > 0)) {
+        fprintf(stderr, "Error: add_string_lz_c called with NULL arguments.\n");
+        return 0;
+    }
+    int phrases_completed = 0;
+    for (size_t i = 0; i < len; ++i) {
+        bool completed = add_char_lz_c(lz_tree, s[i]);
+        if (phrase_completed) {
+            phrase_completed[i] = completed ? 1 : 0;
+        }
+        phrases_completed += completed;
+    }
+    return phrases_completed;
+}
+
 /**
  * @brief Retrieves the current LZ76 complexity (phrase count).
  *
@@ -374,4 +392,24 @@ void process_lz_batch_c(LZSuffixTreeCState* lz_tree_state, const char** strings_
         }
         results_array[i] = get_lz_complexity_c(lz_tree_state);
     }
-} 
\ No newline at end of file
+} 
+
+// Documented in lz_suffix.h
+int process_lz_batch_packed_c(LZSuffixTreeCState* lz_tree_state, const uint8_t* data, size_t row_stride,
+                              const int32_t* lengths, size_t num_strings, int32_t* results_array) {
+    if (!lz_tree_state || (num_strings > 0 && (!data || !lengths || !results_array))) {
+        fprintf(stderr, "Error: process_lz_batch_packed_c called with NULL arguments.\n");
+        return -1;
+    }
+
+    for (size_t i = 0; i < num_strings; ++i) {
+        if (lengths[i] < 0 || (size_t)lengths[i] > row_stride) {
+            fprintf(stderr, "Error: process_lz_batch_packed_c: length %d of row %zu is out of range.\n", (int)lengths[i], i);
+            return -1;
+        }
+        reset_lz_suffix_tree_c(lz_tree_state); // Full reset for each new string, including base_tree.
+        add_string_lz_c(lz_tree_state, (const char*)(data + i * row_stride), (size_t)lengths[i], NULL);
+        results_array[i] = get_lz_complexity_c(lz_tree_state);
+    }
+    return 0;
+}
@@ -4,6 +4,7 @@
 #include "online_suffix.h" // For SuffixTreeCState, NodeC, etc.
 #include <stdbool.h>
 #include <stddef.h> // For size_t
+#include <stdint.h> // For uint8_t, int32_t
 
 // Forward declaration of the main struct to handle circular dependency or for clarity
 typedef struct LZSuffixTreeCState LZSuffixTreeCState;
@@ -83,6 +84,21 @@ void free_lz_suffix_tree_c(LZSuffixTreeCState* lz_tree);
  */
 bool add_char_lz_c(LZSuffixTreeCState* lz_tree, char ch);
 
+/**
+ * @brief Adds `len` characters to the LZ76 state, as `len` calls to `add_char_lz_c`.
+ *
+ * Lets callers pass a whole string in a single call instead of one call per character.
+ *
+ * @param lz_tree Pointer to the LZSuffixTreeCState.
+ * @param s The characters to add (need not be null-terminated).
+ * @param len The number of characters in `s`.
+ * @param phrase_completed Optional output array of `len` bytes (may be NULL). Element `i` is set
+ *                         to 1 if adding `s[i]` completed a new LZ phrase (the return value of
+ *                         `add_char_lz_c`), 0 otherwise.
+ * @return The number of LZ phrases completed by these characters.
+ */
+int add_string_lz_c(LZSuffixTreeCState* lz_tree, const char* s, size_t len, unsigned char* phrase_completed);
+
 /**
  * @brief Retrieves the current LZ76 complexity (phrase count).
  *
@@ -130,5 +146,24 @@ void reset_lz_suffix_tree_c(LZSuffixTreeCState* lz_tree);
  */
 void process_lz_batch_c(LZSuffixTreeCState* lz_tree_state, const char** strings_array, int num_strings, int* results_array);
 
+/**
+ * @brief Processes a batch of strings packed as rows of one contiguous byte matrix.
+ *
+ * Same as `process_lz_batch_c`, but string `i` is the first `lengths[i]` bytes of row `i`
+ * (`data + i * row_stride`), so the caller passes one buffer instead of an array of
+ * null-terminated strings. Rows need not be null-terminated.
+ *
+ * @param lz_tree_state A pointer to an existing `LZSuffixTreeCState` (reset for each string).
+ * @param data Pointer to the first row of the matrix.
+ * @param row_stride Distance in bytes between the starts of consecutive rows.
+ * @param lengths Array of `num_strings` string lengths; each must be in [0, row_stride].
+ * @param num_strings The number of rows (strings) to process.
+ * @param results_array Pre-allocated array of `num_strings` int32 results.
+ * @return 0 on success, -1 if a pointer argument is NULL or a length is out of range
+ *         (results from the offending row on are not written).
+ */
+int process_lz_batch_packed_c(LZSuffixTreeCState* lz_tree_state, const uint8_t* data, size_t row_stride,
+                              const int32_t* lengths, size_t num_strings, int32_t* results_array);
+
 
 #endif // LZ_SUFFIX_H 
\ No newline at end of file
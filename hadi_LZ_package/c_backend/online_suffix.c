@@ -5,23 +5,34 @@
 
 // --- Static Helper Function Declarations ---
 
-static NodeC* new_node_c(void);
-static EdgeC* new_edge_c(int start, int end, NodeC* dest);
+static NodeC* new_node_c(SuffixTreeCState* tree);
+static EdgeC* new_edge_c(SuffixTreeCState* tree, int start, int end, NodeC* dest);
 // static int edge_length_c(EdgeC* edge, int current_global_end); // Now public via api_edge_length_c
 static EdgeC* find_child_edge_by_char_internal(NodeC* node, char ch_val); // Internal version
-static void set_child_edge_c(NodeC* node, char ch_val, EdgeC* edge_to_set);
+static void set_child_edge_c(SuffixTreeCState* tree, NodeC* node, char ch_val, EdgeC* edge_to_set);
 static void free_node_recursive_c(NodeC* node); // Renamed for clarity (C specific)
+static void free_children_c(NodeC* node);
+static void recycle_children_c(SuffixTreeCState* tree, NodeC* node);
+static void free_pools_c(SuffixTreeCState* tree);
 
 // --- Static Helper Function Implementations ---
 
 /**
  * @brief Allocates and initializes a new suffix tree node (NodeC).
- * Sets children_list and suffix_link to NULL.
+ * Sets children_list and suffix_link to NULL. A node recycled by `reset_suffix_tree_c`
+ * is taken from the tree's free list if available, otherwise a new one is malloc'd.
+ * @param tree The tree whose free list is used (may be NULL to always malloc).
  * @return Pointer to the newly allocated NodeC.
  * @note Exits program on malloc failure.
  */
-static NodeC* new_node_c(void) {
-    NodeC* node = (NodeC*)malloc(sizeof(NodeC));
+static NodeC* new_node_c(SuffixTreeCState* tree) {
+    NodeC* node;
+    if (tree && tree->free_nodes) { // Free nodes are chained through their suffix_link
+        node = tree->free_nodes;
+        tree->free_nodes = node->suffix_link;
+    } else {
+        node = (NodeC*)malloc(sizeof(NodeC));
+    }
     if (!node) {
         perror("Failed to allocate NodeC in new_node_c");
         exit(EXIT_FAILURE);
@@ -33,14 +44,22 @@ static NodeC* new_node_c(void) {
 
 /**
  * @brief Allocates and initializes a new suffix tree edge (EdgeC).
+ * Taken from the tree's free list if available, like `new_node_c`.
+ * @param tree The tree whose free list is used (may be NULL to always malloc).
  * @param start Start index of the edge label in the global text.
  * @param end End index of the edge label. Use INF_END for edges extending to current text end.
  * @param dest Pointer to the destination node of this edge.
  * @return Pointer to the newly allocated EdgeC.
  * @note Exits program on malloc failure.
  */
-static EdgeC* new_edge_c(int start, int end, NodeC* dest) {
-    EdgeC* edge = (EdgeC*)malloc(sizeof(EdgeC));
+static EdgeC* new_edge_c(SuffixTreeCState* tree, int start, int end, NodeC* dest) {
+    EdgeC* edge;
+    if (tree && tree->free_edges) { // Free edges are chained through their dest pointer
+        edge = tree->free_edges;
+        tree->free_edges = (EdgeC*)edge->dest;
+    } else {
+        edge = (EdgeC*)malloc(sizeof(EdgeC));
+    }
     if (!edge) {
         perror("Failed to allocate EdgeC in new_edge_c");
         exit(EXIT_FAILURE);
@@ -85,14 +104,16 @@ static EdgeC* find_child_edge_by_char_internal(NodeC* node, char ch_val) {
  * The old `EdgeC` object pointed to by the `ChildEntry` is NOT freed by this function; 
  * in Ukkonen\'s algorithm, splits often mean the old edge object is effectively replaced or becomes part of a new structure,
  * and its components are reused or explicitly freed elsewhere (e.g. `found_edge` in `add_char_c` split case).
- * If no edge starts with `ch_val`, a new `ChildEntry` is allocated and added to the list.
+ * If no edge starts with `ch_val`, a new `ChildEntry` is allocated (or taken from the tree's
+ * free list) and added to the list.
  *
+ * @param tree The tree whose free list is used (may be NULL to always malloc).
  * @param node The parent NodeC whose children list is to be modified.
  * @param ch_val The character representing the first char of the edge.
  * @param edge_to_set Pointer to the EdgeC to associate with `ch_val`.
  * @note Exits program on malloc failure for a new ChildEntry.
  */
-static void set_child_edge_c(NodeC* node, char ch_val, EdgeC* edge_to_set) {
+static void set_child_edge_c(SuffixTreeCState* tree, NodeC* node, char ch_val, EdgeC* edge_to_set) {
     if (!node) return;
 
     ChildEntry* current_entry = node->children_list;
@@ -113,7 +134,13 @@ static void set_child_edge_c(NodeC* node, char ch_val, EdgeC* edge_to_set) {
     }
 
     // No existing entry for ch_val, create and add a new ChildEntry.
-    ChildEntry* new_child_entry = (ChildEntry*)malloc(sizeof(ChildEntry));
+    ChildEntry* new_child_entry;
+    if (tree && tree->free_entries) { // Free entries are chained through their next pointer
+        new_child_entry = tree->free_entries;
+        tree->free_entries = new_child_entry->next;
+    } else {
+        new_child_entry = (ChildEntry*)malloc(sizeof(ChildEntry));
+    }
     if (!new_child_entry) {
         perror("Failed to allocate ChildEntry in set_child_edge_c");
         exit(EXIT_FAILURE);
@@ -150,7 +177,12 @@ SuffixTreeCState* create_suffix_tree_c(void) {
     tree->text[0] = '\0'; // Initialize with empty string representation if needed, though text_len=0 is key.
     tree->text_len = 0;
 
-    tree->root = new_node_c();
+    // Free lists of nodes, edges and child entries recycled by reset_suffix_tree_c.
+    tree->free_nodes = NULL;
+    tree->free_edges = NULL;
+    tree->free_entries = NULL;
+
+    tree->root = new_node_c(NULL);
     tree->active_node = tree->root; 
     tree->active_edge_char_index = -1; // Or some indicator of not being on an edge char; text[0] may be valid.
                                      // This is the start index in `text` of the edge implicitly traversed from active_node.
@@ -166,11 +198,11 @@ SuffixTreeCState* create_suffix_tree_c(void) {
 }
 
 /**
- * @brief Recursively frees a node and its descendants (edges and child nodes).
- * This function performs a post-order traversal to free tree resources.
- * @param node The node to start freeing from.
+ * @brief Recursively frees all descendants (edges, child entries and child nodes) of a node.
+ * The node itself is kept, with an empty children list.
+ * @param node The node whose descendants are freed.
  */
-static void free_node_recursive_c(NodeC* node) {
+static void free_children_c(NodeC* node) {
     if (!node) return;
 
     ChildEntry* current_child_entry = node->children_list;
@@ -187,6 +219,70 @@ static void free_node_recursive_c(NodeC* node) {
         free(current_child_entry); // Free the ChildEntry list node.
         current_child_entry = next_child_entry;
     }
+    node->children_list = NULL;
+}
+
+/**
+ * @brief Moves all descendants (edges, child entries and child nodes) of a node onto the
+ * tree's free lists instead of freeing them. The node itself is kept, with an empty children list.
+ * @param tree The tree owning the free lists.
+ * @param node The node whose descendants are recycled.
+ */
+static void recycle_children_c(SuffixTreeCState* tree, NodeC* node) {
+    if (!node) return;
+
+    ChildEntry* current_child_entry = node->children_list;
+    while (current_child_entry != NULL) {
+        ChildEntry* next_child_entry = current_child_entry->next;
+
+        EdgeC* edge = current_child_entry->edge;
+        if (edge) {
+            NodeC* child = edge->dest;
+            if (child) {
+                recycle_children_c(tree, child);
+                child->suffix_link = tree->free_nodes;
+                tree->free_nodes = child;
+            }
+            edge->dest = (NodeC*)tree->free_edges;
+            tree->free_edges = edge;
+        }
+        current_child_entry->next = tree->free_entries;
+        tree->free_entries = current_child_entry;
+        current_child_entry = next_child_entry;
+    }
+    node->children_list = NULL;
+}
+
+/**
+ * @brief Releases the nodes, edges and child entries held on the tree's free lists.
+ * @param tree The tree owning the free lists.
+ */
+static void free_pools_c(SuffixTreeCState* tree) {
+    while (tree->free_nodes) {
+        NodeC* next = tree->free_nodes->suffix_link;
+        free(tree->free_nodes);
+        tree->free_nodes = next;
+    }
+    while (tree->free_edges) {
+        EdgeC* next = (EdgeC*)tree->free_edges->dest;
+        free(tree->free_edges);
+        tree->free_edges = next;
+    }
+    while (tree->free_entries) {
+        ChildEntry* next = tree->free_entries->next;
+        free(tree->free_entries);
+        tree->free_entries = next;
+    }
+}
+
+/**
+ * @brief Recursively frees a node and its descendants (edges and child nodes).
+ * This function performs a post-order traversal to free tree resources.
+ * @param node The node to start freeing from.
+ */
+static void free_node_recursive_c(NodeC* node) {
+    if (!node) return;
+    free_children_c(node);
     free(node); // Finally, free the node itself.
 }
 
@@ -204,10 +300,28 @@ void free_suffix_tree_c(SuffixTreeCState* tree) {
         free_node_recursive_c(tree->root);
         tree->root = NULL; // Mark as freed
     }
+    free_pools_c(tree); // Nodes, edges and entries recycled by earlier resets
     
     free(tree); // Free the main state structure.
 }
 
+// Documented in online_suffix.h
+void reset_suffix_tree_c(SuffixTreeCState* tree) {
+    if (!tree || !tree->root) return;
+    // Recycle everything below the root onto the free lists (new_node_c, new_edge_c and
+    // set_child_edge_c take from them before calling malloc); the root node and the text
+    // buffer (with its current capacity) are kept for the next string.
+    recycle_children_c(tree, tree->root);
+    tree->root->suffix_link = tree->root;
+
+    tree->text[0] = '\0';
+    tree->text_len = 0;
+    tree->active_node = tree->root;
+    tree->active_edge_char_index = -1;
+    tree->active_length = 0;
+    tree->remainder = 0;
+}
+
 
 // Documented in online_suffix.h
 void add_char_c(SuffixTreeCState* tree, char ch) {
@@ -263,9 +377,9 @@ void add_char_c(SuffixTreeCState* tree, char ch) {
 
         if (active_edge_object == NULL) { // Rule 2: No edge from active_node starts with char_to_test_on_edge_from_active_node.
                                           // This means we must insert a new leaf edge from active_node for `ch`.
-            NodeC* new_leaf = new_node_c();
-            EdgeC* new_e = new_edge_c(current_global_end, INF_END, new_leaf);
-            set_child_edge_c(tree->active_node, ch, new_e); // The edge starts with `ch`.
+            NodeC* new_leaf = new_node_c(tree);
+            EdgeC* new_e = new_edge_c(tree, current_global_end, INF_END, new_leaf);
+            set_child_edge_c(tree, tree->active_node, ch, new_e); // The edge starts with `ch`.
 
             if (last_new_internal_node != NULL) { // If a previous split created an internal node.
                 last_new_internal_node->suffix_link = tree->active_node;
@@ -298,36 +412,37 @@ void add_char_c(SuffixTreeCState* tree, char ch) {
             }
 
             // Rule 2 (Mismatch): Split is required. Current char `ch` differs from char on edge.
-            NodeC* new_internal_split_node = new_node_c();
+            NodeC* new_internal_split_node = new_node_c(tree);
             
             // 1. Create new edge from active_node to new_internal_split_node.
             //    This edge label is the part of original active_edge_object before the split point.
-            EdgeC* edge_to_split = new_edge_c(
+            EdgeC* edge_to_split = new_edge_c(tree,
                 active_edge_object->start, // Starts same as original edge
                 active_edge_object->start + tree->active_length - 1, // Ends just before the mismatch
                 new_internal_split_node
             );
-            set_child_edge_c(tree->active_node, tree->text[active_edge_object->start], edge_to_split);
+            set_child_edge_c(tree, tree->active_node, tree->text[active_edge_object->start], edge_to_split);
 
             // 2. Create new leaf edge from new_internal_split_node for the current char `ch`.
             //    This represents the new suffix ending at `ch`.
-            NodeC* new_leaf_for_ch = new_node_c();
-            EdgeC* new_leaf_edge_from_split = new_edge_c(current_global_end, INF_END, new_leaf_for_ch);
-            set_child_edge_c(new_internal_split_node, ch, new_leaf_edge_from_split);
+            NodeC* new_leaf_for_ch = new_node_c(tree);
+            EdgeC* new_leaf_edge_from_split = new_edge_c(tree, current_global_end, INF_END, new_leaf_for_ch);
+            set_child_edge_c(tree, new_internal_split_node, ch, new_leaf_edge_from_split);
 
             // 3. Create edge from new_internal_split_node for the remainder of the original active_edge_object.
             //    This edge starts with the character that caused the mismatch on the original edge.
             char char_after_split_on_original_edge = tree->text[active_edge_object->start + tree->active_length];
-            EdgeC* continuation_of_original_edge = new_edge_c(
+            EdgeC* continuation_of_original_edge = new_edge_c(tree,
                 active_edge_object->start + tree->active_length, // Starts at mismatch point
                 active_edge_object->end,           // Original end (could be INF_END)
                 active_edge_object->dest           // Original destination node
             );
-            set_child_edge_c(new_internal_split_node, char_after_split_on_original_edge, continuation_of_original_edge);
+            set_child_edge_c(tree, new_internal_split_node, char_after_split_on_original_edge, continuation_of_original_edge);
             
             // The original active_edge_object is now replaced by edge_to_split and its components are reused or form new structures.
-            // The EdgeC structure pointed to by active_edge_object itself should be freed.
-            free(active_edge_object);
+            // The EdgeC structure pointed to by active_edge_object itself is recycled.
+            active_edge_object->dest = (NodeC*)tree->free_edges;
+            tree->free_edges = active_edge_object;
 
             // Set suffix link for previously created internal node (if any).
             if (last_new_internal_node != NULL) {
@@ -363,6 +478,14 @@ void add_char_c(SuffixTreeCState* tree, char ch) {
     }
 }
 
+// Documented in online_suffix.h
+void add_string_c(SuffixTreeCState* tree, const char* s, size_t len) {
+    if (!tree || (!s && len > 0)) return;
+    for (size_t i = 0; i < len; ++i) {
+        add_char_c(tree, s[i]);
+    }
+}
+
 // Documented in online_suffix.h
 bool find_c(SuffixTreeCState* tree, const char* pattern) {
     if (!tree || !pattern || !tree->root) return false;
@@ -67,6 +67,10 @@ struct SuffixTreeCState {
                                  *   If 0, we are exactly at `active_node`. */
     int remainder;              /**< (Ukkonen) The number of suffixes that still need to be explicitly added to the tree in the current phase. */
 
+    NodeC* free_nodes;          /**< Nodes recycled by `reset_suffix_tree_c`, chained through `suffix_link`. */
+    EdgeC* free_edges;          /**< Edges recycled by `reset_suffix_tree_c` or splits, chained through `dest`. */
+    ChildEntry* free_entries;   /**< Child entries recycled by `reset_suffix_tree_c`, chained through `next`. */
+
     // Note: global_end in Ukkonen\'s algorithm corresponds to (text_len - 1) here.
 };
 
@@ -87,6 +91,16 @@ SuffixTreeCState* create_suffix_tree_c(void);
  */
 void free_suffix_tree_c(SuffixTreeCState* tree);
 
+/**
+ * @brief Resets a SuffixTreeCState to the empty tree without releasing its root node or text buffer.
+ * All nodes, edges and child entries below the root are moved onto the tree's free lists and
+ * reused by later insertions instead of being freed; the text buffer keeps its capacity. Reusing
+ * one state for many strings therefore avoids malloc/free per node once the pools are warm.
+ * Everything is released by `free_suffix_tree_c`.
+ * @param tree Pointer to the SuffixTreeCState to reset. If NULL, the function does nothing.
+ */
+void reset_suffix_tree_c(SuffixTreeCState* tree);
+
 /**
  * @brief Adds a character to the suffix tree, updating it online using Ukkonen\'s algorithm.
  * @param tree Pointer to the SuffixTreeCState to be updated.
@@ -95,6 +109,15 @@ void free_suffix_tree_c(SuffixTreeCState* tree);
  */
 void add_char_c(SuffixTreeCState* tree, char ch);
 
+/**
+ * @brief Adds `len` characters to the suffix tree, as `len` calls to `add_char_c`.
+ * Lets callers pass a whole string in a single call instead of one call per character.
+ * @param tree Pointer to the SuffixTreeCState to be updated.
+ * @param s The characters to add (need not be null-terminated; may contain '\0').
+ * @param len The number of characters in `s`.
+ */
+void add_string_c(SuffixTreeCState* tree, const char* s, size_t len);
+
 /**
  * @brief Checks if a given pattern string exists as a substring in the text represented by the suffix tree.
  * @param tree Pointer to the SuffixTreeCState.
@@ -18,6 +18,68 @@ import os
 import sys
 import numpy as np # For creating the results array easily
 
+# The loaded and configured `lz_exhaustive` library, shared by all calculator instances
+# so the shared object is opened and its prototypes are configured only once per process.
+_c_lib = None
+
+def _load_c_lib() -> ctypes.CDLL:
+    """Loads the `lz_exhaustive` C library and configures its prototypes (once per process).
+
+    Returns:
+        The cached `ctypes.CDLL` object.
+
+    Raises:
+        OSError: If the C shared library (`lz_exhaustive`) cannot be loaded.
+        AttributeError: If required C functions are not found in the library.
+    """
+    global _c_lib
+    if _c_lib is not None:
+        return _c_lib
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # This library will only contain lz_exhaustive.c object code
+    lib_filename = "lz_exhaustive.so"
+    if os.name == 'nt':
+        lib_filename = "lz_exhaustive.dll"
+    elif sys.platform == 'darwin':
+        lib_filename = "lz_exhaustive.dylib"
+
+    lib_path = os.path.join(script_dir, "c_backend", lib_filename)
+
+    try:
+        c_lib = ctypes.CDLL(lib_path)
+    except OSError as e:
+        lz_exhaustive_c_path = os.path.join("c_backend", "lz_exhaustive.c")
+        output_lib_path = os.path.join("c_backend", lib_filename)
+        error_message = (
+            f"Failed to load C library '{lib_filename}' from {lib_path}.\n"
+            f"Please ensure it is compiled (e.g., using 'make' in c_backend directory).\n"
+            f"Source: '{lz_exhaustive_c_path}'. Target: '{output_lib_path}'.\n"
+            f"Example compilation (ensure OpenMP flags if needed, see Makefile):\n"
+            f"  gcc -shared -o '{output_lib_path}' -fPIC '{lz_exhaustive_c_path}' -fopenmp\n"
+            f"Original error: {e}"
+        )
+        raise OSError(error_message)
+
+    # Configure C function prototype from lz_exhaustive.h
+    c_lib.lz76_exhaustive_generate.restype = None
+    c_lib.lz76_exhaustive_generate.argtypes = [
+        ctypes.c_int,                      # L
+        ctypes.POINTER(ctypes.c_int)       # phrase_counts_output
+    ]
+
+    c_lib.lz76_exhaustive_distribution.restype = None
+    c_lib.lz76_exhaustive_distribution.argtypes = [
+        ctypes.c_int,                        # L
+        ctypes.POINTER(ctypes.c_longlong),   # counts_by_complexity (long long*)
+        ctypes.c_int,                        # max_complexity_to_track
+        ctypes.c_int                         # num_threads
+    ]
+
+    _c_lib = c_lib
+    return _c_lib
+
 class LZExhaustiveCalculator:
     '''Wraps C functions for exhaustive LZ76 calculations over binary strings.
 
@@ -37,66 +99,32 @@ class LZExhaustiveCalculator:
         """Initializes the LZExhaustiveCalculator.
 
         Loads the `lz_exhaustive` C library and configures C function prototypes.
+        The library is loaded on first use and shared by all instances.
 
         Raises:
             OSError: If the C shared library (`lz_exhaustive`) cannot be loaded.
             AttributeError: If required C functions are not found in the library.
         """
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # This library will only contain lz_exhaustive.c object code
-        lib_filename = "lz_exhaustive.so"
-        if os.name == 'nt':
-            lib_filename = "lz_exhaustive.dll"
-        elif sys.platform == 'darwin':
-            lib_filename = "lz_exhaustive.dylib"
-        
-        lib_path = os.path.join(script_dir, "c_backend", lib_filename)
-
-        try:
-            self.c_lib = ctypes.CDLL(lib_path)
-        except OSError as e:
-            lz_exhaustive_c_path = os.path.join("c_backend", "lz_exhaustive.c")
-            output_lib_path = os.path.join("c_backend", lib_filename)
-            error_message = (
-                f"Failed to load C library '{lib_filename}' from {lib_path}.\n"
-                f"Please ensure it is compiled (e.g., using 'make' in c_backend directory).\n"
-                f"Source: '{lz_exhaustive_c_path}'. Target: '{output_lib_path}'.\n"
-                f"Example compilation (ensure OpenMP flags if needed, see Makefile):\n"
-                f"  gcc -shared -o '{output_lib_path}' -fPIC '{lz_exhaustive_c_path}' -fopenmp\n"
-                f"Original error: {e}"
-            )
-            raise OSError(error_message)
-
-        # Configure C function prototype from lz_exhaustive.h
-        self.c_lib.lz76_exhaustive_generate.restype = None
-        self.c_lib.lz76_exhaustive_generate.argtypes = [
-            ctypes.c_int,                      # L
-            ctypes.POINTER(ctypes.c_int)       # phrase_counts_output
-        ]
-
-        self.c_lib.lz76_exhaustive_distribution.restype = None
-        self.c_lib.lz76_exhaustive_distribution.argtypes = [
-            ctypes.c_int,                        # L
-            ctypes.POINTER(ctypes.c_longlong),   # counts_by_complexity (long long*)
-            ctypes.c_int,                        # max_complexity_to_track
-            ctypes.c_int                         # num_threads
-        ]
-
-    def calculate_all_lz76_counts(self, L: int) -> np.ndarray | None:
+        self.c_lib = _load_c_lib()
+
+    def calculate_all_lz76_counts(self, L: int, out: np.ndarray | None = None) -> np.ndarray | None:
         """Calculates LZ76 phrase counts for all 2^L binary strings of length L.
 
         Args:
             L: The length of binary strings to process.
+            out: Optional pre-allocated, C-contiguous `np.int32` array of size 2^L to write
+                 the results into (e.g. an `np.memmap` for large L). If None, a new array
+                 is allocated.
 
         Returns:
-            A numpy array of `np.int32` type, of size 2^L. The element at index `i`
-            is the LZ76 phrase count for the binary string of length `L` whose
-            integer representation is `i`.
+            A numpy array of `np.int32` type, of size 2^L (`out` if it was given). The
+            element at index `i` is the LZ76 phrase count for the binary string of
+            length `L` whose integer representation is `i`.
 
         Raises:
-            ValueError: If L is not a positive integer, or if L is excessively large
-                        (>28), potentially leading to memory exhaustion.
+            ValueError: If L is not a positive integer, if L is excessively large
+                        (>28), potentially leading to memory exhaustion, or if `out`
+                        does not have the required dtype, size or layout.
         """
         if not (isinstance(L, int) and L > 0):
             raise ValueError("L must be a positive integer.")
@@ -108,8 +136,13 @@ class LZExhaustiveCalculator:
 
         num_strings = 1 << L # 2^L
         
-        # Create a numpy array to hold the results, pass its C-compatible pointer
-        results_array_np = np.empty(num_strings, dtype=np.int32)
+        # Create (or validate) a numpy array to hold the results, pass its C-compatible pointer
+        if out is None:
+            results_array_np = np.empty(num_strings, dtype=np.int32)
+        else:
+            if out.dtype != np.int32 or out.shape != (num_strings,) or not out.flags['C_CONTIGUOUS']:
+                raise ValueError(f"out must be a C-contiguous np.int32 array of shape ({num_strings},).")
+            results_array_np = out
         results_array_c_ptr = results_array_np.ctypes.data_as(ctypes.POINTER(ctypes.c_int))
 
         print(f"Calling C lz76_exhaustive_generate for L={L} (2^{L} = {num_strings} strings)...", file=sys.stderr)
@@ -18,6 +18,103 @@ The wrapper handles:
 import ctypes
 import os
 import sys # For sys.platform
+import numpy as np
+
+# Opaque pointer type for the C state struct (the actual struct definition is in C).
+_CLZSuffixTreeStatePtr = ctypes.c_void_p
+
+# The loaded and configured `lz_suffix_combined` library, shared by all wrapper instances
+# so the shared object is opened and its prototypes are configured only once per process.
+_c_lib = None
+
+def _load_c_lib() -> ctypes.CDLL:
+    """Loads the `lz_suffix_combined` C library and configures its prototypes (once per process).
+
+    Returns:
+        The cached `ctypes.CDLL` object.
+
+    Raises:
+        OSError: If the C shared library cannot be loaded.
+        AttributeError: If a required C function is not found in the library.
+    """
+    global _c_lib
+    if _c_lib is not None:
+        return _c_lib
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # Library name for the combined lz_suffix and online_suffix functionalities.
+    lib_filename = "lz_suffix_combined.so" 
+    if os.name == 'nt':
+        lib_filename = "lz_suffix_combined.dll"
+    elif sys.platform == 'darwin':
+        lib_filename = "lz_suffix_combined.dylib"
+
+    lib_path = os.path.join(script_dir, "c_backend", lib_filename)
+
+    try:
+        c_lib = ctypes.CDLL(lib_path)
+    except OSError as e:
+        online_suffix_c_path = os.path.join("c_backend", "online_suffix.c")
+        lz_suffix_c_path = os.path.join("c_backend", "lz_suffix.c")
+        output_lib_path = os.path.join("c_backend", lib_filename)
+        error_message = (
+            f"Failed to load C library '{lib_filename}' from {lib_path}.\n"
+            f"Please ensure it is compiled and in the correct location.\n"
+            f"This library should combine '{online_suffix_c_path}' and '{lz_suffix_c_path}'.\n"
+            f"Check the Makefile in c_backend or compile manually, e.g., on Linux/macOS:\n"
+            f"  gcc -shared -o '{output_lib_path}' -fPIC '{online_suffix_c_path}' '{lz_suffix_c_path}'\n"
+            f"Original error: {e}"
+        )
+        raise OSError(error_message)
+
+    # Configure C function prototypes from lz_suffix.h
+    try:
+        c_lib.create_lz_suffix_tree_c.restype = _CLZSuffixTreeStatePtr
+        c_lib.create_lz_suffix_tree_c.argtypes = []
+
+        c_lib.free_lz_suffix_tree_c.restype = None
+        c_lib.free_lz_suffix_tree_c.argtypes = [_CLZSuffixTreeStatePtr]
+
+        c_lib.add_char_lz_c.restype = ctypes.c_bool # Returns true if new phrase completed
+        c_lib.add_char_lz_c.argtypes = [_CLZSuffixTreeStatePtr, ctypes.c_char]
+
+        c_lib.add_string_lz_c.restype = ctypes.c_int # Number of phrases completed
+        c_lib.add_string_lz_c.argtypes = [
+            _CLZSuffixTreeStatePtr,           # LZSuffixTreeCState* lz_tree
+            ctypes.c_char_p,                  # const char* s
+            ctypes.c_size_t,                  # size_t len
+            ctypes.c_char_p                   # unsigned char* phrase_completed (may be NULL)
+        ]
+
+        c_lib.get_lz_complexity_c.restype = ctypes.c_int
+        c_lib.get_lz_complexity_c.argtypes = [_CLZSuffixTreeStatePtr]
+
+        c_lib.reset_lz_suffix_tree_c.restype = None
+        c_lib.reset_lz_suffix_tree_c.argtypes = [_CLZSuffixTreeStatePtr]
+
+        c_lib.process_lz_batch_c.restype = None # Void return, results via pointer
+        c_lib.process_lz_batch_c.argtypes = [
+            _CLZSuffixTreeStatePtr,           # LZSuffixTreeCState* lz_tree_state
+            ctypes.POINTER(ctypes.c_char_p),  # const char** strings_array
+            ctypes.c_int,                     # int num_strings
+            ctypes.POINTER(ctypes.c_int)      # int* results_array
+        ]
+
+        c_lib.process_lz_batch_packed_c.restype = ctypes.c_int # 0 on success, -1 on invalid input
+        c_lib.process_lz_batch_packed_c.argtypes = [
+            _CLZSuffixTreeStatePtr,           # LZSuffixTreeCState* lz_tree_state
+            ctypes.POINTER(ctypes.c_uint8),   # const uint8_t* data
+            ctypes.c_size_t,                  # size_t row_stride
+            ctypes.POINTER(ctypes.c_int32),   # const int32_t* lengths
+            ctypes.c_size_t,                  # size_t num_strings
+            ctypes.POINTER(ctypes.c_int32)    # int32_t* results_array
+        ]
+    except AttributeError as e:
+        raise AttributeError(f"A required function from lz_suffix.h was not found in '{lib_filename}'.\nOriginal error: {e}")
+
+    _c_lib = c_lib
+    return _c_lib
 
 class LZSuffixTreeWrapper:
     '''Wraps C functions for LZ76 complexity using a suffix tree.
@@ -40,8 +137,9 @@ class LZSuffixTreeWrapper:
     def __init__(self, initial_text: str = ""):
         """Initializes the LZSuffixTreeWrapper.
 
-        Loads the `lz_suffix_combined` C library, configures C function prototypes,
-        creates the C `LZSuffixTreeCState`, and optionally processes an initial text.
+        Loads the `lz_suffix_combined` C library and configures C function prototypes
+        (once per process, shared by all instances), creates the C `LZSuffixTreeCState`,
+        and optionally processes an initial text.
 
         Args:
             initial_text: An optional string to initialize the LZ processor with.
@@ -51,61 +149,8 @@ class LZSuffixTreeWrapper:
             MemoryError: If the C library fails to create the `LZSuffixTreeCState`.
             AttributeError: If a required C function is not found in the library.
         """
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Library name for the combined lz_suffix and online_suffix functionalities.
-        lib_filename = "lz_suffix_combined.so" 
-        if os.name == 'nt':
-            lib_filename = "lz_suffix_combined.dll"
-        elif sys.platform == 'darwin':
-            lib_filename = "lz_suffix_combined.dylib"
-        
-        lib_path = os.path.join(script_dir, "c_backend", lib_filename)
-
-        try:
-            self.c_lib = ctypes.CDLL(lib_path)
-        except OSError as e:
-            online_suffix_c_path = os.path.join("c_backend", "online_suffix.c")
-            lz_suffix_c_path = os.path.join("c_backend", "lz_suffix.c")
-            output_lib_path = os.path.join("c_backend", lib_filename)
-            error_message = (
-                f"Failed to load C library '{lib_filename}' from {lib_path}.\n"
-                f"Please ensure it is compiled and in the correct location.\n"
-                f"This library should combine '{online_suffix_c_path}' and '{lz_suffix_c_path}'.\n"
-                f"Check the Makefile in c_backend or compile manually, e.g., on Linux/macOS:\n"
-                f"  gcc -shared -o '{output_lib_path}' -fPIC '{online_suffix_c_path}' '{lz_suffix_c_path}'\n"
-                f"Original error: {e}"
-            )
-            raise OSError(error_message)
-
-        self.CLZSuffixTreeStatePtr = ctypes.c_void_p # Opaque pointer type
-
-        # Configure C function prototypes from lz_suffix.h
-        try:
-            self.c_lib.create_lz_suffix_tree_c.restype = self.CLZSuffixTreeStatePtr
-            self.c_lib.create_lz_suffix_tree_c.argtypes = []
-
-            self.c_lib.free_lz_suffix_tree_c.restype = None
-            self.c_lib.free_lz_suffix_tree_c.argtypes = [self.CLZSuffixTreeStatePtr]
-
-            self.c_lib.add_char_lz_c.restype = ctypes.c_bool # Returns true if new phrase completed
-            self.c_lib.add_char_lz_c.argtypes = [self.CLZSuffixTreeStatePtr, ctypes.c_char]
-
-            self.c_lib.get_lz_complexity_c.restype = ctypes.c_int
-            self.c_lib.get_lz_complexity_c.argtypes = [self.CLZSuffixTreeStatePtr]
-
-            self.c_lib.reset_lz_suffix_tree_c.restype = None
-            self.c_lib.reset_lz_suffix_tree_c.argtypes = [self.CLZSuffixTreeStatePtr]
-            
-            self.c_lib.process_lz_batch_c.restype = None # Void return, results via pointer
-            self.c_lib.process_lz_batch_c.argtypes = [
-                self.CLZSuffixTreeStatePtr,          # LZSuffixTreeCState* lz_tree_state
-                ctypes.POINTER(ctypes.c_char_p),  # const char** strings_array
-                ctypes.c_int,                     # int num_strings
-                ctypes.POINTER(ctypes.c_int)      # int* results_array
-            ]
-        except AttributeError as e:
-            raise AttributeError(f"A required function from lz_suffix.h was not found in '{lib_filename}'.\nOriginal error: {e}")
+        self.c_lib = _load_c_lib()
+        self.CLZSuffixTreeStatePtr = _CLZSuffixTreeStatePtr
 
         self._c_lz_tree_state = self.c_lib.create_lz_suffix_tree_c()
         if not self._c_lz_tree_state:
@@ -117,8 +162,7 @@ class LZSuffixTreeWrapper:
         self.current_text_py = "" # Full text processed string for display
 
         if initial_text:
-            for char_val in initial_text:
-                self.add_character(char_val)
+            self.add_string(initial_text)
 
     def add_character(self, char: str) -> bool:
         """Adds a single character to the LZ processor and updates LZ76 state.
@@ -144,7 +188,6 @@ class LZSuffixTreeWrapper:
             byte_char_array = char.encode('utf-8')
             if len(byte_char_array) != 1:
                 raise ValueError(f"Character '{char}' (UTF-8: {byte_char_array.hex()}) is multi-byte. \nThe C backend for LZ suffix tree currently expects single-byte chars.")
-            c_char_val = byte_char_array[0]
         except UnicodeEncodeError:
             raise ValueError(f"Character '{char}' could not be encoded to UTF-8.")
 
@@ -154,7 +197,7 @@ class LZSuffixTreeWrapper:
         # If new_word_added_to_dict_c is true, it means `self.current_word + char` was the phrase.
         word_that_would_be_added = self.current_word + char
 
-        new_word_added_to_dict_c = self.c_lib.add_char_lz_c(self._c_lz_tree_state, ctypes.c_char(c_char_val))
+        new_word_added_to_dict_c = self.c_lib.add_char_lz_c(self._c_lz_tree_state, byte_char_array) # 1-byte bytes for c_char
 
         if new_word_added_to_dict_c:
             self.dictionary.append(word_that_would_be_added) 
@@ -165,6 +208,49 @@ class LZSuffixTreeWrapper:
         
         return new_word_added_to_dict_c
 
+    def add_string(self, s: str) -> int:
+        """Adds all characters of a string to the LZ processor with a single C call.
+
+        Equivalent to calling `add_character` for every character of `s`, but the loop
+        runs in C (`add_string_lz_c`), so the per-character ctypes overhead is paid once.
+        The C side reports which characters completed a phrase, and the Python-side
+        `current_word` and `dictionary` are updated from that.
+
+        Args:
+            s: The string to add. Every character must encode to a single UTF-8 byte.
+
+        Returns:
+            int: The number of LZ phrases completed while adding `s`.
+
+        Raises:
+            TypeError: If `s` is not a string.
+            ValueError: If `s` contains multi-byte characters.
+        """
+        if not isinstance(s, str):
+            raise TypeError("Input must be a string.")
+        encoded = s.encode('utf-8')
+        if len(encoded) != len(s):
+            raise ValueError("The C backend for LZ suffix tree currently expects single-byte chars.")
+        if not encoded:
+            return 0
+
+        phrase_completed = ctypes.create_string_buffer(len(encoded))
+        num_completed = self.c_lib.add_string_lz_c(self._c_lz_tree_state, encoded, len(encoded), phrase_completed)
+
+        # Rebuild the Python-side tracking from the phrase-completion flags.
+        self.current_text_py += s
+        flags = phrase_completed.raw
+        word_start = 0
+        word_prefix = self.current_word # The first phrase continues the current word
+        end = flags.find(b'\x01')
+        while end != -1:
+            self.dictionary.append(word_prefix + s[word_start:end + 1])
+            word_prefix = ""
+            word_start = end + 1
+            end = flags.find(b'\x01', word_start)
+        self.current_word = word_prefix + s[word_start:]
+        return num_completed
+
     def compute_lz76_complexity(self) -> int:
         """Computes and returns the current LZ76 complexity.
 
@@ -183,6 +269,8 @@ class LZSuffixTreeWrapper:
         """Resets the LZ processor state to its initial empty state.
         
         Both the C backend state and Python-side tracking variables are reset.
+        The C state keeps its allocated buffers, so resetting and reusing one
+        instance is cheaper than creating a new wrapper per string.
         """
         if not self._c_lz_tree_state: return
         self.c_lib.reset_lz_suffix_tree_c(self._c_lz_tree_state)
@@ -245,6 +333,49 @@ class LZSuffixTreeWrapper:
 
         return list(results_array_c) # Convert ctypes array to Python list
 
+    def compute_lz76_complexity_batch_packed(self, chars: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """Computes LZ76 complexity for strings packed as rows of a 2D uint8 matrix.
+
+        String `i` is `chars[i, :lengths[i]]`. The C function `process_lz_batch_packed_c`
+        reads the rows straight from the matrix buffer, so no per-string `bytes` objects
+        or pointer array are built (compare `compute_lz76_complexity_batch`).
+
+        Args:
+            chars: A 2D numpy array of dtype uint8, shape (num_strings, max_len).
+                   Only the first `lengths[i]` bytes of row `i` are read.
+            lengths: A 1D integer array of shape (num_strings,) with values in [0, max_len].
+
+        Returns:
+            An int32 numpy array with the LZ76 complexity of each string.
+
+        Raises:
+            RuntimeError: If the C tree state is not available.
+            ValueError: If `chars` or `lengths` have the wrong dtype, shape or values.
+        """
+        if not self._c_lz_tree_state:
+            raise RuntimeError("C LZ Tree State is not available for batch processing.")
+        chars = np.ascontiguousarray(chars)
+        if chars.ndim != 2 or chars.dtype != np.uint8:
+            raise ValueError("chars must be a 2D numpy array of dtype uint8.")
+        lengths = np.ascontiguousarray(lengths, dtype=np.int32)
+        if lengths.shape != (chars.shape[0],):
+            raise ValueError(f"lengths must have shape ({chars.shape[0]},), got {lengths.shape}.")
+        if lengths.size and (lengths.min() < 0 or lengths.max() > chars.shape[1]):
+            raise ValueError(f"lengths must be between 0 and {chars.shape[1]}.")
+
+        results = np.empty(chars.shape[0], dtype=np.int32)
+        status = self.c_lib.process_lz_batch_packed_c(
+            self._c_lz_tree_state,
+            chars.ctypes.data_as(ctypes.POINTER(ctypes.c_uint8)),
+            chars.strides[0],
+            lengths.ctypes.data_as(ctypes.POINTER(ctypes.c_int32)),
+            chars.shape[0],
+            results.ctypes.data_as(ctypes.POINTER(ctypes.c_int32))
+        )
+        if status != 0:
+            raise ValueError("process_lz_batch_packed_c rejected its input.")
+        return results
+
     def return_dictionary(self) -> list[str]:
         """Returns the list of phrases in the LZ76 dictionary.
         
@@ -279,13 +410,28 @@ class LZSuffixTreeWrapper:
         print(f"LZ76 Complexity (from C): {c_complexity}")
         print("-------------------------------------")
 
-    def __del__(self):
-        """Ensures the C `LZSuffixTreeCState` is freed when the wrapper object is deleted."""
+    def close(self) -> None:
+        """Frees the C `LZSuffixTreeCState` now instead of waiting for garbage collection.
+
+        Safe to call more than once. The wrapper should not be used after closing.
+        """
         if hasattr(self, 'c_lib') and self.c_lib and \
            hasattr(self, '_c_lz_tree_state') and self._c_lz_tree_state:
             self.c_lib.free_lz_suffix_tree_c(self._c_lz_tree_state)
             self._c_lz_tree_state = None # Mark as freed
 
+    def __enter__(self) -> "LZSuffixTreeWrapper":
+        """Returns the wrapper itself, so it can be used as `with LZSuffixTreeWrapper() as lz:`."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Frees the C state when the `with` block exits, including when it raises."""
+        self.close()
+
+    def __del__(self):
+        """Ensures the C `LZSuffixTreeCState` is freed when the wrapper object is deleted."""
+        self.close()
+
 # Example Usage:
 if __name__ == '__main__':
     print("LZSuffixTreeWrapper Example")
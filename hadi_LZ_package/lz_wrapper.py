@@ -9,7 +9,7 @@ The C library functions are parallelized using OpenMP for improved performance o
 multi-core systems when processing batches of strings.
 '''
 import os
-from ctypes import CDLL, POINTER, c_char_p, c_size_t, c_double, c_int
+from ctypes import CDLL, POINTER, c_char_p, c_size_t, c_double, c_int, c_longlong
 import numpy as np
 from typing import List, Optional
 
@@ -52,7 +52,16 @@ _lz_function_signatures = {
     ], None),
     'symmetric_lz78_parallel': ([
         POINTER(c_char_p), POINTER(c_size_t), POINTER(c_double), c_size_t, c_int
-    ], None)
+    ], None),
+    'lz76_verify_exhaustive': ([
+        c_int,                # int L
+        POINTER(c_int),       # const int* expected_phrase_counts
+        c_int,                # int max_report
+        POINTER(c_longlong),  # long long* first_mismatch_indices
+        POINTER(c_int),       # int* first_mismatch_phrase_counts
+        c_int,                # int n_threads
+        c_int                 # int stop_at_first
+    ], c_longlong) # Total number of mismatches, -1 on invalid arguments or allocation failure
 }
 
 for func_name, (arg_types, res_type) in _lz_function_signatures.items():
@@ -170,17 +179,163 @@ class LZProcessor:
         results_array = (c_double * len(strings))() # Output array
 
         # Select the appropriate C function based on algorithm and symmetry
-        if algorithm == 'lz76':
-            func = _lib.symmetric_lz76_parallel_original if symmetric else _lib.lz76_complexity_parallel_original
-        elif algorithm == 'lz78':
-            func = _lib.symmetric_lz78_parallel if symmetric else _lib.lz78_complexity_parallel
-        else:
-            raise ValueError(f"Unknown algorithm: {algorithm}. Choose 'lz76' or 'lz78'.")
+        func = self._select_parallel_function(symmetric, algorithm)
             
         # Call the C function
         func(str_array, lengths_array, results_array, len(strings), c_int(self.n_threads))
         
-        return np.array(list(results_array)) # Convert c_double array to numpy array
+        # View the c_double array as a numpy array (no per-element conversion); the view
+        # keeps `results_array` alive.
+        return np.ctypeslib.as_array(results_array)
+
+    @staticmethod
+    def _select_parallel_function(symmetric: bool, algorithm: str):
+        '''Returns the parallel C function for the given algorithm and symmetry.
+
+        Raises:
+            ValueError: If an invalid algorithm is specified.
+        '''
+        if algorithm == 'lz76':
+            return _lib.symmetric_lz76_parallel_original if symmetric else _lib.lz76_complexity_parallel_original
+        elif algorithm == 'lz78':
+            return _lib.symmetric_lz78_parallel if symmetric else _lib.lz78_complexity_parallel
+        raise ValueError(f"Unknown algorithm: {algorithm}. Choose 'lz76' or 'lz78'.")
+
+    def _process_pointers(self, func, row_pointers: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        '''Calls a parallel C function on strings given as raw pointers (np.uintp) and lengths.
+
+        The caller must keep the buffer the pointers refer to alive during the call.
+        '''
+        results = np.empty(len(row_pointers), dtype=np.float64)
+        func(row_pointers.ctypes.data_as(POINTER(c_char_p)),
+             lengths.ctypes.data_as(POINTER(c_size_t)),
+             results.ctypes.data_as(POINTER(c_double)),
+             len(row_pointers), c_int(self.n_threads))
+        return results
+
+    def process_bytes_matrix(self, byte_matrix: np.ndarray, symmetric: bool = False, algorithm: str = 'lz76') -> np.ndarray:
+        '''Calculates LZ complexity for equal-length strings stored as rows of a uint8 matrix.
+
+        Each row of `byte_matrix` is one string (e.g. ASCII codes of '0'/'1'). The C
+        functions receive pointers directly into the matrix buffer, so no Python `str`
+        or `bytes` objects are created per string.
+
+        Args:
+            byte_matrix: A 2D numpy array of shape (n_strings, length) with dtype uint8.
+                         It is made C-contiguous if it is not already.
+            symmetric: If True, calculates symmetric LZ complexity. Defaults to False.
+            algorithm: The LZ algorithm to use. Can be 'lz76' or 'lz78'. Defaults to 'lz76'.
+
+        Returns:
+            A numpy array of LZ complexity values for each row, identical to what
+            `process_strings` returns for the decoded rows.
+
+        Raises:
+            ValueError: If `byte_matrix` is not a 2D uint8 array with at least one column,
+                        or if an invalid algorithm is specified.
+        '''
+        byte_matrix = np.ascontiguousarray(byte_matrix)
+        if byte_matrix.ndim != 2 or byte_matrix.dtype != np.uint8:
+            raise ValueError("byte_matrix must be a 2D numpy array of dtype uint8.")
+        n_strings, length = byte_matrix.shape
+        if n_strings == 0:
+            return np.array([])
+        if length == 0:
+            raise ValueError("byte_matrix must have at least one column (strings cannot be empty).")
+
+        func = self._select_parallel_function(symmetric, algorithm)
+
+        # Row pointers into the matrix buffer. The C side only reads `lengths[i]` bytes
+        # from each pointer, so rows do not need to be null-terminated.
+        row_pointers = byte_matrix.ctypes.data + np.arange(n_strings, dtype=np.uintp) * byte_matrix.strides[0]
+        lengths = np.full(n_strings, length, dtype=np.uintp)
+        return self._process_pointers(func, row_pointers, lengths)
+
+    def process_strings_buffer(self, data: np.ndarray, offsets: np.ndarray, symmetric: bool = False,
+                               algorithm: str = 'lz76') -> np.ndarray:
+        '''Calculates LZ complexity for variable-length strings packed into one byte buffer.
+
+        String `i` is `data[offsets[i]:offsets[i + 1]]`. The C functions receive pointers
+        directly into `data`, so no Python `str` or `bytes` object is created per string.
+        For example, `data = np.frombuffer(b"".join(encoded), dtype=np.uint8)` with
+        `offsets = np.concatenate(([0], np.cumsum([len(e) for e in encoded])))`.
+
+        Args:
+            data: A 1D numpy array of dtype uint8 holding all strings back to back.
+            offsets: A 1D integer array of length n_strings + 1 with `offsets[0] == 0`,
+                     non-decreasing, and `offsets[-1] == len(data)`.
+            symmetric: If True, calculates symmetric LZ complexity. Defaults to False.
+            algorithm: The LZ algorithm to use. Can be 'lz76' or 'lz78'. Defaults to 'lz76'.
+
+        Returns:
+            A numpy array of LZ complexity values for each string, identical to what
+            `process_strings` returns for the decoded strings.
+
+        Raises:
+            ValueError: If `data` or `offsets` are malformed, if any string is empty,
+                        or if an invalid algorithm is specified.
+        '''
+        data = np.ascontiguousarray(data)
+        if data.ndim != 1 or data.dtype != np.uint8:
+            raise ValueError("data must be a 1D numpy array of dtype uint8.")
+        offsets = np.asarray(offsets)
+        if offsets.ndim != 1 or offsets.size == 0 or not np.issubdtype(offsets.dtype, np.integer):
+            raise ValueError("offsets must be a non-empty 1D integer array.")
+        if offsets[0] != 0 or offsets[-1] != data.size:
+            raise ValueError(f"offsets must start at 0 and end at len(data) ({data.size}).")
+        lengths = np.diff(offsets)
+        if lengths.size == 0:
+            return np.array([])
+        if np.any(lengths <= 0):
+            raise ValueError("offsets must be strictly increasing (strings cannot be empty).")
+
+        func = self._select_parallel_function(symmetric, algorithm)
+        row_pointers = data.ctypes.data + offsets[:-1].astype(np.uintp)
+        return self._process_pointers(func, row_pointers, lengths.astype(np.uintp))
+
+    def verify_lz76_exhaustive(self, expected_phrase_counts: np.ndarray, L: int,
+                               max_report: int = 10, stop_at_first: bool = False) -> tuple[int, np.ndarray, np.ndarray]:
+        '''Checks LZ76 phrase counts of all 2^L binary strings against expected values, entirely in C.
+
+        String `i` is the L-bit binary representation of `i` (most significant bit first).
+        The strings are generated and parsed inside the C library, so no Python strings are
+        created; only the mismatch summary is returned.
+
+        Args:
+            expected_phrase_counts: Array of 2^L expected phrase counts (e.g. from
+                                    `LZExhaustiveCalculator.calculate_all_lz76_counts(L)`).
+            L: The length of the binary strings (1 <= L <= 30).
+            max_report: Maximum number of mismatches to return details for. Defaults to 10.
+            stop_at_first: Stop checking as soon as a mismatch is found. The count then only
+                covers the strings checked before stopping, and the indices are the lowest of
+                the mismatches found (not necessarily the first overall). Defaults to False.
+
+        Returns:
+            A tuple `(mismatches, indices, phrase_counts)`: the total number of mismatches,
+            the first (up to `max_report`) mismatching indices in ascending order, and the
+            LZ76 phrase counts computed by `lz_core.c` for those indices.
+
+        Raises:
+            ValueError: If `L` is out of range, `expected_phrase_counts` does not have 2^L entries,
+                or the C check cannot allocate its per-thread mismatch lists.
+        '''
+        if not (1 <= L <= 30):
+            raise ValueError(f"L must be between 1 and 30. Provided: {L}")
+        expected = np.ascontiguousarray(expected_phrase_counts, dtype=np.intc)
+        if expected.shape != (1 << L,):
+            raise ValueError(f"expected_phrase_counts must have 2^{L} = {1 << L} entries, got shape {expected.shape}.")
+        max_report = max(0, max_report)
+
+        indices = np.empty(max_report, dtype=np.longlong)
+        phrase_counts = np.empty(max_report, dtype=np.intc)
+        mismatches = _lib.lz76_verify_exhaustive(
+            L, expected.ctypes.data_as(POINTER(c_int)), max_report,
+            indices.ctypes.data_as(POINTER(c_longlong)), phrase_counts.ctypes.data_as(POINTER(c_int)),
+            c_int(self.n_threads), c_int(1 if stop_at_first else 0))
+        if mismatches < 0:
+            raise ValueError(f"lz76_verify_exhaustive failed: invalid arguments or out of memory (L={L}, max_report={max_report}).")
+        num_reported = min(mismatches, max_report)
+        return int(mismatches), indices[:num_reported], phrase_counts[:num_reported]
 
     def process_conditional(self, x_strings: List[str], y_strings: List[str], 
                           algorithm: str = 'lz76') -> np.ndarray:
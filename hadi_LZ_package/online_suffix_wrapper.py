@@ -21,6 +21,92 @@ import ctypes
 import os
 import sys # Moved from bottom to top for standard practice
 
+# Opaque pointer type for the C state struct (the actual struct definition is in C).
+_CSuffixTreeStatePtr = ctypes.c_void_p
+
+# The loaded and configured `online_suffix` library, shared by all wrapper instances
+# so the shared object is opened and its prototypes are configured only once per process.
+_c_lib = None
+
+def _load_c_lib() -> ctypes.CDLL:
+    """Loads the `online_suffix` C library and configures its prototypes (once per process).
+
+    Returns:
+        The cached `ctypes.CDLL` object.
+
+    Raises:
+        OSError: If the C shared library cannot be loaded.
+        AttributeError: If a required C function is not found in the library.
+    """
+    global _c_lib
+    if _c_lib is not None:
+        return _c_lib
+
+    # Determine library path relative to this file (online_suffix_wrapper.py)
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # Determine the correct shared library filename based on the operating system.
+    lib_filename = "online_suffix.so"  # Default for Linux
+    if os.name == 'nt': # Windows
+        lib_filename = "online_suffix.dll"
+    elif sys.platform == 'darwin': # macOS
+        lib_filename = "online_suffix.dylib"
+
+    # Construct the full path to the C library.
+    # Assumes c_backend is a subdirectory relative to this wrapper file.
+    lib_path = os.path.join(script_dir, "c_backend", lib_filename)
+
+    try:
+        c_lib = ctypes.CDLL(lib_path)
+    except OSError as e:
+        # Provide a detailed error message to help diagnose loading issues.
+        example_c_file_path = os.path.join("c_backend", "online_suffix.c") # Relative to project root for example
+        example_output_path = os.path.join("c_backend", lib_filename) # Relative to project root for example
+
+        error_message = (
+            f"Failed to load C library from {lib_path}. \n"
+            f"Please ensure the library is compiled and in the correct location.\n"
+            f"The C source is expected at: {example_c_file_path}\n"
+            f"And the compiled library at: {example_output_path}\n"
+            f"You might need to run 'make' in the 'hadi_LZ_package/hadi_LZ_package/c_backend' directory.\n"
+            f"Example compilation command (adjust for your system if not using Makefile):\n"
+            f"  gcc -shared -o '{example_output_path}' -fPIC '{example_c_file_path}'\n"
+            f"Original error: {e}"
+        )
+        raise OSError(error_message)
+
+    # Configure C function prototypes (argument types and return types).
+    # This is essential for ctypes to correctly call the C functions.
+    try:
+        c_lib.create_suffix_tree_c.restype = _CSuffixTreeStatePtr
+        c_lib.create_suffix_tree_c.argtypes = []
+
+        c_lib.free_suffix_tree_c.restype = None
+        c_lib.free_suffix_tree_c.argtypes = [_CSuffixTreeStatePtr]
+
+        c_lib.reset_suffix_tree_c.restype = None
+        c_lib.reset_suffix_tree_c.argtypes = [_CSuffixTreeStatePtr]
+
+        c_lib.add_char_c.restype = None # add_char_c in C returns void
+        c_lib.add_char_c.argtypes = [_CSuffixTreeStatePtr, ctypes.c_char]
+
+        c_lib.add_string_c.restype = None
+        c_lib.add_string_c.argtypes = [_CSuffixTreeStatePtr, ctypes.c_char_p, ctypes.c_size_t]
+
+        c_lib.find_c.restype = ctypes.c_bool
+        c_lib.find_c.argtypes = [_CSuffixTreeStatePtr, ctypes.c_char_p]
+
+        c_lib.get_text_len_c.restype = ctypes.c_int
+        c_lib.get_text_len_c.argtypes = [_CSuffixTreeStatePtr]
+
+        c_lib.get_text_char_at_c.restype = ctypes.c_char # Returns a single byte
+        c_lib.get_text_char_at_c.argtypes = [_CSuffixTreeStatePtr, ctypes.c_int]
+    except AttributeError as e:
+        raise AttributeError(f"A required function was not found in the C library at {lib_path}.\nEnsure all functions (create_suffix_tree_c, free_suffix_tree_c, etc.) are compiled.\nOriginal error: {e}")
+
+    _c_lib = c_lib
+    return _c_lib
+
 class OnlineSuffixTreeWrapper:
     '''A Python wrapper for an online suffix tree implemented in C.
 
@@ -28,6 +114,9 @@ class OnlineSuffixTreeWrapper:
     incrementally and patterns to be searched. It uses `ctypes` to interface with
     the compiled C shared library (`online_suffix.dylib`/`.so`/`.dll`).
 
+    The C state is freed by `close()`, on exit of a `with` block, or when the
+    wrapper is garbage collected.
+
     Attributes:
         c_lib: A `ctypes.CDLL` object representing the loaded C library.
         _c_tree_state: A C pointer (ctypes.c_void_p) to the SuffixTreeCState struct
@@ -36,8 +125,9 @@ class OnlineSuffixTreeWrapper:
     def __init__(self, initial_text: str = ""):
         """Initializes the OnlineSuffixTreeWrapper.
 
-        Loads the C shared library, configures function prototypes, creates the
-        C suffix tree state, and optionally populates it with an initial text.
+        Loads the C shared library and configures function prototypes (once per
+        process, shared by all instances), creates the C suffix tree state, and
+        optionally populates it with an initial text.
 
         Args:
             initial_text: An optional string to initialize the suffix tree with.
@@ -48,65 +138,8 @@ class OnlineSuffixTreeWrapper:
                      not compiled, or wrong architecture).
             MemoryError: If the C library fails to allocate the SuffixTreeCState.
         """
-        # Determine library path relative to this file (online_suffix_wrapper.py)
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Determine the correct shared library filename based on the operating system.
-        lib_filename = "online_suffix.so"  # Default for Linux
-        if os.name == 'nt': # Windows
-            lib_filename = "online_suffix.dll"
-        elif sys.platform == 'darwin': # macOS
-            lib_filename = "online_suffix.dylib"
-        
-        # Construct the full path to the C library.
-        # Assumes c_backend is a subdirectory relative to this wrapper file.
-        lib_path = os.path.join(script_dir, "c_backend", lib_filename)
-
-        try:
-            self.c_lib = ctypes.CDLL(lib_path)
-        except OSError as e:
-            # Provide a detailed error message to help diagnose loading issues.
-            example_c_file_path = os.path.join("c_backend", "online_suffix.c") # Relative to project root for example
-            example_output_path = os.path.join("c_backend", lib_filename) # Relative to project root for example
-            
-            error_message = (
-                f"Failed to load C library from {lib_path}. \n"
-                f"Please ensure the library is compiled and in the correct location.\n"
-                f"The C source is expected at: {example_c_file_path}\n"
-                f"And the compiled library at: {example_output_path}\n"
-                f"You might need to run 'make' in the 'hadi_LZ_package/hadi_LZ_package/c_backend' directory.\n"
-                f"Example compilation command (adjust for your system if not using Makefile):\n"
-                f"  gcc -shared -o '{example_output_path}' -fPIC '{example_c_file_path}'\n"
-                f"Original error: {e}"
-            )
-            raise OSError(error_message)
-
-        # Define an opaque pointer type for SuffixTreeCState. 
-        # The actual struct definition is in C.
-        self.CSuffixTreeStatePtr = ctypes.c_void_p
-
-        # Configure C function prototypes (argument types and return types).
-        # This is essential for ctypes to correctly call the C functions.
-        try:
-            self.c_lib.create_suffix_tree_c.restype = self.CSuffixTreeStatePtr
-            self.c_lib.create_suffix_tree_c.argtypes = []
-
-            self.c_lib.free_suffix_tree_c.restype = None
-            self.c_lib.free_suffix_tree_c.argtypes = [self.CSuffixTreeStatePtr]
-
-            self.c_lib.add_char_c.restype = None # add_char_c in C returns void
-            self.c_lib.add_char_c.argtypes = [self.CSuffixTreeStatePtr, ctypes.c_char]
-
-            self.c_lib.find_c.restype = ctypes.c_bool
-            self.c_lib.find_c.argtypes = [self.CSuffixTreeStatePtr, ctypes.c_char_p]
-
-            self.c_lib.get_text_len_c.restype = ctypes.c_int
-            self.c_lib.get_text_len_c.argtypes = [self.CSuffixTreeStatePtr]
-
-            self.c_lib.get_text_char_at_c.restype = ctypes.c_char # Returns a single byte
-            self.c_lib.get_text_char_at_c.argtypes = [self.CSuffixTreeStatePtr, ctypes.c_int]
-        except AttributeError as e:
-            raise AttributeError(f"A required function was not found in the C library at {lib_path}.\nEnsure all functions (create_suffix_tree_c, free_suffix_tree_c, etc.) are compiled.\nOriginal error: {e}")
+        self.c_lib = _load_c_lib()
+        self.CSuffixTreeStatePtr = _CSuffixTreeStatePtr
 
         # Initialize the C suffix tree state by calling the C constructor.
         self._c_tree_state = self.c_lib.create_suffix_tree_c()
@@ -116,8 +149,17 @@ class OnlineSuffixTreeWrapper:
 
         # Populate the tree with any initial text provided.
         if initial_text:
-            for char_val in initial_text:
-                self.add_char(char_val)
+            self.add_string(initial_text)
+
+    def reset(self) -> None:
+        """Resets the suffix tree to the empty tree, keeping the C state for reuse.
+
+        The root node and text buffer are kept, so resetting one instance per string
+        is cheaper than creating a new wrapper per string.
+        """
+        if not self._c_tree_state:
+            return
+        self.c_lib.reset_suffix_tree_c(self._c_tree_state)
 
     def add_char(self, ch: str) -> None:
         """Adds a single character to the suffix tree.
@@ -143,12 +185,38 @@ class OnlineSuffixTreeWrapper:
                 # The C side `add_char_c` takes a `char`, which is typically 1 byte.
                 # If a Python character encodes to multiple UTF-8 bytes, it cannot be passed directly.
                 raise ValueError(f"Character '{ch}' (UTF-8: {byte_char_array.hex()}) encodes to {len(byte_char_array)} bytes.\nThe C backend currently supports only single-byte characters for add_char_c.")
-            c_char_val = byte_char_array[0] # Extract the single byte
         except UnicodeEncodeError:
             # Should be rare for single characters but good practice to handle.
             raise ValueError(f"Character '{ch}' could not be encoded to UTF-8.")
 
-        self.c_lib.add_char_c(self._c_tree_state, ctypes.c_char(c_char_val))
+        # A 1-byte `bytes` object is accepted directly for a `c_char` argument, so no
+        # intermediate ctypes.c_char object is built per character.
+        self.c_lib.add_char_c(self._c_tree_state, byte_char_array)
+
+    def add_string(self, s: str | bytes) -> None:
+        """Adds all characters of a string to the suffix tree with a single C call.
+
+        Equivalent to calling `add_char` for every character of `s`, but the loop runs
+        in C (`add_string_c`), so the per-character ctypes overhead is paid once.
+        Already-encoded `bytes` are passed to C as they are (one byte per character),
+        which skips the encoding and its length check.
+
+        Args:
+            s: The string to add. Every character of a `str` must encode to a single UTF-8 byte.
+
+        Raises:
+            TypeError: If `s` is neither a string nor bytes.
+            ValueError: If `s` contains characters that encode to multiple bytes in UTF-8.
+        """
+        if isinstance(s, bytes):
+            encoded = s
+        elif isinstance(s, str):
+            encoded = s.encode('utf-8')
+            if len(encoded) != len(s):
+                raise ValueError("The C backend currently supports only single-byte characters for add_string_c.")
+        else:
+            raise TypeError("Input to add_string must be a string or bytes.")
+        self.c_lib.add_string_c(self._c_tree_state, encoded, len(encoded))
 
     def find(self, pattern: str) -> bool:
         """Checks if a given pattern exists in the suffix tree.
@@ -209,14 +277,31 @@ class OnlineSuffixTreeWrapper:
         # Assuming text in C is effectively a sequence of bytes that form a UTF-8 string.
         return b"".join(byte_chars).decode('utf-8', errors='replace')
 
-    def __del__(self):
-        """Ensures the C suffix tree state is freed when the wrapper object is deleted."""
+    def close(self) -> None:
+        """Frees the C suffix tree state now instead of waiting for garbage collection.
+
+        Safe to call more than once. After closing, the wrapper behaves like an empty tree
+        for the methods that check the state (`reset`, `text_len`, `global_end`); it should
+        not be used further.
+        """
         if hasattr(self, 'c_lib') and self.c_lib and \
            hasattr(self, '_c_tree_state') and self._c_tree_state:
             # print(f"Freeing SuffixTreeCState: {self._c_tree_state}") # For debugging
             self.c_lib.free_suffix_tree_c(self._c_tree_state)
             self._c_tree_state = None # Mark as freed
 
+    def __enter__(self) -> "OnlineSuffixTreeWrapper":
+        """Returns the wrapper itself, so it can be used as `with OnlineSuffixTreeWrapper() as tree:`."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Frees the C state when the `with` block exits, including when it raises."""
+        self.close()
+
+    def __del__(self):
+        """Ensures the C suffix tree state is freed when the wrapper object is deleted."""
+        self.close()
+
     @property
     def text_len(self) -> int:
         """int: The current length of the text in the suffix tree."""
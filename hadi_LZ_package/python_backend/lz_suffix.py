@@ -122,6 +122,23 @@ class LZSuffixTree(OnlineSuffixTree):
             new_phrase_completed = True
         
         return new_phrase_completed
+
+    def add_string(self, s: str) -> int:
+        """Processes all characters of a string for LZ76, as `add_character` would one by one.
+
+        This overrides `OnlineSuffixTree.add_string`: the characters go through the LZ76
+        parsing, not directly into the dictionary suffix tree.
+
+        Args:
+            s (str): The string to process.
+
+        Returns:
+            int: The number of LZ phrases completed while adding `s`.
+        """
+        if not isinstance(s, str):
+            raise TypeError("Input must be a string.")
+        add_character = self.add_character # Bound method looked up once, not per character
+        return sum(add_character(char_val) for char_val in s)
     
     def is_current_word_in_tree(self) -> bool:
         """Checks if `self.last_char` extends the current match from LZ active point.
@@ -248,7 +265,7 @@ class LZSuffixTree(OnlineSuffixTree):
         This involves resetting the parent `OnlineSuffixTree` and all LZ76-specific
         state variables of this class.
         """
-        super().__init__("") # Reset parent OnlineSuffixTree (clears text, root, active point etc.)
+        super().reset() # Reset parent OnlineSuffixTree in place (clears text, root children, active point etc.)
         
         # Reset LZ-specific state variables
         self.current_word = ""
@@ -257,7 +274,7 @@ class LZSuffixTree(OnlineSuffixTree):
         self.dictionary_size = 0
         self.dictionary = []
         
-        self.last_match_node = self.root # Should be new root from super().__init__
+        self.last_match_node = self.root # Same root object, now without children
         self.last_match_edge = None
         self.last_match_length = 0
     
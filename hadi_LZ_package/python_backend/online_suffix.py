@@ -134,8 +134,22 @@ class OnlineSuffixTree:
         self.global_end: int = -1 # Index of the last character in self.text (-1 for empty text)
 
         if initial_text:
-            for char_val in initial_text:
-                self.add_char(char_val)
+            self.add_string(initial_text)
+
+    def reset(self) -> None:
+        """Resets the tree to the empty tree, reusing the existing root node.
+
+        The root's children dict is cleared in place instead of allocating a new
+        root, so one instance can be reused for many strings.
+        """
+        self.text = ""
+        self.root.children.clear()
+        self.root.suffix_link = None
+        self.active_node = self.root
+        self.active_edge = 0
+        self.active_length = 0
+        self.remainder = 0
+        self.global_end = -1
 
     def add_char(self, ch: str) -> None:
         """Adds a single character to the tree, extending all suffixes.
@@ -152,6 +166,29 @@ class OnlineSuffixTree:
             raise ValueError("Input must be a single character.")
 
         self.text += ch
+        self._extend(ch)
+
+    def add_string(self, s: str) -> None:
+        """Adds all characters of a string to the tree, one Ukkonen phase per character.
+
+        Equivalent to calling `add_char` for every character of `s`, but `s` is
+        appended to `self.text` once instead of re-building the text string for
+        every character (each `self.text += ch` copies the whole text). A phase only
+        reads `self.text` up to `global_end`, so the characters appended ahead of
+        their phase are never looked at early.
+
+        Args:
+            s (str): The string to add.
+        """
+        if not isinstance(s, str):
+            raise TypeError("Input to add_string must be a string.")
+        self.text += s
+        extend = self._extend # Bound method looked up once, not per character
+        for ch in s:
+            extend(ch)
+
+    def _extend(self, ch: str) -> None:
+        """Runs the Ukkonen phase for `ch`, which must already be at `self.text[self.global_end + 1]`."""
         self.global_end += 1
         self.remainder += 1
         last_new_internal_node: Node | None = None # For setting suffix links after splits
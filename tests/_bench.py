@@ -0,0 +1,100 @@
+'''Shared benchmarking and reporting helpers for the suffix-tree tests in `tests/`.
+
+`test_lz_suffix.py` and `test_online_suffix.py` time their implementations over
+many strings in worker processes. This module holds what their timed passes share:
+the interpreter/JIT report and the warmup size, the time-gated progress printer,
+and the latency percentile and resource usage summaries.
+'''
+import sys
+import time
+import numpy as np
+
+try:
+    import resource # Unix only; resource usage is simply not reported elsewhere
+except ImportError:
+    resource = None
+
+# Number of strings every benchmark worker process runs unmeasured before its first timed
+# chunk, so that a JIT (PyPy, or CPython's experimental JIT) has compiled the hot loops.
+WARMUP_STRINGS = 100
+
+def jit_status() -> str | None:
+    """Describes the JIT compiler of the running interpreter, if one is active.
+
+    Returns:
+        A short description ("PyPy tracing JIT" or "CPython JIT"), or None when the
+        code runs in a plain interpreter. CPython's JIT (built with
+        `--enable-experimental-jit`) is detected through `sys._jit`, which only exists
+        from 3.14 on; a JIT-enabled 3.13 build is reported as "no JIT".
+    """
+    if sys.implementation.name == "pypy":
+        return "PyPy tracing JIT"
+    jit = getattr(sys, "_jit", None)
+    if jit is not None and jit.is_enabled():
+        return "CPython JIT"
+    return None
+
+def report_interpreter() -> None:
+    """Prints the interpreter used for the timings and warns if no JIT is active."""
+    version = ".".join(map(str, sys.version_info[:3]))
+    status = jit_status()
+    print(f"Interpreter: {sys.implementation.name} {version} ({status or 'no JIT'})")
+    if status is None:
+        print("  NOTE: pure-Python timings are interpreter timings. Run under PyPy, or a CPython >= 3.14 "
+              "built with --enable-experimental-jit and PYTHON_JIT=1, to time JIT-compiled loops.")
+
+def make_progress_printer(total: int, prefix: str, interval: float = 0.5):
+    """Returns a progress callback that prints at most once every `interval` seconds.
+
+    The returned `report(done, suffix="")` prints
+    `f"{prefix}: {percent:.1f}% ({done}/{total}){suffix}"` when at least `interval`
+    seconds have passed since the last print (monotonic clock), and always once
+    `done` reaches `total`, so the output cadence does not depend on `total`.
+
+    Args:
+        total: Number of items the progress refers to.
+        prefix: Start of every progress line (e.g. `"  Progress"`).
+        interval: Minimum number of seconds between two prints. Defaults to 0.5.
+
+    Returns:
+        A callable `report(done: int, suffix: str = "") -> None`.
+    """
+    next_print = time.perf_counter() + interval
+    def report(done: int, suffix: str = "") -> None:
+        nonlocal next_print
+        now = time.perf_counter()
+        if now >= next_print or done >= total:
+            print(f"{prefix}: {(done / max(total, 1)) * 100:.1f}% ({done}/{total}){suffix}")
+            next_print = now + interval
+    return report
+
+def print_latency_percentiles(label: str, times_ns: np.ndarray, percentiles: tuple[int, ...] = (50, 95, 99, 100)) -> None:
+    """Prints the mean and the given percentiles of per-item times (p100 is the maximum).
+
+    Args:
+        label: Name printed at the start of the line.
+        times_ns: Per-item times in nanoseconds.
+        percentiles: Percentiles to print. Defaults to p50, p95, p99 and the maximum.
+    """
+    if len(times_ns) == 0:
+        return
+    values = np.percentile(times_ns, percentiles)
+    print(f"  {label}: mean {np.mean(times_ns) / 1e3:.2f}us, "
+          + ", ".join(f"p{p} {v / 1e3:.2f}us" for p, v in zip(percentiles, values)))
+
+def print_resource_usage() -> None:
+    """Prints the CPU time and peak resident set size of this process and its finished children.
+
+    Worker processes count as children once their pool has been shut down. Nothing is
+    printed where the `resource` module is unavailable (Windows).
+    """
+    if resource is None:
+        return
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux.
+    rss_unit = 1 if sys.platform == "darwin" else 1024
+    print(f"CPU time: user {self_usage.ru_utime + children_usage.ru_utime:.3f}s, "
+          f"system {self_usage.ru_stime + children_usage.ru_stime:.3f}s (this process and its workers)")
+    print(f"Peak RSS: {self_usage.ru_maxrss * rss_unit / 2**20:.1f} MiB (this process), "
+          f"{children_usage.ru_maxrss * rss_unit / 2**20:.1f} MiB (largest worker)")
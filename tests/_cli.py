@@ -0,0 +1,158 @@
+'''Shared command-line helpers for the scripts in `tests/`.
+
+Both `run_large_lz_distribution.py` and `test_lz_exhaustive.py` take a string
+length `L`, an optional number of threads and, for very large `L`, ask for
+confirmation before starting. This module holds the argument parser and the
+confirmation prompt so the scripts' `__main__` blocks stay short. It also holds
+the parser of `test_online_suffix.py` (number and lengths of the random test strings,
+seed, `--csv` and `--fail-fast`), whose first three arguments `test_lz_suffix.py` shares.
+
+The historical positional forms are still accepted:
+    python run_large_lz_distribution.py 24 8
+is equivalent to
+    python run_large_lz_distribution.py --L 24 --threads 8
+'''
+import argparse
+
+# L > 28 implies >268 million strings, L > 30 is over a billion.
+CONFIRMATION_THRESHOLD = 28
+
+def build_parser(description: str | None = None, L_default: int = 20, L_max: int = 35) -> argparse.ArgumentParser:
+    """Builds the argument parser shared by the exhaustive LZ76 scripts.
+
+    Args:
+        description: Text shown at the top of `--help`.
+        L_default: Value of `L` used when it is not given on the command line.
+        L_max: Largest accepted value of `L` (used for the help text and validation).
+
+    Returns:
+        An `argparse.ArgumentParser` accepting `L`, `threads`, `--L`, `--threads` and `-y/--yes`.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('L', nargs='?', type=int, default=None,
+                        help=f"Length of the binary strings (1-{L_max}). Defaults to {L_default}.")
+    parser.add_argument('threads', nargs='?', type=int, default=None,
+                        help="Number of threads (positional form of --threads).")
+    parser.add_argument('--L', dest='L_option', metavar='L', type=int, default=None,
+                        help="Length of the binary strings (alternative to the positional form).")
+    parser.add_argument('--threads', dest='threads_option', metavar='N', type=int, default=None,
+                        help="Number of threads for the OpenMP backend. Defaults to the wrapper default.")
+    parser.add_argument('-y', '--yes', action='store_true',
+                        help=f"Do not ask for confirmation when L > {CONFIRMATION_THRESHOLD}.")
+    return parser
+
+def parse_common(argv: list[str] | None = None, description: str | None = None,
+                 L_default: int = 20, L_max: int = 35) -> argparse.Namespace:
+    """Parses and validates the common `L` / `threads` / `--yes` arguments.
+
+    Args:
+        argv: Argument list to parse. If None, `sys.argv[1:]` is used.
+        description: Text shown at the top of `--help`.
+        L_default: Value of `L` used when it is not given on the command line.
+        L_max: Largest accepted value of `L`.
+
+    Returns:
+        An `argparse.Namespace` with `L` (int), `threads` (int | None), `yes` (bool)
+        and `L_given` (bool, whether `L` was supplied explicitly).
+        Exits with a usage message if a value is out of range.
+    """
+    parser = build_parser(description=description, L_default=L_default, L_max=L_max)
+    args = parser.parse_args(argv)
+
+    L_value = args.L_option if args.L_option is not None else args.L
+    args.L_given = L_value is not None
+    args.L = L_value if L_value is not None else L_default
+    args.threads = args.threads_option if args.threads_option is not None else args.threads
+    del args.L_option, args.threads_option
+
+    if not (1 <= args.L <= L_max):
+        parser.error(f"L must be between 1 and {L_max}. Provided: {args.L}")
+    if args.threads is not None and args.threads <= 0:
+        parser.error("Number of threads must be a positive integer.")
+    return args
+
+def confirm_large_L(L_value: int, assume_yes: bool = False) -> bool:
+    """Asks for user confirmation if the provided L is very large.
+
+    Args:
+        L_value: The length L of binary strings.
+        assume_yes: If True, skip the prompt and proceed (e.g. `--yes` was passed).
+
+    Returns:
+        True if the user confirms to proceed or if L is not considered very large,
+        False if the user cancels.
+    """
+    if L_value > CONFIRMATION_THRESHOLD and not assume_yes:
+        print(f"\nWARNING: L={L_value} is very large. This will process 2^{L_value} strings.")
+        print(f"This computation may take a very long time and consume significant system resources.")
+        while True:
+            try:
+                response = input("Do you want to proceed? (yes/no): ").lower().strip()
+                if response in ['y', 'yes']:
+                    return True
+                elif response in ['n', 'no']:
+                    return False
+                print("Please answer 'yes' or 'no'.")
+            except EOFError: # Handle cases where input stream is closed (e.g., in automated tests)
+                print("No input received, cancelling operation for large L.")
+                return False
+    return True # Proceed if L is not above the threshold
+
+def build_string_test_parser(description: str | None = None, num_strings_default: int = 1000,
+                             min_len_default: int = 10, max_len_default: int = 50,
+                             run_options: bool = True) -> argparse.ArgumentParser:
+    """Builds the argument parser of the random-string suffix-tree tests.
+
+    Args:
+        description: Text shown at the top of `--help`.
+        num_strings_default: Number of test strings when none is given.
+        min_len_default: Minimum string length when none is given.
+        max_len_default: Maximum string length when none is given.
+        run_options: Whether to add `seed`, `--csv` and `--fail-fast`, which only
+            `test_online_suffix.py` implements.
+
+    Returns:
+        An `argparse.ArgumentParser` accepting `num_strings`, `min_len`, `max_len` (all
+        positional and optional) and, with `run_options`, `seed`, `--csv PATH` and `--fail-fast`.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('num_strings', nargs='?', type=int, default=num_strings_default,
+                        help=f"Number of random test strings. Defaults to {num_strings_default}.")
+    parser.add_argument('min_len', nargs='?', type=int, default=min_len_default,
+                        help=f"Minimum string length. Defaults to {min_len_default}.")
+    parser.add_argument('max_len', nargs='?', type=int, default=max_len_default,
+                        help=f"Maximum string length. Defaults to {max_len_default}.")
+    if not run_options:
+        return parser
+    parser.add_argument('seed', nargs='?', type=int, default=None,
+                        help="Seed of the run. Defaults to a random seed, which is printed.")
+    parser.add_argument('--csv', dest='csv_path', metavar='PATH', default=None,
+                        help="Write one index,length,py_ns,c_ns row per string to this CSV file.")
+    parser.add_argument('--fail-fast', action='store_true',
+                        help="Stop at the first failing string and exit with status 1.")
+    return parser
+
+def parse_string_test_args(argv: list[str] | None = None, description: str | None = None,
+                           **defaults) -> argparse.Namespace:
+    """Parses and validates the arguments of the random-string suffix-tree test.
+
+    Args:
+        argv: Argument list to parse. If None, `sys.argv[1:]` is used.
+        description: Text shown at the top of `--help`.
+        **defaults: Default values passed on to `build_string_test_parser`.
+
+    Returns:
+        An `argparse.Namespace` with `num_strings`, `min_len`, `max_len` (int) and, unless
+        `run_options=False` was passed, `seed` (int | None), `csv_path` (str | None) and
+        `fail_fast` (bool).
+        Exits with a usage message if a value is out of range.
+    """
+    parser = build_string_test_parser(description=description, **defaults)
+    args = parser.parse_args(argv)
+    if args.num_strings <= 0:
+        parser.error("Number of strings must be positive.")
+    if args.min_len <= 0:
+        parser.error("Min length must be positive.")
+    if args.max_len < args.min_len:
+        parser.error("Max length must be >= min length.")
+    return args
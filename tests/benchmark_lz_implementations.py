@@ -60,8 +60,8 @@ def generate_random_binary_strings_batch(num_strings: int, length: int) -> list[
         
     batch = []
     for _ in range(num_strings):
-        # random.choices is efficient for generating strings from an alphabet
-        s = "".join(random.choices(['0', '1'], k=length))
+        # One PRNG call for all bits; format() zero-pads the result to `length` digits.
+        s = format(random.getrandbits(length), f'0{length}b')
         batch.append(s)
     return batch
 
@@ -113,13 +113,13 @@ def run_benchmark(num_strings_per_length: int = 100000,
         # This wrapper's batch method directly returns integer phrase counts.
         print(f"Running LZSuffixTreeWrapper.compute_lz76_complexity_batch()...")
         results_suffix_phrases: list[int] = []
-        start_time_suffix = time.perf_counter()
+        start_time_suffix = time.perf_counter_ns()
         try:
             results_suffix_phrases = suffix_tree_wrapper.compute_lz76_complexity_batch(test_strings)
         except Exception as e_suffix:
             print(f"  ERROR during LZSuffixTreeWrapper execution: {e_suffix}")
             results_suffix_phrases = [-1] * num_strings_per_length # Placeholder for error
-        time_suffix = time.perf_counter() - start_time_suffix
+        time_suffix = (time.perf_counter_ns() - start_time_suffix) / 1e9
         print(f"  LZSuffixTreeWrapper finished in {time_suffix:.4f} seconds.")
         if num_strings_per_length > 0 and time_suffix > 0:
             print(f"  Avg time per string (LZSuffixTreeWrapper): {time_suffix/num_strings_per_length:.8e}s")
@@ -128,13 +128,13 @@ def run_benchmark(num_strings_per_length: int = 100000,
         # This wrapper's process_strings returns scaled complexities: phrase_count * log2(length).
         print(f"Running LZProcessor.process_strings() (lz_core.c backend)... ")
         scaled_results_core: np.ndarray | list[float] = []
-        start_time_core = time.perf_counter()
+        start_time_core = time.perf_counter_ns()
         try:
             scaled_results_core = core_lz_processor.process_strings(test_strings, symmetric=False, algorithm='lz76')
         except Exception as e_core:
             print(f"  ERROR during LZProcessor execution: {e_core}")
             scaled_results_core = [-1.0] * num_strings_per_length # Placeholder for error
-        time_core = time.perf_counter() - start_time_core
+        time_core = (time.perf_counter_ns() - start_time_core) / 1e9
         print(f"  LZProcessor finished in {time_core:.4f} seconds.")
         if num_strings_per_length > 0 and time_core > 0:
             print(f"  Avg time per string (LZProcessor): {time_core/num_strings_per_length:.8e}s")
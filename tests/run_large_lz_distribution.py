@@ -12,11 +12,12 @@ The script includes:
 - Output of the resulting complexity distribution.
 
 Usage:
-    python run_large_lz_distribution.py [L_value] [num_threads (optional)]
+    python run_large_lz_distribution.py [L_value] [num_threads (optional)] [--yes]
 
 Example:
     python run_large_lz_distribution.py 24 8
     python run_large_lz_distribution.py 20
+    python run_large_lz_distribution.py --L 30 --threads 16 --yes
 '''
 import sys
 import os
@@ -37,42 +38,16 @@ except ImportError as e:
     print(f"Current sys.path: {sys.path}")
     sys.exit(1)
 
-def confirm_large_L(L_value: int) -> bool:
-    """Asks for user confirmation if the provided L is very large.
+from _cli import parse_common, confirm_large_L
 
-    Args:
-        L_value: The length L of binary strings.
-
-    Returns:
-        True if the user confirms to proceed or if L is not considered very large,
-        False if the user cancels.
-    """
-    # Define a threshold for when to ask for confirmation.
-    # L > 28 implies >268 million strings, L > 30 is over a billion.
-    confirmation_threshold = 28 
-    if L_value > confirmation_threshold:
-        print(f"\nWARNING: L={L_value} is very large. This will process 2^{L_value} strings.")
-        print(f"This computation may take a very long time and consume significant system resources.")
-        while True:
-            try:
-                response = input("Do you want to proceed? (yes/no): ").lower().strip()
-                if response in ['y', 'yes']:
-                    return True
-                elif response in ['n', 'no']:
-                    return False
-                print("Please answer 'yes' or 'no'.")
-            except EOFError: # Handle cases where input stream is closed (e.g., in automated tests)
-                print("No input received, cancelling operation for large L.")
-                return False
-    return True # Proceed if L is not above the threshold
-
-def run_large_L_distribution_only(L_target: int, num_threads: int | None = None):
+def run_large_L_distribution_only(L_target: int, num_threads: int | None = None, assume_yes: bool = False):
     """Runs the LZ76 exhaustive distribution calculation for a given L and number of threads.
 
     Args:
         L_target: The length L of binary strings for which to calculate the distribution.
         num_threads (int | None, optional): The number of threads to request for the C backend.
                                           If None, the C backend or wrapper's default (e.g., os.cpu_count()) will be used.
+        assume_yes (bool, optional): If True, skip the confirmation prompt for very large L.
     """
     print(f"\n--- LZ76 Exhaustive Distribution for L={L_target} (Threads: {num_threads if num_threads is not None else 'default'}) ---")
     
@@ -80,7 +55,7 @@ def run_large_L_distribution_only(L_target: int, num_threads: int | None = None)
     print(f"Calculating distribution for 2^{L_target} = {num_total_strings:,} strings.")
 
     # Check for large L and get confirmation from the user.
-    if not confirm_large_L(L_target):
+    if not confirm_large_L(L_target, assume_yes=assume_yes):
         print("Operation cancelled by user due to large L.")
         return
 
@@ -97,7 +72,7 @@ def run_large_L_distribution_only(L_target: int, num_threads: int | None = None)
     max_complexity_to_track = L_target + 5 
 
     print(f"Running lz76_exhaustive_distribution(L={L_target}, max_complexity_track={max_complexity_to_track}, num_threads={num_threads if num_threads is not None else 'wrapper default'})...")
-    start_time = time.perf_counter()
+    start_time = time.perf_counter_ns()
     distribution = None # Initialize to ensure it's defined
     try:
         # suppress_warnings=True in the call to the wrapper because this script has its own confirmation.
@@ -120,7 +95,7 @@ def run_large_L_distribution_only(L_target: int, num_threads: int | None = None)
         print(f"  ERROR during distribution calculation for L={L_target}: {e_calc}")
         return
     
-    time_taken = time.perf_counter() - start_time
+    time_taken = (time.perf_counter_ns() - start_time) / 1e9
     print(f"  lz76_exhaustive_distribution for L={L_target} completed in {time_taken:.4f} seconds.")
     
     if num_total_strings > 0 and time_taken > 0:
@@ -128,38 +103,19 @@ def run_large_L_distribution_only(L_target: int, num_threads: int | None = None)
          print(f"  Effective average time per implicitly processed string: {time_taken/num_total_strings:.12e}s") 
 
     print(f"\n  LZ76 Phrase Count Distribution for L={L_target}:")
-    non_zero_counts = 0
-    for complexity_val, count in enumerate(distribution):
-        if count > 0:
-            print(f"    Complexity {complexity_val}: {count:,} strings")
-            non_zero_counts +=1
-    if non_zero_counts == 0:
+    # Format all non-zero bins up front and emit them with a single write.
+    non_zero_complexities = np.flatnonzero(distribution)
+    if non_zero_complexities.size == 0:
         print("    No strings found for any complexity (distribution array is all zeros).")
+    else:
+        sys.stdout.write("\n".join(
+            f"    Complexity {c}: {distribution[c]:,} strings" for c in non_zero_complexities
+        ) + "\n")
     print(f"  (Note: Last bin [index {max_complexity_to_track-1}] is an overflow for complexities >= its index)")
 
 if __name__ == "__main__":
-    L_default = 20 # Default L if not provided, smaller for quicker default run.
-    L_val_arg = L_default
-    threads_arg = None 
-    
-    if len(sys.argv) > 1:
-        try:
-            L_val_arg = int(sys.argv[1])
-            # Set a practical upper limit for L that can be run via script.
-            # User will be warned by confirm_large_L for L > 28.
-            if not (1 <= L_val_arg <= 35): 
-                print(f"ERROR: Please choose L between 1 and 35. Provided: {L_val_arg}")
-                sys.exit(1)
-            if len(sys.argv) > 2:
-                threads_arg = int(sys.argv[2])
-                if threads_arg <= 0:
-                    print("ERROR: Number of threads must be a positive integer.")
-                    sys.exit(1)
-        except ValueError:
-            print("Usage: python run_large_lz_distribution.py [L_value (1-35)] [num_threads (optional)]")
-            sys.exit(1)
-    else:
-        print(f"Usage: python run_large_lz_distribution.py [L_value (1-35)] [num_threads (optional)]")
-        print(f"No L_value provided, running with default L={L_default}...")
-    
-    run_large_L_distribution_only(L_target=L_val_arg, num_threads=threads_arg) 
\ No newline at end of file
+    args = parse_common(description="Runs the LZ76 exhaustive complexity distribution for all 2^L binary strings.",
+                        L_default=20, L_max=35)
+    if not args.L_given:
+        print(f"No L_value provided, running with default L={args.L}...")
+    run_large_L_distribution_only(L_target=args.L, num_threads=args.threads, assume_yes=args.yes)
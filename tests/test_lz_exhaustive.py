@@ -8,7 +8,9 @@ from `lz_exhaustive.c`. It includes tests for:
     `lz_exhaustive_generate` C function (via `calculate_all_lz76_counts` wrapper)
     against results obtained by processing each string individually using the 
     `lz_core.c` implementation (via `LZProcessor`). This is done for a moderately
-    sized L (e.g., L=16 by default).
+    sized L (e.g., L=16 by default). By default the per-string side runs entirely in
+    C (`LZProcessor.verify_lz76_exhaustive`); set `LZ_TEST_VERIFY_IN_C=0` to instead
+    pass the strings to `LZProcessor` in batches from Python.
 
 2.  **Correctness of `lz76_exhaustive_distribution`**: 
     For a small L (e.g., L=10), it first computes all individual phrase counts,
@@ -22,11 +24,18 @@ from `lz_exhaustive.c`. It includes tests for:
     for observing performance and generating large distributions.
 
 Command-line arguments allow specifying L values for different tests and optionally
-the number of threads for OpenMP-enabled C functions.
+the number of threads for OpenMP-enabled C functions. Setting the environment
+variable `LZ_TEST_FAIL_FAST=1` stops the exhaustive verification at the first
+mismatch instead of counting all of them. The correctness test accepts L up to 24;
+from L=22 on (or from `LZ_TEST_MEMMAP_L`, if set) its 2^L result arrays are
+memory-mapped temporary files.
 
 Usage Examples:
   - `python test_lz_exhaustive.py`: Runs benchmark (L=16) and distribution verification (L=10).
   - `python test_lz_exhaustive.py 18`: Runs benchmark for L=18.
+  - `python test_lz_exhaustive.py 18 --threads 2`: Runs benchmark for L=18 with 2 OpenMP threads.
+  - `python test_lz_exhaustive.py 22`: Runs benchmark for L=22 with memory-mapped result arrays.
+  - `LZ_TEST_MEMMAP_L=10 python test_lz_exhaustive.py 12`: Exercises the memory-mapped arrays at small L.
   - `python test_lz_exhaustive.py distribution_only 24`: Runs large L distribution for L=24.
   - `python test_lz_exhaustive.py distribution_only 22 4`: Runs large L distribution for L=22 with 4 threads.
 '''
@@ -34,6 +43,8 @@ import sys
 import os
 import time
 import math
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
 
 # --- Path Setup ---
@@ -51,19 +62,111 @@ except ImportError as e:
     print(f"Current sys.path: {sys.path}")
     sys.exit(1)
 
+from _cli import parse_common
+
+# From this L on, the 2^L-entry result arrays are backed by np.memmap over a temporary
+# file instead of anonymous memory (4 * 2^22 bytes = 16 MB per array at the threshold).
+# `LZ_TEST_MEMMAP_L` overrides it, so the memmap path can also be exercised at small L.
+MEMMAP_THRESHOLD_L = int(os.environ.get('LZ_TEST_MEMMAP_L', 22))
+
+# Wrapper instances shared by every test in this module, created on first use so that
+# a missing C library is reported by the test that needs it rather than at import time.
+_EXHAUSTIVE: LZExhaustiveCalculator | None = None
+_CORE: LZProcessor | None = None
+
+def get_exhaustive_calculator() -> LZExhaustiveCalculator:
+    """Returns the module-wide `LZExhaustiveCalculator`, creating it on first call."""
+    global _EXHAUSTIVE
+    if _EXHAUSTIVE is None:
+        _EXHAUSTIVE = LZExhaustiveCalculator()
+    return _EXHAUSTIVE
+
+def get_core_processor(num_threads: int | None = None) -> LZProcessor:
+    """Returns the module-wide `LZProcessor`, creating it on first call.
+
+    Args:
+        num_threads (int | None, optional): OpenMP thread count of the processor. If it differs
+            from the cached processor's, a new one replaces it. Defaults to the wrapper default.
+    """
+    global _CORE
+    if _CORE is None or (num_threads is not None and _CORE.n_threads != num_threads):
+        _CORE = LZProcessor(n_threads=num_threads)
+    return _CORE
+
 def int_to_binary_string(number: int, L: int) -> str:
     """Converts an integer to its L-bit binary string representation.
 
+    Uses `bin()` + `zfill()`, which skips the format-spec parsing of `format(number, f'0{L}b')`.
+    Bulk conversions should use `binary_strings_matrix` instead.
+
     Args:
-        number: The integer to convert.
+        number: The non-negative integer to convert.
         L: The desired length of the binary string (padded with leading zeros if needed).
 
     Returns:
         The L-bit binary string.
     """
-    return format(number, f'0{L}b')
+    return bin(number)[2:].zfill(L)
+
+def binary_strings_matrix(start: int, stop: int, L: int) -> np.ndarray:
+    """Builds the L-bit binary strings of the integers in [start, stop) as an ASCII byte matrix.
+
+    The bits are extracted with `np.unpackbits` over the big-endian bytes of the
+    integers, so no per-string Python objects are created.
+
+    Args:
+        start: First integer (inclusive).
+        stop: Last integer (exclusive).
+        L: Length of each binary string (1 <= L <= 32).
+
+    Returns:
+        A C-contiguous `np.uint8` array of shape (stop - start, L) whose row `k` holds the
+        ASCII characters ('0'/'1') of `int_to_binary_string(start + k, L)`.
+    """
+    numbers = np.arange(start, stop, dtype='>u4')
+    bits = np.unpackbits(numbers.view(np.uint8).reshape(-1, 4), axis=1)
+    return bits[:, 32 - L:] + np.uint8(ord('0'))
+
+def allocate_results_array(L: int) -> np.ndarray:
+    """Allocates a 2^L-entry `np.int32` results array.
+
+    For L >= `MEMMAP_THRESHOLD_L` the array is an `np.memmap` over an anonymous temporary
+    file, so its pages are backed by the file rather than by swap and can be reclaimed
+    by the OS once written. The file is removed automatically when the array is released.
+
+    Args:
+        L: The length of the binary strings; the array has 2^L entries.
+
+    Returns:
+        A C-contiguous `np.int32` array (or `np.memmap`) of shape (2^L,).
+    """
+    num_entries = 1 << L
+    if L < MEMMAP_THRESHOLD_L:
+        return np.empty(num_entries, dtype=np.int32)
+    backing_file = tempfile.TemporaryFile()
+    if hasattr(os, 'posix_fadvise'): # Results are written and compared front to back.
+        os.posix_fadvise(backing_file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return np.memmap(backing_file, dtype=np.int32, mode='w+', shape=(num_entries,))
+
+def report_mismatches(indices, exhaustive_phrase_counts: np.ndarray, core_phrase_counts, L: int):
+    """Prints the details of mismatching strings, formatted up front and written with a single call.
 
-def run_exhaustive_test(L: int = 16):
+    Args:
+        indices: Indices of the mismatching strings.
+        exhaustive_phrase_counts: The full array of `lz_exhaustive_generate` results (indexed by string index).
+        core_phrase_counts: The `lz_core.c` derived phrase counts, aligned with `indices`.
+        L: The length of the binary strings.
+    """
+    if len(indices) == 0:
+        return
+    sys.stdout.write("".join(
+        f"  MISMATCH for string index {i} (binary: {int_to_binary_string(int(i), L)}):\n"
+        f"    lz_exhaustive_generate result: {exhaustive_phrase_counts[i]}\n"
+        f"    lz_core.c derived phrase count: {core_count}\n"
+        for i, core_count in zip(indices, core_phrase_counts)
+    ))
+
+def run_exhaustive_test(L: int = 16, num_threads: int | None = None):
     """Tests `lz76_exhaustive_generate` against individual `lz_core.c` calculations.
 
     For a given length `L`:
@@ -76,7 +179,10 @@ def run_exhaustive_test(L: int = 16):
 
     Args:
         L (int, optional): The length of binary strings to test. Defaults to 16.
-                           Recommended L <= 20 for reasonable execution time.
+                           Recommended L <= 20 for reasonable execution time; from
+                           `MEMMAP_THRESHOLD_L` on the result arrays are memory-mapped.
+        num_threads (int | None, optional): Total number of threads for the `lz_core.c`
+                           verification. Defaults to `os.cpu_count()`.
     """
     print(f"--- LZ76 Exhaustive Correctness Test for L={L} ---")
     if L > 20:
@@ -84,87 +190,129 @@ def run_exhaustive_test(L: int = 16):
     
     num_total_strings = 1 << L
     print(f"Total strings to process: {num_total_strings:,}")
+    if L >= MEMMAP_THRESHOLD_L:
+        print(f"Result arrays are memory-mapped temporary files (L >= {MEMMAP_THRESHOLD_L}).")
 
     # 1. Get results from lz_exhaustive_generate (via wrapper)
     print(f"\n1. Calling LZExhaustiveCalculator.calculate_all_lz76_counts(L={L})...")
-    exhaustive_calculator = LZExhaustiveCalculator()
+    exhaustive_calculator = get_exhaustive_calculator()
     exhaustive_phrase_counts: np.ndarray | None = None
     
-    start_time_exhaustive = time.perf_counter()
+    start_time_exhaustive = time.perf_counter_ns()
     try:
-        exhaustive_phrase_counts = exhaustive_calculator.calculate_all_lz76_counts(L)
+        exhaustive_phrase_counts = exhaustive_calculator.calculate_all_lz76_counts(L, out=allocate_results_array(L))
         if exhaustive_phrase_counts is None: 
             print("  ERROR: calculate_all_lz76_counts returned None unexpectedly.")
             return # Cannot proceed with verification
     except Exception as e:
         print(f"  ERROR calling calculate_all_lz76_counts: {e}")
         return # Cannot proceed
-    time_exhaustive = time.perf_counter() - start_time_exhaustive
+    time_exhaustive = (time.perf_counter_ns() - start_time_exhaustive) / 1e9
     print(f"  calculate_all_lz76_counts completed in {time_exhaustive:.4f} seconds.")
     if num_total_strings > 0 and time_exhaustive > 0:
         print(f"  Avg time per string (amortized by lz_exhaustive.c): {time_exhaustive/num_total_strings:.10e}s")
 
+    fail_fast = os.environ.get('LZ_TEST_FAIL_FAST') == '1'
+    if os.environ.get('LZ_TEST_VERIFY_IN_C', '1') != '0':
+        # 2 + 3. Generate, parse and compare every string inside lz_core.c with a single call;
+        # it compares phrase counts directly, so no rescaling by log2(L) is needed.
+        print(f"\n2. Verifying all {num_total_strings:,} strings in C via LZProcessor.verify_lz76_exhaustive (lz_core.c backend)...")
+        start_time_core_verify = time.perf_counter_ns()
+        try:
+            mismatches, mismatch_indices, core_phrase_counts = get_core_processor(num_threads).verify_lz76_exhaustive(
+                exhaustive_phrase_counts, L, max_report=1 if fail_fast else 10, stop_at_first=fail_fast
+            )
+        except Exception as e_verify:
+            print(f"  ERROR calling verify_lz76_exhaustive: {e_verify}")
+            return
+        time_core_verify = (time.perf_counter_ns() - start_time_core_verify) / 1e9
+        print(f"  verify_lz76_exhaustive completed in {time_core_verify:.4f} seconds.")
+        report_mismatches(mismatch_indices, exhaustive_phrase_counts, core_phrase_counts, L)
+        if mismatches == 0:
+            print(f"  Verification PASSED for L={L}: All {num_total_strings:,} phrase counts match!")
+        elif fail_fast:
+            print(f"  Verification FAILED for L={L}: stopped at first mismatch (LZ_TEST_FAIL_FAST=1).")
+        else:
+            print(f"  Verification FAILED for L={L}: {mismatches:,}/{num_total_strings:,} mismatches found.")
+        print(f"--- Exhaustive Correctness Test for L={L} Finished ---")
+        return
+
     # 2. Get results from lz_core.c (via LZProcessor) for each string for verification.
     print(f"\n2. Calculating LZ76 phrase counts for {num_total_strings:,} strings individually using LZProcessor (lz_core.c backend)... ")
-    core_lz_processor = LZProcessor() # Uses default number of threads
-    core_derived_phrase_counts = np.empty(num_total_strings, dtype=np.int32)
-    
-    # Generate all binary strings of length L to pass to LZProcessor
-    all_binary_strings = [int_to_binary_string(i, L) for i in range(num_total_strings)]
+    core_derived_phrase_counts = allocate_results_array(L)
 
-    start_time_core_batch = time.perf_counter()
+    start_time_core_batch = time.perf_counter_ns()
     error_in_core_processing = False
-    # Process in batches to avoid passing extremely large Python lists to LZProcessor at once
-    # although LZProcessor itself batches to C. This is more about managing Python side memory for `all_binary_strings` if L is huge.
+    # Process in batches; each batch's (batch_size, L) ASCII byte matrix is generated by the
+    # worker handling that batch and dropped when it finishes, so peak memory scales with the
+    # batch size (times the number of workers) rather than with 2^L.
     # For L=20, 1 million strings. A batch of 2^18 = 262144 seems reasonable.
     batch_size_for_core_verification = 1 << 18 if num_total_strings > (1 << 18) else num_total_strings
     if batch_size_for_core_verification == 0 and num_total_strings > 0 : batch_size_for_core_verification = num_total_strings
 
-    processed_count = 0
-    for i in range(0, num_total_strings, batch_size_for_core_verification):
-        current_batch_strings = all_binary_strings[i : min(i + batch_size_for_core_verification, num_total_strings)]
-        if not current_batch_strings: continue
-
+    # Precompute (start, stop) bounds: full batches at a fixed stride, then the tail (if any) once.
+    bs = batch_size_for_core_verification
+    num_full_batches, tail_size = divmod(num_total_strings, bs)
+    batch_bounds = [(b * bs, (b + 1) * bs) for b in range(num_full_batches)]
+    if tail_size:
+        batch_bounds.append((num_full_batches * bs, num_total_strings))
+    report_progress = L >= 16 # Print progress for large L only
+    # Print whenever processed_count reaches the next threshold (~10 times, at most once per batch).
+    progress_step = max(bs, num_total_strings // 10)
+    next_progress_at = min(progress_step, num_total_strings)
+
+    # lz_core.c returns dictionary_size * log2(L). log2(1) = 0, so for L=1 the value is
+    # divided by 1 instead (the phrase count cannot be recovered from a zero scale anyway).
+    log2_L_val = math.log2(L) if L > 1 else 1.0
+
+    # Batches are independent and the ctypes calls release the GIL, so several batches are
+    # processed concurrently by a thread pool. The CPU cores are split between the workers
+    # so that (workers x OpenMP threads per call) does not oversubscribe the machine.
+    num_cpus = num_threads or os.cpu_count() or 1
+    num_workers = max(1, min(len(batch_bounds), num_cpus))
+    core_lz_processor = LZProcessor(n_threads=max(1, num_cpus // num_workers))
+
+    def process_batch(i: int, batch_stop: int) -> bool:
+        """Computes the lz_core.c phrase counts of strings [i, batch_stop); returns True on error."""
+        current_batch_matrix = binary_strings_matrix(i, batch_stop, L)
         try:
-            # LZProcessor.process_strings returns LZ76 complexity = dictionary_size * log2(L)
-            scaled_complexity_values = core_lz_processor.process_strings(
-                current_batch_strings, symmetric=False, algorithm='lz76'
+            # LZProcessor.process_bytes_matrix returns LZ76 complexity = dictionary_size * log2(L)
+            scaled_complexity_values = core_lz_processor.process_bytes_matrix(
+                current_batch_matrix, symmetric=False, algorithm='lz76'
             )
             
-            if len(scaled_complexity_values) != len(current_batch_strings):
-                print(f"  ERROR: LZProcessor batch result length mismatch. Expected {len(current_batch_strings)}, got {len(scaled_complexity_values)} for batch starting at index {i}")
-                for k_idx_in_batch in range(len(current_batch_strings)):
-                    core_derived_phrase_counts[i + k_idx_in_batch] = -98 # Error code
-                error_in_core_processing = True
-                continue # Skip to next batch
-
-            # Convert scaled complexity back to phrase count (dictionary_size)
-            log2_L_val = math.log2(L) if L > 1 else 0 # log2(1)=0. For L=1, phrase count = complexity.
-            if L == 1 and log2_L_val == 0 : log2_L_val = 1 # Avoid division by zero if L=1, treat as if log2(L) effectively 1 for scaling
-
-            for j_batch, scaled_val in enumerate(scaled_complexity_values):
-                global_string_idx = i + j_batch
-                if L == 0: # Empty string case (should not happen if L > 0)
-                    core_derived_phrase_counts[global_string_idx] = 0 
-                elif scaled_val < 0: # Error from C
-                    core_derived_phrase_counts[global_string_idx] = int(scaled_val) - 100 # Propagate distinct error
-                elif log2_L_val == 0: # Handles L=1 or if complexity was already phrase count
-                    core_derived_phrase_counts[global_string_idx] = int(round(scaled_val))
-                else:
-                    core_derived_phrase_counts[global_string_idx] = int(round(scaled_val / log2_L_val))
+            if len(scaled_complexity_values) != len(current_batch_matrix):
+                print(f"  ERROR: LZProcessor batch result length mismatch. Expected {len(current_batch_matrix)}, got {len(scaled_complexity_values)} for batch starting at index {i}")
+                core_derived_phrase_counts[i:batch_stop] = -98 # Error code
+                return True
+
+            # Convert scaled complexity back to phrase count (dictionary_size) for the whole batch.
+            # Negative values are errors from C and are propagated as distinct codes (value - 100).
+            scaled_complexity_values = np.asarray(scaled_complexity_values, dtype=np.float64)
+            core_derived_phrase_counts[i:batch_stop] = np.where(
+                scaled_complexity_values < 0,
+                scaled_complexity_values.astype(np.int32) - 100,
+                np.rint(scaled_complexity_values / log2_L_val).astype(np.int32),
+            )
         except Exception as e_proc:
             print(f"  ERROR processing batch with LZProcessor (start_idx {i}): {e_proc}")
-            for k_idx_in_batch in range(len(current_batch_strings)):
-                 core_derived_phrase_counts[i + k_idx_in_batch] = -99 # Error code
-            error_in_core_processing = True
-        
-        processed_count += len(current_batch_strings)
-        # Print progress for large L
-        if L >=16 and ( (i // batch_size_for_core_verification) % max(1, (num_total_strings // batch_size_for_core_verification) // 10 ) == 0 or processed_count == num_total_strings) :
-             progress = (processed_count / num_total_strings) * 100
-             print(f"  LZProcessor verification progress: {progress:.1f}% ({processed_count:,}/{num_total_strings:,} strings processed)")
+            core_derived_phrase_counts[i:batch_stop] = -99 # Error code
+            return True
+        return False
+
+    processed_count = 0
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        batch_futures = {executor.submit(process_batch, i, batch_stop): batch_stop - i for i, batch_stop in batch_bounds}
+        for future in as_completed(batch_futures):
+            if future.result():
+                error_in_core_processing = True
+            processed_count += batch_futures[future]
+            if report_progress and processed_count >= next_progress_at:
+                progress = (processed_count / num_total_strings) * 100
+                print(f"  LZProcessor verification progress: {progress:.1f}% ({processed_count:,}/{num_total_strings:,} strings processed)")
+                next_progress_at = min(next_progress_at + progress_step, num_total_strings)
 
-    time_core_batch = time.perf_counter() - start_time_core_batch
+    time_core_batch = (time.perf_counter_ns() - start_time_core_batch) / 1e9
     print(f"  Individual LZ76 calculations (batched) completed in {time_core_batch:.4f} seconds.")
     if num_total_strings > 0 and time_core_batch > 0:
         print(f"  Avg time per string (LZProcessor individual): {time_core_batch/num_total_strings:.10e}s")
@@ -179,14 +327,23 @@ def run_exhaustive_test(L: int = 16):
         print(f"  CRITICAL ERROR: Length mismatch for exhaustive_results. Expected {num_total_strings}, got {len(exhaustive_phrase_counts)}")
         mismatches = num_total_strings # Fail all if lengths don't match
     else:
-        for i in range(num_total_strings):
-            if exhaustive_phrase_counts[i] != core_derived_phrase_counts[i]:
-                if mismatches < 10: # Print details for the first few mismatches
-                    bin_str_for_mismatch = int_to_binary_string(i, L)
-                    print(f"  MISMATCH for string index {i} (binary: {bin_str_for_mismatch}):")
-                    print(f"    lz_exhaustive_generate result: {exhaustive_phrase_counts[i]}")
-                    print(f"    lz_core.c derived phrase count: {core_derived_phrase_counts[i]}")
-                mismatches += 1
+        mismatch_mask = exhaustive_phrase_counts != core_derived_phrase_counts
+        if fail_fast:
+            # argmax on a boolean mask returns the index of the first True entry.
+            first_mismatch_idx = int(np.argmax(mismatch_mask))
+            if mismatch_mask[first_mismatch_idx]:
+                report_mismatches([first_mismatch_idx], exhaustive_phrase_counts,
+                                  [core_derived_phrase_counts[first_mismatch_idx]], L)
+                print(f"  Verification FAILED for L={L}: stopped at first mismatch (LZ_TEST_FAIL_FAST=1).")
+                print(f"--- Exhaustive Correctness Test for L={L} Finished ---")
+                return
+        mismatches = int(np.count_nonzero(mismatch_mask))
+        if mismatches:
+            # flatnonzero returns mismatch indices already in ascending order, so the first
+            # few can be reported directly; reporting cost stays O(10) even if everything mismatches.
+            first_mismatch_indices = np.flatnonzero(mismatch_mask)[:10] # Print details for the first few mismatches
+            report_mismatches(first_mismatch_indices, exhaustive_phrase_counts,
+                              core_derived_phrase_counts[first_mismatch_indices], L)
 
     if mismatches == 0 and not error_in_core_processing:
         print(f"  Verification PASSED for L={L}: All {num_total_strings:,} phrase counts match!")
@@ -196,7 +353,7 @@ def run_exhaustive_test(L: int = 16):
     print(f"--- Exhaustive Correctness Test for L={L} Finished ---")
 
 
-def run_distribution_test_and_verify(L_small: int = 10):
+def run_distribution_test_and_verify(L_small: int = 10, num_threads: int | None = None):
     """Tests `lz76_exhaustive_distribution` against a manually constructed distribution.
 
     For a small `L` (default 10):
@@ -207,13 +364,15 @@ def run_distribution_test_and_verify(L_small: int = 10):
 
     Args:
         L_small (int, optional): The length L for this test. Defaults to 10.
+        num_threads (int | None, optional): Number of threads for the direct distribution.
+                                            Defaults to `os.cpu_count()`.
     """
     print(f"\n--- LZ76 Exhaustive Distribution Correctness Test for L={L_small} ---")
     num_total_strings = 1 << L_small
     print(f"Verifying distribution function using 2^{L_small} = {num_total_strings:,} strings.")
     
     try:
-        exhaustive_calculator = LZExhaustiveCalculator()
+        exhaustive_calculator = get_exhaustive_calculator()
     except Exception as e_init:
         print(f"ERROR: Could not initialize LZExhaustiveCalculator for distribution test: {e_init}")
         return
@@ -229,23 +388,17 @@ def run_distribution_test_and_verify(L_small: int = 10):
         print(f"  ERROR calculating all phrase counts for L={L_small}: {e_calc_all}")
         return
         
-    # Determine the maximum observed complexity to size the reference distribution array.
-    max_observed_complexity = 0
-    if len(all_phrase_counts_for_ref) > 0:
-        max_observed_complexity = np.max(all_phrase_counts_for_ref)
-    
-    # `max_complexity_to_track` for the C function needs to be at least max_observed_complexity + 1.
-    # The wrapper for get_lz76_complexity_distribution defaults to L+5, which is usually fine.
-    # We use a slightly larger size for our reference to be safe.
-    ref_dist_size = max(L_small + 5, int(max_observed_complexity) + 2) 
-
-    reference_distribution = np.zeros(ref_dist_size, dtype=np.longlong)
-    for count_val in all_phrase_counts_for_ref:
-        if 0 <= count_val < ref_dist_size -1: # Check bounds for safety
-            reference_distribution[count_val] += 1
-        elif count_val >= ref_dist_size -1: # Put into overflow bin
-             reference_distribution[ref_dist_size - 1] += 1
-        # Negative counts from errors in calculate_all_lz76_counts are ignored here.
+    # Size the reference distribution from the theoretical bound instead of scanning all 2^L counts:
+    # the LZ76 phrase count of a length-L string is at most L+1, so L+5 (the same default used by
+    # get_lz76_complexity_distribution) always leaves room. Anything larger lands in the overflow bin.
+    ref_dist_size = L_small + 5
+
+    # Histogram of the phrase counts; counts >= ref_dist_size - 1 are clipped into the overflow bin.
+    # Negative counts from errors in calculate_all_lz76_counts are ignored here.
+    valid_phrase_counts = all_phrase_counts_for_ref[all_phrase_counts_for_ref >= 0]
+    reference_distribution = np.bincount(
+        np.minimum(valid_phrase_counts, ref_dist_size - 1), minlength=ref_dist_size
+    ).astype(np.longlong)
 
     print(f"  Reference distribution constructed for L={L_small} (size: {ref_dist_size}):")
     # for c, num in enumerate(reference_distribution): # Can be verbose
@@ -259,7 +412,7 @@ def run_distribution_test_and_verify(L_small: int = 10):
         direct_distribution_from_c = exhaustive_calculator.get_lz76_complexity_distribution(
             L_small, 
             max_complexity_to_track=ref_dist_size, 
-            num_threads=os.cpu_count() # Use multiple threads if available
+            num_threads=num_threads or os.cpu_count() # Use multiple threads if available
         )
         if direct_distribution_from_c is None:
             print("  ERROR: get_lz76_complexity_distribution returned None.")
@@ -287,11 +440,8 @@ def run_distribution_test_and_verify(L_small: int = 10):
     else:
         print(f"  Distribution Verification FAILED for L={L_small}.")
         # Find first mismatch for detailed output
-        mismatch_idx = -1
-        for i in range(max_len_for_compare):
-            if ref_padded[i] != direct_padded[i]:
-                mismatch_idx = i
-                break
+        differing_bins = np.flatnonzero(ref_padded != direct_padded)
+        mismatch_idx = int(differing_bins[0]) if differing_bins.size else -1
         print(f"    Mismatch found at complexity index: {mismatch_idx}" if mismatch_idx !=-1 else "    Mismatch details complex.")
         print(f"    Reference (len {len_ref}): {reference_distribution[:min(len_ref, 20)]} ...")
         print(f"    Direct C (len {len_direct}): {direct_distribution_from_c[:min(len_direct,20)]} ...")
@@ -325,61 +475,24 @@ def run_large_L_distribution_only(L_target_large: int, num_threads: int | None =
     #     print(f"Error in minimal large L run: {e}")
 
 if __name__ == "__main__":
-    # Default L for the main correctness test (exhaustive_results vs core_results_phrases)
-    L_param_correctness_test = 16 
     # Default L for distribution verification (reference_distribution vs direct_distribution)
     L_param_dist_verification_test = 10 
 
-    # Command-line argument parsing
     if len(sys.argv) > 1 and sys.argv[1].lower() == "distribution_only":
-        # Mode: Run only large L distribution (delegated or minimal example)
-        L_dist_large_run = 24 # Default L for this mode
-        threads_dist_large_run = None
-        if len(sys.argv) > 2:
-            try:
-                L_dist_large_run = int(sys.argv[2])
-                if not (1 <= L_dist_large_run <= 35):
-                    print("ERROR: For 'distribution_only' mode, L must be between 1 and 35.")
-                    sys.exit(1)
-                if len(sys.argv) > 3:
-                    threads_dist_large_run = int(sys.argv[3])
-                    if threads_dist_large_run <= 0:
-                        print("ERROR: Number of threads must be positive.")
-                        sys.exit(1)
-            except ValueError:
-                print("Usage: python test_lz_exhaustive.py distribution_only [L (1-35)] [num_threads (optional)]")
-                sys.exit(1)
-        # Note: The run_large_L_distribution_only function in this file now mostly points to the other script.
-        # For a true large run, the user should use run_large_lz_distribution.py.
-        # Here, we will just call it to show the redirection message.
-        run_large_L_distribution_only(L_target_large=L_dist_large_run, num_threads=threads_dist_large_run)
-    
-    elif len(sys.argv) > 1:
-        # Mode: Run correctness test with specified L
-        try:
-            L_param_correctness_test = int(sys.argv[1])
-            if not (1 <= L_param_correctness_test <= 20): # Max L for this test due to 2*2^L operations
-                print(f"ERROR: For correctness test, L must be between 1 and 20. Provided: {L_param_correctness_test}")
-                sys.exit(1)
-            # Distribution verification L will remain default or could also be made an argument.
-        except ValueError:
-            print(f"Usage: python {sys.argv[0]} [L_for_correctness_test (1-20)]")
-            print(f"   or: python {sys.argv[0]} distribution_only [L_for_large_dist (1-35)] [threads]")
-            sys.exit(1)
-        
-        print(f"Running Correctness Test with L={L_param_correctness_test}")
-        run_exhaustive_test(L=L_param_correctness_test) 
-        print("\n" + "="*80 + "\n")
-        # Distribution verification test will run with its default L unless also parameterized.
-        print(f"Running Distribution Verification Test with default L={L_param_dist_verification_test}")
-        run_distribution_test_and_verify(L_small=L_param_dist_verification_test)
+        # Mode: Run only large L distribution (delegated to run_large_lz_distribution.py)
+        args = parse_common(sys.argv[2:], description="Large-L LZ76 distribution run (see run_large_lz_distribution.py).",
+                            L_default=24, L_max=35)
+        run_large_L_distribution_only(L_target_large=args.L, num_threads=args.threads)
     else:
-        # Default Mode: Run both tests with default L values
-        print(f"Running Correctness Test with default L={L_param_correctness_test}")
-        run_exhaustive_test(L=L_param_correctness_test) 
+        # Mode: Run correctness test (default L=16, max 24 due to 2*2^L operations) and distribution verification.
+        # L >= MEMMAP_THRESHOLD_L (22) runs with memory-mapped result arrays.
+        args = parse_common(description="Exhaustive LZ76 correctness tests. Use 'distribution_only [L] [threads]' for large-L runs.",
+                            L_default=16, L_max=24)
+        print(f"Running Correctness Test with {'' if args.L_given else 'default '}L={args.L}")
+        run_exhaustive_test(L=args.L, num_threads=args.threads)
         print("\n" + "="*80 + "\n")
         print(f"Running Distribution Verification Test with default L={L_param_dist_verification_test}")
-        run_distribution_test_and_verify(L_small=L_param_dist_verification_test)
+        run_distribution_test_and_verify(L_small=L_param_dist_verification_test, num_threads=args.threads)
     
     print("\n" + "="*80)
-    print("All specified tests in test_lz_exhaustive.py finished.") 
\ No newline at end of file
+    print("All specified tests in test_lz_exhaustive.py finished.")
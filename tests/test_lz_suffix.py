@@ -7,30 +7,44 @@ implementations for calculating phrase counts (dictionary size):
     (from `hadi_LZ_package.python_backend.lz_suffix`).
 2.  **LZSuffixTreeWrapper (Single Mode)**: The C-backed suffix tree implementation
     (from `hadi_LZ_package.lz_suffix_wrapper`, using `lz_suffix_combined.c`),
-    processing strings by adding characters one by one.
+    processing one string at a time with `add_string` (one C call per string). The
+    correctness pass also feeds every string to `add_character` one character at a
+    time, so the per-character C entry point is checked against the reference too.
 3.  **LZSuffixTreeWrapper (Batch Mode)**: The same C-backed wrapper, but using its
-    `compute_lz76_complexity_batch` method.
-4.  **Reference Inefficient Python LZ76**: A direct, less optimized Python LZ76
-    phrase counting function (`get_inefficient_lz76_phrase_count` copied from
-    `lz_inefficient.py` and adapted here) used as a baseline for correctness.
-
-The script generates random binary strings, processes them with each method,
-compares the resulting phrase counts, and reports timing information.
-
-Command-line arguments can be used to specify the number of test strings and
-their minimum/maximum lengths.
+    `compute_lz76_complexity_batch_packed` method.
+4.  **Reference Python LZ76** (`reference_phrase_count`): used as a baseline for
+    correctness. With `pydivsufsort` installed it is the suffix-array based counter
+    (`sa_lz76_phrase_count`); otherwise it is the direct parsing
+    (`get_inefficient_lz76_phrase_count` copied from `lz_inefficient.py` and adapted
+    here), or its JIT-compiled uint8 version (`lz76_reference_phrase_count_uint8`)
+    if Numba is installed, since sorting the suffixes in Python is slower than the
+    direct parsing at the default lengths. On a few strings the reference is
+    cross-checked against the other counter.
+
+Correctness and performance are separate passes:
+- `verify_lz` (correctness gate) processes a deterministic corpus (every binary
+  string up to length 12 plus structured patterns such as "0"*k, "01"*k, Fibonacci
+  and Thue-Morse prefixes) with each method and compares the phrase counts with
+  the reference. The first mismatch is shrunk to a minimal failing string.
+- `benchmark_lz` (performance) times only the suffix-tree implementations on
+  random strings; no reference is computed in this pass.
+
+Command-line arguments specify the number of random strings and their
+minimum/maximum lengths. When they are given, or the environment variable
+`LZ_RANDOM=1` is set, the random strings are also used for the correctness gate.
 
 Usage:
     python test_lz_suffix.py [num_strings] [min_len] [max_len]
 
 Example:
+    python test_lz_suffix.py
     python test_lz_suffix.py 1000 50 150
 '''
-import random
 import sys
 import os
 import time
-# import numpy as np # Not strictly needed here as we compare integer phrase counts.
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 
 # --- Path Setup --- 
 # Add the project root to sys.path to allow importing from hadi_LZ_package
@@ -50,24 +64,105 @@ except ImportError as e:
     print(f"Current sys.path: {sys.path}")
     sys.exit(1)
 
-def generate_random_binary_string(min_len: int = 30, max_len: int = 100) -> str:
-    """Generates a random binary string of a specified length range.
+from _bench import make_progress_printer, report_interpreter, WARMUP_STRINGS
+from _cli import parse_string_test_args
+
+try:
+    from numba import njit # Optional: JIT-compiles the uint8 reference LZ76 below.
+except ImportError:
+    njit = None
+
+try:
+    from pydivsufsort import divsufsort # Optional: linear-time suffix array construction.
+except ImportError:
+    divsufsort = None
+
+def generate_random_binary_strings(num_strings: int, min_len: int = 30, max_len: int = 100,
+                                   rng: np.random.Generator | None = None) -> list[str]:
+    """Generates a batch of random binary strings with lengths in [min_len, max_len].
+
+    All lengths and all bits are drawn in two vectorized calls: the bits form one
+    contiguous ASCII '0'/'1' buffer of `sum(lengths)` characters, which is decoded
+    once and sliced at the cumulative-length offsets.
 
     Args:
-        min_len (int, optional): Minimum length of the string. Defaults to 30.
-        max_len (int, optional): Maximum length of the string. Defaults to 100.
+        num_strings (int): Number of strings to generate.
+        min_len (int, optional): Minimum length of each string. Defaults to 30.
+        max_len (int, optional): Maximum length of each string. Defaults to 100.
+        rng (np.random.Generator | None, optional): Random generator to use.
+                                                    Defaults to `np.random.default_rng()`.
 
     Returns:
-        str: A randomly generated binary string.
-             Returns an empty string if max_len < min_len or if max_len is < 0.
+        list[str]: The generated strings. Returns an empty list if num_strings <= 0,
+                   max_len < min_len or max_len < 0.
     """
-    if max_len < min_len or max_len < 0:
-        return ""
-    length = random.randint(min_len, max_len)
-    if length == 0: 
-        return ""
-    return "".join(random.choices(['0', '1'], k=length))
+    if num_strings <= 0 or max_len < min_len or max_len < 0:
+        return []
+    if rng is None:
+        rng = np.random.default_rng()
+    lengths = rng.integers(max(min_len, 0), max_len + 1, size=num_strings)
+    ends = np.cumsum(lengths).tolist()
+    bits = rng.integers(0, 2, size=ends[-1], dtype=np.uint8) + np.uint8(ord('0'))
+    text = bits.tobytes().decode('ascii')
+    starts = [0] + ends[:-1]
+    return [text[start:end] for start, end in zip(starts, ends)]
+
+def generate_structured_test_strings(max_exhaustive_len: int = 12, max_pattern_len: int = 64) -> list[str]:
+    """Generates the deterministic default corpus: all short binary strings plus adversarial patterns.
+
+    The corpus holds every binary string of length 1..`max_exhaustive_len`
+    (2^(max_exhaustive_len+1) - 2 strings), which covers the small-input space
+    completely, followed by the prefixes of length `max_exhaustive_len`+1..`max_pattern_len`
+    of a few highly structured infinite words: "000...", "0101...", "001001...",
+    the Fibonacci word and the Thue-Morse sequence.
 
+    Args:
+        max_exhaustive_len (int, optional): Longest length enumerated exhaustively. Defaults to 12.
+        max_pattern_len (int, optional): Longest prefix taken from each structured word. Defaults to 64.
+
+    Returns:
+        list[str]: The distinct strings, shortest exhaustive strings first.
+    """
+    strings = [format(value, f'0{length}b') for length in range(1, max_exhaustive_len + 1)
+               for value in range(1 << length)]
+    fibonacci_word, previous_word = "01", "0"
+    while len(fibonacci_word) < max_pattern_len:
+        fibonacci_word, previous_word = fibonacci_word + previous_word, fibonacci_word
+    words = ["0" * max_pattern_len, "01" * max_pattern_len, "001" * max_pattern_len, fibonacci_word,
+             "".join(str(bin(i).count("1") & 1) for i in range(max_pattern_len))] # Thue-Morse
+    strings.extend(word[:length] for word in words for length in range(max_exhaustive_len + 1, max_pattern_len + 1))
+    return list(dict.fromkeys(strings)) # Drop duplicates, keep order
+
+def shrink_counterexample(failing_string: str, is_failing) -> str:
+    """Greedily shrinks a failing string to a locally minimal one that still fails.
+
+    Repeatedly tries to delete blocks of characters (halves first, then smaller
+    blocks down to single characters) and keeps any deletion after which
+    `is_failing` still returns True, in the style of property-based test shrinking.
+
+    Args:
+        failing_string (str): A string for which `is_failing` returns True.
+        is_failing (Callable[[str], bool]): The failure predicate.
+
+    Returns:
+        str: A string no longer than `failing_string` for which `is_failing` is True and
+             no single block deletion keeps it failing.
+    """
+    current = failing_string
+    block = max(1, len(current) // 2)
+    while block >= 1:
+        shrunk = False
+        start = 0
+        while start < len(current):
+            candidate = current[:start] + current[start + block:]
+            if candidate and is_failing(candidate):
+                current = candidate
+                shrunk = True
+            else:
+                start += block
+        if not shrunk:
+            block //= 2
+    return current
 
 # Copied and modified from lz_inefficient.py to get raw dictionary_size (phrase count).
 # This serves as a baseline Python implementation for LZ76 phrase counting.
@@ -83,6 +178,15 @@ def get_inefficient_lz76_phrase_count(input_string: str) -> int:
     `current_word` without its last character), then `current_word` becomes a new phrase,
     is added to `parsed_text`, and `dictionary_size` is incremented.
 
+    The completed phrases are always a prefix of `input_string`, so that history is
+    just `input_string[:i]` and `current_word` is `input_string[phrase_start:i + 1]`.
+    Both are tracked by index and searched with a bounded `str.find`, so no
+    intermediate strings are concatenated per character.
+
+    The search is also incremental: if `current_word[:-1]` occurs at `match_pos`,
+    no earlier start can match `current_word`, so the occurrence is first extended
+    by one character in place and only on a miss searched for from `match_pos + 1`.
+
     Args:
         input_string (str): The string to analyze.
 
@@ -92,161 +196,468 @@ def get_inefficient_lz76_phrase_count(input_string: str) -> int:
     if not input_string: # Handle empty string explicitly
         return 0
 
-    current_word = ''
-    parsed_text_history = '' # Concatenation of completed phrases
-    remaining_string = input_string
+    phrase_start = 0 # Start index of the current word; input_string[:phrase_start] is the parsed history
+    match_pos = -1 # Earliest occurrence of current_word[:-1] in the history (-1 at a phrase start)
     dictionary_size = 0
     
-    while remaining_string != '':
-        next_character = remaining_string[0]
-        current_word += next_character
-        remaining_string = remaining_string[1:]
-        # No l_cw needed for `in` operator
-
-        # Search space is previously parsed phrases + current word prefix
-        search_space = parsed_text_history + current_word[:-1]
-        
-        is_substring_in_history = current_word in search_space
+    for i in range(len(input_string)):
+        # Search space = parsed history + current_word[:-1] = input_string[:i]
+        word_len = i - phrase_start + 1
+        if match_pos < 0 or input_string[match_pos + word_len - 1] != input_string[i]:
+            match_pos = input_string.find(input_string[phrase_start:i + 1], match_pos + 1, i)
+        is_substring_in_history = match_pos != -1
         
         if not is_substring_in_history:
             dictionary_size += 1
-            parsed_text_history += current_word
-            current_word = '' # Reset for the next phrase
+            phrase_start = i + 1 # Reset for the next phrase
             
-    if current_word != '': # Account for the last phrase if any
+    if phrase_start < len(input_string): # Account for the last phrase if any
         dictionary_size += 1
     return dictionary_size
 
-def run_lz_tests(num_strings: int = 10000, min_str_len: int = 30, max_str_len: int = 100):
-    """Runs tests comparing Python and C LZ76 suffix tree implementations.
+def _lz76_phrase_count_uint8(a: np.ndarray) -> int:
+    """Index-based version of `get_inefficient_lz76_phrase_count` over a uint8 array.
+
+    The completed phrases always form a prefix of the input, so the search space
+    (`parsed_text_history + current_word[:-1]`) is simply `a[:i]` and the current
+    word is `a[phrase_start:i + 1]`; no intermediate strings are built. Written in
+    the subset of Python that Numba compiles.
+
+    Args:
+        a (np.ndarray): 1D uint8 array holding the string's characters.
+
+    Returns:
+        int: The number of phrases in the LZ76 dictionary (phrase count).
+    """
+    n = a.shape[0]
+    dictionary_size = 0
+    phrase_start = 0
+    for i in range(n):
+        word_len = i - phrase_start + 1
+        found = False
+        for start in range(i - word_len + 1):
+            match = True
+            for k in range(word_len):
+                if a[start + k] != a[phrase_start + k]:
+                    match = False
+                    break
+            if match:
+                found = True
+                break
+        if not found:
+            dictionary_size += 1
+            phrase_start = i + 1
+    if phrase_start < n: # Account for the last phrase if any
+        dictionary_size += 1
+    return dictionary_size
 
-    Generates random binary strings and processes them using:
-    - Pure Python LZSuffixTree (single character additions).
-    - C-backed LZSuffixTreeWrapper (single character additions).
-    - C-backed LZSuffixTreeWrapper (batch processing).
-    - A reference inefficient Python LZ76 phrase counter.
+# JIT-compiled reference (None when Numba is not installed).
+lz76_reference_phrase_count_uint8 = njit(cache=True)(_lz76_phrase_count_uint8) if njit is not None else None
 
-    Compares phrase counts and reports timing for each method.
+def direct_phrase_count(input_string: str) -> int:
+    """Direct LZ76 parsing (the Numba uint8 counter if available, else `get_inefficient_lz76_phrase_count`)."""
+    if lz76_reference_phrase_count_uint8 is not None:
+        return int(lz76_reference_phrase_count_uint8(np.frombuffer(input_string.encode('ascii'), dtype=np.uint8)))
+    return get_inefficient_lz76_phrase_count(input_string)
+
+def pack_strings(strings: list[str], width: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Packs ASCII strings into the rows of one zero-padded uint8 matrix.
 
     Args:
-        num_strings (int, optional): Number of random strings for testing. Defaults to 10,000.
-        min_str_len (int, optional): Minimum length of generated strings. Defaults to 30.
-        max_str_len (int, optional): Maximum length of generated strings. Defaults to 100.
+        strings (list[str]): The strings to pack.
+        width (int | None, optional): Number of columns. Defaults to the longest string length.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The (len(strings), width) uint8 matrix, with string
+            `i` in the first `lengths[i]` bytes of row `i`, and the int32 `lengths` array.
     """
-    print(f"--- Starting LZ76 Suffix Tree Implementation Tests ---")
-    print(f"Number of test strings: {num_strings:,}")
-    print(f"String length range: {min_str_len} - {max_str_len}")
-    
-    overall_success_count = 0
-    overall_fail_count = 0
-    
-    total_py_st_time_single = 0
-    total_c_st_wrapper_time_single = 0
-    total_inefficient_py_time_single = 0
-
-    # Generate all test strings upfront for consistent comparison
-    print(f"\nGenerating {num_strings:,} test strings...")
-    batch_test_strings = []
-    for _ in range(num_strings):
-        s = generate_random_binary_string(min_len=min_str_len, max_len=max_str_len)
-        # Ensure non-empty for consistent testing, though LZ76 can handle empty.
-        if not s and (min_str_len > 0 or max_str_len > 0): 
-            s = "0" # Default to "0" if generation unexpectedly yields empty for non-zero length request
-        batch_test_strings.append(s)
-    print("Test string generation complete.")
-
-    # --- Test Single String Processing (character by character) --- 
-    print("\n--- Stage 1: Single String Processing (Character by Character) --- ")
-    single_mode_results_python_st = []
-    single_mode_results_c_wrapper = []
-    single_mode_results_inefficient = []
-
-    for i, test_str in enumerate(batch_test_strings):
-        current_iter_failed = False
-        # 1. Pure Python LZSuffixTree
-        py_lz_st_instance = PythonLZSuffixTree() # Fresh instance each time
-        start_t = time.perf_counter()
-        try:
-            for char_s in test_str:
-                py_lz_st_instance.add_character(char_s)
-            py_st_phrase_count = py_lz_st_instance.compute_lz76_complexity()
-            single_mode_results_python_st.append(py_st_phrase_count)
-        except Exception as e_py_st:
-            print(f"  ERROR (PythonLZSuffixTree, str {i+1}): {e_py_st} for '{test_str[:30]}...'")
-            single_mode_results_python_st.append(-1)
-            current_iter_failed = True
-        total_py_st_time_single += (time.perf_counter() - start_t)
-
-        # 2. C-backed LZSuffixTreeWrapper (single char mode)
-        c_lz_wrapper_instance_single = LZSuffixTreeWrapper() # Fresh instance
-        start_t = time.perf_counter()
-        try:
-            for char_s in test_str:
-                c_lz_wrapper_instance_single.add_character(char_s)
-            c_wrapper_phrase_count_single = c_lz_wrapper_instance_single.compute_lz76_complexity()
-            single_mode_results_c_wrapper.append(c_wrapper_phrase_count_single)
-        except Exception as e_c_single:
-            print(f"  ERROR (LZSuffixTreeWrapper single, str {i+1}): {e_c_single} for '{test_str[:30]}...'")
-            single_mode_results_c_wrapper.append(-2)
-            current_iter_failed = True
-        total_c_st_wrapper_time_single += (time.perf_counter() - start_t)
-
-        # 3. Reference Inefficient Python LZ76
-        start_t = time.perf_counter()
+    lengths = np.fromiter(map(len, strings), dtype=np.int32, count=len(strings))
+    if width is None:
+        width = int(lengths.max()) if lengths.size else 0
+    chars = np.zeros((len(strings), width), dtype=np.uint8)
+    # Boolean mask of the used cells; assigning in row-major order lays out the concatenation.
+    chars[np.arange(width) < lengths[:, None]] = np.frombuffer(''.join(strings).encode('ascii'), dtype=np.uint8)
+    return chars, lengths
+
+def suffix_array(text: bytes) -> list[int]:
+    """Returns the suffix array of `text` (start positions of its suffixes in lexicographic order).
+
+    Uses `pydivsufsort` if it is installed, otherwise sorts the suffixes directly
+    (fine for the short strings used in these tests).
+    """
+    if divsufsort is not None:
+        return divsufsort(text).tolist()
+    return sorted(range(len(text)), key=lambda i: text[i:])
+
+def sa_lz76_phrase_count(input_string: str) -> int:
+    """Calculates the LZ76 phrase count from the suffix array of the string.
+
+    Same parsing as `get_inefficient_lz76_phrase_count`: a phrase starting at `p` is the
+    longest prefix of `input_string[p:]` that also starts at some `j < p` (overlaps allowed),
+    plus one new character. That longest previous match is the larger LCP of the suffix at
+    `p` with its nearest lexicographic neighbours among the suffixes starting before `p`
+    (previous/next smaller value in the suffix array, found with one stack pass), as in
+    Ohlebusch & Gog, "Lempel-Ziv Factorization Revisited". The LCPs are only computed at
+    phrase starts, by direct comparison, which costs O(n) over the whole string.
+
+    Args:
+        input_string (str): The string to analyze.
+
+    Returns:
+        int: The number of phrases in the LZ76 dictionary (phrase count).
+    """
+    text = input_string.encode('ascii')
+    n = len(text)
+    if n == 0:
+        return 0
+
+    # psv[p] / nsv[p]: closest suffix before / after suffix p in lexicographic order
+    # among the suffixes starting at a position < p (-1 if there is none).
+    psv = [-1] * n
+    nsv = [-1] * n
+    stack = [] # Positions in increasing order
+    for p in suffix_array(text):
+        while stack and stack[-1] > p:
+            nsv[stack.pop()] = p
+        psv[p] = stack[-1] if stack else -1
+        stack.append(p)
+
+    dictionary_size = 0
+    p = 0
+    while p < n:
+        longest_match = 0
+        for j in (psv[p], nsv[p]):
+            if j >= 0:
+                length = 0
+                while p + length < n and text[j + length] == text[p + length]:
+                    length += 1
+                longest_match = max(longest_match, length)
+        dictionary_size += 1
+        p += longest_match + 1 # Matched part plus the new character
+    return dictionary_size
+
+# The suffix-array counter only pays off with a linear-time suffix array (pydivsufsort);
+# without it the suffixes are sorted in Python and the direct parsing is faster.
+REFERENCE_NAME = "suffix-array" if divsufsort is not None else "direct"
+
+def reference_phrase_count(input_string: str) -> int:
+    """Returns the reference LZ76 phrase count of `input_string` (see `REFERENCE_NAME`).
+
+    Uses `sa_lz76_phrase_count` when `pydivsufsort` is installed and `direct_phrase_count`
+    otherwise; both implement the same parsing.
+    """
+    if divsufsort is not None:
+        return sa_lz76_phrase_count(input_string)
+    return direct_phrase_count(input_string)
+
+# Hand-checked LZ76 phrase counts (e.g. 0|001|10|100|1000|101 for the Kaspar-Schuster example),
+# used to guard the reference counters (in particular the JIT-compiled one) against regressions.
+REFERENCE_HAND_CASES = {
+    "0": 1, "1": 1, "00": 2, "01": 2, "000": 2, "010": 3, "0011": 3, "0101": 3,
+    "0110": 3, "0111": 3, "1001": 3, "00000000": 2, "01010101": 3, "1010101010": 3,
+    "0000000001": 2, "1000000000": 3, "1111111111111111": 2, "0001101001000101": 6,
+    "0110100110010110": 7, "0100011011000001010011100101110111": 10,
+    "aab": 2, "abc": 3, "aaaa": 2, "abab": 3, "abba": 3, "aaaaab": 2, "abcabc": 4,
+    "xyzxyz": 4, "banana": 4, "mississippi": 6, "0123456789": 10,
+}
+
+def check_reference_implementations() -> int:
+    """Checks every reference LZ76 counter against `REFERENCE_HAND_CASES`.
+
+    Covers `get_inefficient_lz76_phrase_count`, its uint8 version (interpreted, and
+    JIT-compiled if Numba is installed) and `sa_lz76_phrase_count`.
+
+    Returns:
+        int: The number of (counter, string) pairs that disagree with the expected count.
+    """
+    counters = {
+        "get_inefficient_lz76_phrase_count": get_inefficient_lz76_phrase_count,
+        "_lz76_phrase_count_uint8": lambda s: _lz76_phrase_count_uint8(np.frombuffer(s.encode('ascii'), dtype=np.uint8)),
+        "sa_lz76_phrase_count": sa_lz76_phrase_count,
+    }
+    if lz76_reference_phrase_count_uint8 is not None:
+        counters["lz76_reference_phrase_count_uint8 (Numba)"] = (
+            lambda s: lz76_reference_phrase_count_uint8(np.frombuffer(s.encode('ascii'), dtype=np.uint8)))
+    failures = 0
+    for name, counter in counters.items():
+        for hand_string, expected_count in REFERENCE_HAND_CASES.items():
+            actual_count = int(counter(hand_string))
+            if actual_count != expected_count:
+                print(f"  REFERENCE MISMATCH ({name}) for '{hand_string}': expected {expected_count}, got {actual_count}")
+                failures += 1
+    return failures
+
+def _reference_phrase_count_or_error(input_string: str) -> int:
+    """Worker for `compute_reference_phrase_counts`: returns -3 instead of raising on error."""
+    try:
+        return reference_phrase_count(input_string)
+    except Exception as e_ineff:
+        print(f"  ERROR (Reference Python LZ76): {e_ineff} for '{input_string[:30]}...'")
+        return -3
+
+def compute_reference_phrase_counts(strings: list[str], max_workers: int | None = None) -> np.ndarray:
+    """Computes the reference LZ76 phrase count of every string in parallel.
+
+    Each string is independent, so the reference counter (`reference_phrase_count`)
+    is mapped over the strings with a `ProcessPoolExecutor`.
+
+    Args:
+        strings (list[str]): The strings to analyze.
+        max_workers (int | None, optional): Number of worker processes. Defaults to the executor default.
+
+    Returns:
+        np.ndarray: int32 array of phrase counts, with -3 for strings whose computation failed.
+    """
+    reference_counts = np.empty(len(strings), dtype=np.int32)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for i, count in enumerate(executor.map(_reference_phrase_count_or_error, strings, chunksize=64)):
+            reference_counts[i] = count
+    return reference_counts
+
+def process_char_by_char(lz_instance, strings: list[str], results: np.ndarray, error_code: int, label: str,
+                         report_progress: bool = True, use_add_string: bool = True) -> int:
+    """Computes LZ76 phrase counts of online (incrementally built) trees, for all strings in one pass.
+
+    The same instance is reset before every string. By default, instances with an
+    `add_string` method receive each string in one call: for `LZSuffixTreeWrapper` the
+    character loop then runs in C (`add_string_lz_c`) instead of making one ctypes call
+    per character, and `PythonLZSuffixTree.add_string` runs the same `add_character`
+    loop internally. With `use_add_string=False` every character is passed to
+    `add_character` one by one (for the wrapper, one `add_char_lz_c` call each).
+
+    Args:
+        lz_instance: A `PythonLZSuffixTree` or `LZSuffixTreeWrapper` (anything with
+                     `reset`, `add_character` and `compute_lz76_complexity`).
+        strings (list[str]): The strings to process.
+        results (np.ndarray): Output int32 array; `results[i]` receives the phrase count of `strings[i]`.
+        error_code (int): Value stored in `results[i]` if processing `strings[i]` raises.
+        label (str): Name of the implementation for error and progress messages.
+        report_progress (bool, optional): Print progress at most every 0.5s. Defaults to True.
+        use_add_string (bool, optional): Use `add_string` when the instance has it. Defaults to True.
+
+    Returns:
+        int: Total time spent processing the strings, in nanoseconds (one
+             `perf_counter_ns()` pair around the whole pass).
+    """
+    num_strings = len(strings)
+    report = make_progress_printer(num_strings, f"  {label} progress") if report_progress else None
+    add_string = getattr(lz_instance, 'add_string', None) if use_add_string else None
+    add_character = lz_instance.add_character # Bound method looked up once, not per character
+    start_ns = time.perf_counter_ns()
+    for i, test_str in enumerate(strings):
+        lz_instance.reset()
         try:
-            inefficient_ref_count = get_inefficient_lz76_phrase_count(test_str)
-            single_mode_results_inefficient.append(inefficient_ref_count)
-        except Exception as e_ineff:
-            print(f"  ERROR (Inefficient Python LZ76, str {i+1}): {e_ineff} for '{test_str[:30]}...'")
-            single_mode_results_inefficient.append(-3)
-            current_iter_failed = True
-        total_inefficient_py_time_single += (time.perf_counter() - start_t)
-
-        # Comparison for this string (only if all succeeded so far for this string)
-        if not current_iter_failed:
-            if not (py_st_phrase_count == c_wrapper_phrase_count_single == inefficient_ref_count):
-                print(f"  MISMATCH (Single, str {i+1}) for '{test_str[:70]}...':")
-                print(f"    PythonLZSuffixTree: {py_st_phrase_count}")
-                print(f"    LZSuffixTreeWrapper (single): {c_wrapper_phrase_count_single}")
-                print(f"    Inefficient Python Ref: {inefficient_ref_count}")
-                overall_fail_count += 1
+            if add_string is not None:
+                add_string(test_str)
             else:
-                overall_success_count += 1
-        else:
-            overall_fail_count += 1 # Count if any part of this iteration failed
-        
-        if (i + 1) % max(1, num_strings // 20) == 0 or (i+1) == num_strings: # Print progress ~20 times
-            print(f"  Single processing progress: {((i + 1) / num_strings) * 100:.1f}% ({i+1}/{num_strings}) S:{overall_success_count} F:{overall_fail_count}")
+                for char_s in test_str:
+                    add_character(char_s)
+            results[i] = lz_instance.compute_lz76_complexity()
+        except Exception as e_single:
+            print(f"  ERROR ({label}, str {i+1}): {e_single} for '{test_str[:30]}...'")
+            results[i] = error_code
+        if report is not None:
+            report(i + 1)
+    return time.perf_counter_ns() - start_ns
+
+# Single-mode implementations that worker processes can build by name, and the instance
+# each worker process keeps per implementation (reset before every string).
+_SINGLE_MODE_IMPLEMENTATIONS = {"python": PythonLZSuffixTree, "c": LZSuffixTreeWrapper}
+_worker_instances = {}
+
+def _process_chunk_char_by_char(impl_name: str, strings: list[str], error_code: int, label: str,
+                                use_add_string: bool = True) -> tuple[np.ndarray, int]:
+    """Worker for `process_char_by_char_parallel`: processes one chunk, returns (results, nanoseconds).
+
+    The first chunk a worker process sees for an implementation is preceded by an
+    unmeasured pass over up to `WARMUP_STRINGS` of its strings (JIT warmup).
+    """
+    lz_instance = _worker_instances.get(impl_name)
+    results = np.empty(len(strings), dtype=np.int32)
+    if lz_instance is None:
+        lz_instance = _worker_instances[impl_name] = _SINGLE_MODE_IMPLEMENTATIONS[impl_name]()
+        warmup = strings[:WARMUP_STRINGS]
+        process_char_by_char(lz_instance, warmup, results, error_code, label, report_progress=False,
+                             use_add_string=use_add_string)
+    elapsed = process_char_by_char(lz_instance, strings, results, error_code, label, report_progress=False,
+                                   use_add_string=use_add_string)
+    return results, elapsed
+
+def process_char_by_char_parallel(impl_name: str, strings: list[str], results: np.ndarray, error_code: int,
+                                  label: str, max_workers: int | None = None, use_add_string: bool = True) -> int:
+    """Runs `process_char_by_char` over chunks of `strings` in a `ProcessPoolExecutor`.
+
+    Strings are independent, so they are split into chunks (at least 64 strings each)
+    and every worker process processes its chunks with its own instance of the
+    implementation. Results are gathered into `results` on the main process.
+
+    Args:
+        impl_name (str): Key of `_SINGLE_MODE_IMPLEMENTATIONS` ("python" or "c").
+        strings (list[str]): The strings to process.
+        results (np.ndarray): Output int32 array; `results[i]` receives the phrase count of `strings[i]`.
+        error_code (int): Value stored in `results[i]` if processing `strings[i]` raises.
+        label (str): Name of the implementation for error and progress messages.
+        max_workers (int | None, optional): Number of worker processes. Defaults to `os.cpu_count()`.
+        use_add_string (bool, optional): Passed on to `process_char_by_char`. Defaults to True.
+
+    Returns:
+        int: Sum of the per-worker processing times in nanoseconds, i.e. the time a single
+               process would have spent (comparable to `process_char_by_char`).
+    """
+    num_strings = len(strings)
+    if num_strings == 0:
+        return 0
+    num_workers = max_workers or os.cpu_count() or 1
+    chunk_size = max(64, -(-num_strings // (num_workers * 4))) # ~4 chunks per worker
+    total_time_ns = 0
+    processed_count = 0
+    report = make_progress_printer(num_strings, f"  {label} progress")
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = {executor.submit(_process_chunk_char_by_char, impl_name, strings[start:start + chunk_size],
+                                   error_code, label, use_add_string): start
+                   for start in range(0, num_strings, chunk_size)}
+        for future in as_completed(futures):
+            start = futures[future]
+            chunk_results, chunk_time_ns = future.result()
+            results[start:start + len(chunk_results)] = chunk_results
+            total_time_ns += chunk_time_ns
+            processed_count += len(chunk_results)
+            report(processed_count)
+    return total_time_ns
+
+def verify_lz(batch_test_strings: list[str]) -> bool:
+    """Correctness gate: checks every implementation against the reference on `batch_test_strings`.
+
+    Runs the Python LZSuffixTree, the C-backed LZSuffixTreeWrapper (single mode, through
+    both `add_string` and `add_character`, and packed batch mode) and compares their phrase counts with the
+    reference (`reference_phrase_count`), which is itself sanity-checked against the
+    other counter (direct parsing or suffix array) on the first strings. The first
+    single-mode mismatch is shrunk to a minimal failing string with `shrink_counterexample`. No timings are reported (see `benchmark_lz`).
+
+    Args:
+        batch_test_strings (list[str]): The (non-empty) strings to check.
+
+    Returns:
+        bool: True if every implementation agrees with the reference on every string.
+    """
+    num_strings = len(batch_test_strings)
+    max_str_len = max(map(len, batch_test_strings), default=1)
+    print(f"\n=== Correctness: {num_strings:,} strings ===")
+    overall_success_count = 0
+    overall_fail_count = 0
+
+    # Reference phrase counts for all strings, computed once across worker processes.
+    print(f"Computing reference phrase counts ({REFERENCE_NAME} LZ76) in parallel...")
+    reference_phrase_counts = compute_reference_phrase_counts(batch_test_strings)
+
+    # Sanity check of the reference against the other counter (the direct parsing for the
+    # suffix-array reference, and vice versa), on a few of the strings.
+    other_name, other_counter = (("direct", direct_phrase_count) if divsufsort is not None
+                                 else ("suffix-array", sa_lz76_phrase_count))
+    num_sanity = min(num_strings, 100)
+    for i in range(num_sanity):
+        other_count = other_counter(batch_test_strings[i])
+        if other_count != reference_phrase_counts[i]:
+            print(f"  WARNING: reference mismatch for str {i+1} '{batch_test_strings[i][:70]}...': "
+                  f"{REFERENCE_NAME} {reference_phrase_counts[i]} vs {other_name} {other_count}")
+
+    # --- Test Single String Processing (online trees, one string at a time) ---
+    # Each implementation runs over the whole list back-to-back (one phase per implementation),
+    # then all results are compared against the reference at once.
+    # The C wrapper runs twice: through `add_string` (one C call per string) and through
+    # `add_character` (one ctypes call per character), so both C entry points are checked.
+    print("\n--- Stage 1: Single String Processing (Online Trees) --- ")
+    single_mode_results_python_st = np.empty(num_strings, dtype=np.int32)
+    single_mode_results_c_wrapper = np.empty(num_strings, dtype=np.int32)
+    single_mode_results_c_chars = np.empty(num_strings, dtype=np.int32)
+    process_char_by_char_parallel("python", batch_test_strings, single_mode_results_python_st, -1, "PythonLZSuffixTree")
+    process_char_by_char_parallel("c", batch_test_strings, single_mode_results_c_wrapper, -2, "LZSuffixTreeWrapper single")
+    process_char_by_char_parallel("c", batch_test_strings, single_mode_results_c_chars, -2,
+                                  "LZSuffixTreeWrapper char by char", use_add_string=False)
+
+    # Comparison (only for strings where all four counts are valid);
+    # the reference LZ76 results were precomputed above.
+    single_mode_results = (single_mode_results_python_st, single_mode_results_c_wrapper, single_mode_results_c_chars)
+    if (all(np.array_equal(results, reference_phrase_counts) for results in single_mode_results) and
+            reference_phrase_counts.min(initial=0) >= 0):
+        # Happy path: everything agrees, so no per-element masks need to be built.
+        single_failed_mask = single_mismatch_mask = np.zeros(num_strings, dtype=bool)
+    else:
+        single_failed_mask = reference_phrase_counts < 0
+        single_mismatch_mask = np.zeros(num_strings, dtype=bool)
+        for results in single_mode_results:
+            single_failed_mask |= results < 0
+            single_mismatch_mask |= results != reference_phrase_counts
+        single_mismatch_mask &= ~single_failed_mask
+    num_single_mismatches = int(np.count_nonzero(single_mismatch_mask))
+    if num_single_mismatches:
+        print(f"  {num_single_mismatches} single-mode mismatch(es); showing the first {min(num_single_mismatches, 20)}:")
+    for i in np.flatnonzero(single_mismatch_mask)[:20]:
+        print(f"  MISMATCH (Single, str {i+1}) for '{batch_test_strings[i][:70]}...':")
+        print(f"    PythonLZSuffixTree: {single_mode_results_python_st[i]}")
+        print(f"    LZSuffixTreeWrapper (single): {single_mode_results_c_wrapper[i]}")
+        print(f"    LZSuffixTreeWrapper (char by char): {single_mode_results_c_chars[i]}")
+        print(f"    Reference ({REFERENCE_NAME}): {reference_phrase_counts[i]}")
+    if num_single_mismatches:
+        # Shrink the first counterexample to a minimal string on which an implementation disagrees.
+        # Candidates go through `process_char_by_char`, the paths on which the mismatch was found.
+        shrink_python_tree, shrink_c_wrapper = PythonLZSuffixTree(), LZSuffixTreeWrapper()
+        shrink_paths = ((shrink_python_tree, True), (shrink_c_wrapper, True), (shrink_c_wrapper, False))
+        shrink_result = np.empty(1, dtype=np.int32)
+        def single_mode_disagrees(candidate: str) -> bool:
+            expected = reference_phrase_count(candidate)
+            for lz_instance, use_add_string in shrink_paths:
+                process_char_by_char(lz_instance, [candidate], shrink_result, -1, "shrink",
+                                     report_progress=False, use_add_string=use_add_string)
+                if shrink_result[0] != expected:
+                    return True
+            return False
+        first_mismatch = batch_test_strings[int(np.flatnonzero(single_mismatch_mask)[0])]
+        minimal_string = shrink_counterexample(first_mismatch, single_mode_disagrees)
+        print(f"  Shrunk first mismatch to '{minimal_string}' (length {len(minimal_string)}, from {len(first_mismatch)}).")
+    # Count if any part of a string's processing failed
+    overall_fail_count += int(np.count_nonzero(single_failed_mask)) + num_single_mismatches
+    overall_success_count += num_strings - int(np.count_nonzero(single_failed_mask)) - num_single_mismatches
+    print(f"  Single processing: S:{overall_success_count} F:{overall_fail_count}")
 
     print("--- Stage 1 Finished ---")
 
     # --- Test Batch Processing (LZSuffixTreeWrapper only) ---
     print("\n--- Stage 2: Batch String Processing (LZSuffixTreeWrapper) --- ")
-    c_lz_wrapper_batch_instance = LZSuffixTreeWrapper() # One instance for all batch strings
-    start_t_batch = time.perf_counter()
-    batch_results_c_wrapper: list[int] = []
-    try:
-        batch_results_c_wrapper = c_lz_wrapper_batch_instance.compute_lz76_complexity_batch(batch_test_strings)
-    except Exception as e_batch:
-        print(f"  ERROR during LZSuffixTreeWrapper batch processing: {e_batch}")
-        # Mark all batch results as failed if the batch call itself fails
-        batch_results_c_wrapper = [-4] * num_strings 
-    total_c_st_wrapper_time_batch = time.perf_counter() - start_t_batch
+    # All strings in one contiguous (num_strings, max_str_len) byte matrix plus a lengths array.
+    batch_chars, batch_lengths = pack_strings(batch_test_strings, width=max(max_str_len, 1))
+    batch_results_c_wrapper = np.empty(0, dtype=np.int32)
+    # One instance for all batch strings; its C state is freed as soon as the batch is done.
+    with LZSuffixTreeWrapper() as c_lz_wrapper_batch_instance:
+        try:
+            batch_results_c_wrapper = c_lz_wrapper_batch_instance.compute_lz76_complexity_batch_packed(batch_chars, batch_lengths)
+        except Exception as e_batch:
+            print(f"  ERROR during LZSuffixTreeWrapper batch processing: {e_batch}")
+            # Mark all batch results as failed if the batch call itself fails
+            batch_results_c_wrapper = np.full(num_strings, -4, dtype=np.int32)
+    del batch_chars, batch_lengths
     
-    # Compare batch results with the reference (inefficient Python results from single mode)
+    # Compare batch results with the precomputed reference (`reference_phrase_count`)
     batch_mode_success_count = 0
     batch_mode_fail_count = 0
     if len(batch_results_c_wrapper) == num_strings:
-        for i in range(num_strings):
-            if single_mode_results_inefficient[i] >= 0: # Only compare if reference was good
-                if batch_results_c_wrapper[i] == single_mode_results_inefficient[i]:
-                    batch_mode_success_count += 1
-                else:
-                    print(f"  MISMATCH (Batch C vs. InefficientPy, str {i+1}) for '{batch_test_strings[i][:50]}...':")
-                    print(f"    Batch C Wrapper: {batch_results_c_wrapper[i]}, Inefficient Ref: {single_mode_results_inefficient[i]}")
-                    batch_mode_fail_count += 1
-            elif batch_results_c_wrapper[i] < 0: # Both reference and batch item show error
-                batch_mode_fail_count +=1 # Count as failure for batch consistency check
+        batch_results_np = np.asarray(batch_results_c_wrapper, dtype=np.int32)
+        if np.array_equal(batch_results_np, reference_phrase_counts) and reference_phrase_counts.min(initial=0) >= 0:
+            # Happy path: one equality scan over the vectors, no per-element masks or index lists.
+            reference_ok = np.ones(num_strings, dtype=bool)
+            mismatch_mask = np.zeros(num_strings, dtype=bool)
+        else:
+            reference_ok = reference_phrase_counts >= 0 # Only compare if reference was good
+            mismatch_mask = reference_ok & (batch_results_np != reference_phrase_counts)
+        num_batch_mismatches = int(np.count_nonzero(mismatch_mask))
+        batch_mode_success_count = int(np.count_nonzero(reference_ok)) - num_batch_mismatches
+        # Both reference and batch item show error: count as failure for batch consistency check
+        batch_mode_fail_count = num_batch_mismatches + int(np.count_nonzero(~reference_ok & (batch_results_np < 0)))
+        if num_batch_mismatches:
+            print(f"  {num_batch_mismatches} batch mismatch(es); showing the first {min(num_batch_mismatches, 20)}:")
+        for i in np.flatnonzero(mismatch_mask)[:20]:
+            print(f"  MISMATCH (Batch C vs. Reference, str {i+1}) for '{batch_test_strings[i][:50]}...':")
+            print(f"    Batch C Wrapper: {batch_results_np[i]}, Reference: {reference_phrase_counts[i]}")
     else:
         print(f"  ERROR: Batch result length mismatch. Expected {num_strings}, got {len(batch_results_c_wrapper)}.")
         batch_mode_fail_count = num_strings # All fail if lengths differ
@@ -255,46 +666,120 @@ def run_lz_tests(num_strings: int = 10000, min_str_len: int = 30, max_str_len: i
     overall_fail_count += batch_mode_fail_count
     print("--- Stage 2 Finished ---")
 
-    # --- Summary --- 
-    print(f"\n--- Test Summary for LZ76 Suffix Tree Implementations ({num_strings} strings) ---")
+    print(f"\n--- Correctness Summary for LZ76 Suffix Tree Implementations ({num_strings} strings) ---")
     print(f"Overall Successes: {overall_success_count}")
     print(f"Overall Failures: {overall_fail_count}")
-    print("\nAverage Times Per String (Single Processing Mode):")
-    if num_strings > 0:
-        print(f"  PythonLZSuffixTree (char-by-char):   {total_py_st_time_single/num_strings:.8e}s")
-        print(f"  LZSuffixTreeWrapper (char-by-char): {total_c_st_wrapper_time_single/num_strings:.8e}s")
-        print(f"  Inefficient Python LZ76 (ref):     {total_inefficient_py_time_single/num_strings:.8e}s")
+    return overall_fail_count == 0
+
+def benchmark_lz(batch_test_strings: list[str]) -> None:
+    """Performance pass: times the Python tree, the C wrapper and the packed C batch path.
+
+    No reference counts are computed and nothing is compared (see `verify_lz`), so
+    the run time is dominated by the implementations being measured.
+
+    Args:
+        batch_test_strings (list[str]): The (non-empty) strings to process.
+    """
+    num_strings = len(batch_test_strings)
+    max_str_len = max(map(len, batch_test_strings), default=1)
+    print(f"\n=== Performance: {num_strings:,} strings ===")
+    report_interpreter()
+    if num_strings == 0:
+        print("No strings to benchmark.")
+        return
+    results = np.empty(num_strings, dtype=np.int32) # Phrase counts are discarded
+
+    # Phase A: Pure Python LZSuffixTree. Phase B: C-backed LZSuffixTreeWrapper (single mode, one `add_string` call per string).
+    # Each phase fans the strings out over worker processes; every worker keeps one instance
+    # of the implementation and resets it before every string instead of re-creating it.
+    # Times are kept in integer nanoseconds (`perf_counter_ns`) and converted only for printing.
+    start_ns = time.perf_counter_ns()
+    total_py_st_time_single_ns = process_char_by_char_parallel("python", batch_test_strings, results, -1, "PythonLZSuffixTree")
+    print(f"  PythonLZSuffixTree phase wall time: {(time.perf_counter_ns() - start_ns) / 1e9:.4f}s")
+    start_ns = time.perf_counter_ns()
+    total_c_st_wrapper_time_single_ns = process_char_by_char_parallel("c", batch_test_strings, results, -2, "LZSuffixTreeWrapper single")
+    print(f"  LZSuffixTreeWrapper single phase wall time: {(time.perf_counter_ns() - start_ns) / 1e9:.4f}s")
+
+    # Phase C: packed batch mode, one C call for all strings.
+    batch_chars, batch_lengths = pack_strings(batch_test_strings, width=max(max_str_len, 1))
+    with LZSuffixTreeWrapper() as c_lz_wrapper_batch_instance:
+        start_ns_batch = time.perf_counter_ns()
+        try:
+            c_lz_wrapper_batch_instance.compute_lz76_complexity_batch_packed(batch_chars, batch_lengths)
+        except Exception as e_batch:
+            print(f"  ERROR during LZSuffixTreeWrapper batch processing: {e_batch}")
+        total_c_st_wrapper_time_batch = (time.perf_counter_ns() - start_ns_batch) / 1e9
+    del batch_chars, batch_lengths
+
+    print(f"\n--- Timing Summary for LZ76 Suffix Tree Implementations ({num_strings} strings) ---")
+    print("Average Times Per String (Single Processing Mode, summed over worker processes):")
+    print(f"  PythonLZSuffixTree (add_string):    {total_py_st_time_single_ns/num_strings/1e9:.8e}s")
+    print(f"  LZSuffixTreeWrapper (add_string):   {total_c_st_wrapper_time_single_ns/num_strings/1e9:.8e}s")
     print("\nTotal Time for Batch Processing (LZSuffixTreeWrapper):")
     print(f"  Total for {num_strings:,} strings: {total_c_st_wrapper_time_batch:.4f}s")
-    if num_strings > 0 and total_c_st_wrapper_time_batch > 0:
+    if total_c_st_wrapper_time_batch > 0:
         print(f"  Avg per string (batch mode): {total_c_st_wrapper_time_batch/num_strings:.8e}s")
 
-    if overall_fail_count == 0 and num_strings > 0:
+def run_lz_tests(num_strings: int = 10000, min_str_len: int = 30, max_str_len: int = 100,
+                 random_strings: bool | None = None) -> bool:
+    """Runs the correctness gate (`verify_lz`) and then the performance pass (`benchmark_lz`).
+
+    The reference counters are first checked against hand-verified cases. The
+    correctness corpus is the deterministic one of `generate_structured_test_strings`
+    (all binary strings up to length 12 plus structured patterns); with `random_strings`
+    (or `LZ_RANDOM=1` in the environment) the `num_strings` random strings are verified
+    instead, for stress testing. The performance pass always uses `num_strings` random
+    strings with lengths in [min_str_len, max_str_len].
+
+    Args:
+        num_strings (int, optional): Number of random strings. Defaults to 10,000.
+        min_str_len (int, optional): Minimum length of generated strings. Defaults to 30.
+        max_str_len (int, optional): Maximum length of generated strings. Defaults to 100.
+        random_strings (bool | None, optional): Verify the random strings instead of the structured
+            corpus. Defaults to None, which reads the `LZ_RANDOM` environment variable.
+
+    Returns:
+        bool: True if the reference checks and the correctness gate passed.
+    """
+    if random_strings is None:
+        random_strings = os.environ.get('LZ_RANDOM') == '1'
+    print(f"--- Starting LZ76 Suffix Tree Implementation Tests ---")
+
+    # The reference counters must agree with the hand-checked cases before they are trusted.
+    reference_failures = check_reference_implementations()
+    if reference_failures:
+        print(f"  {reference_failures} reference counter check(s) failed; results below are unreliable.")
+
+    # Generate all random test strings upfront; they are shared by both passes in random mode.
+    print(f"\nGenerating {num_strings:,} random test strings (length {min_str_len} - {max_str_len})...")
+    random_test_strings = generate_random_binary_strings(num_strings, min_len=min_str_len, max_len=max_str_len)
+    if max_str_len > 0:
+        # Ensure non-empty for consistent testing, though LZ76 can handle empty.
+        # Default to "0" if generation yields an empty string for a non-zero length request.
+        random_test_strings = [s if s else "0" for s in random_test_strings]
+    if random_strings:
+        verification_strings = random_test_strings
+    else:
+        print(f"Using the structured test corpus for correctness (set LZ_RANDOM=1 for random strings).")
+        verification_strings = generate_structured_test_strings()
+
+    passed = verify_lz(verification_strings) and reference_failures == 0
+    benchmark_lz(random_test_strings)
+
+    if passed:
         print("\nAll tests passed successfully!")
-    elif num_strings == 0:
-        print("\nNo tests run (num_strings was 0).")
     else:
-        print(f"\n{overall_fail_count} test(s) failed. Please review mismatches above.")
+        print(f"\nCorrectness checks failed. Please review mismatches above.")
         # sys.exit(1) # Exit with error code if any test fails
+    return passed
 
 if __name__ == "__main__":
-    num_test_strings_arg = 1000  # Default to smaller number for quick __main__ test
-    min_len_arg = 20
-    max_len_arg = 50
-    
-    if len(sys.argv) > 1:
-        try:
-            num_test_strings_arg = int(sys.argv[1])
-            if num_test_strings_arg <=0: raise ValueError("Number of strings must be positive.")
-            if len(sys.argv) > 2: 
-                min_len_arg = int(sys.argv[2])
-                if min_len_arg <=0: raise ValueError("Min length must be positive.")
-            if len(sys.argv) > 3: 
-                max_len_arg = int(sys.argv[3])
-                if max_len_arg < min_len_arg: raise ValueError("Max length must be >= min length.")
-        except ValueError as e:
-            print(f"Invalid argument: {e}")
-            print("Usage: python test_lz_suffix.py [num_strings (int>0)] [min_len (int>0)] [max_len (int>=min_len)]")
-            sys.exit(1)
-
-    run_lz_tests(num_strings=num_test_strings_arg, min_str_len=min_len_arg, max_str_len=max_len_arg) 
\ No newline at end of file
+    # Defaults to a smaller number of strings than run_lz_tests for a quick __main__ test.
+    args = parse_string_test_args(description="LZ76 suffix tree correctness and performance tests.",
+                                  num_strings_default=1000, min_len_default=20, max_len_default=50,
+                                  run_options=False)
+
+    # Explicit arguments select the random workload; otherwise LZ_RANDOM decides.
+    if not run_lz_tests(num_strings=args.num_strings, min_str_len=args.min_len, max_str_len=args.max_len,
+                        random_strings=True if len(sys.argv) > 1 else None):
+        sys.exit(1)
@@ -7,27 +7,40 @@ This script tests and compares two implementations of an online suffix tree:
 
 The primary test (`run_tests`) performs the following for a number of randomly
 generated binary strings:
-    - Builds a suffix tree using both the Python and C-wrapper implementations by
-      adding characters one by one.
-    - Generates all substrings of the test string and a set of likely non-substrings.
+    - Builds a suffix tree using both the Python and C-wrapper implementations with
+      one `add_string` call per string; each implementation is timed in its own pass
+      over a chunk of strings.
+    - Takes every binary pattern up to length 7 (`SHORT_BINARY_PATTERNS`, built once),
+      the longer prefixes and suffixes of the test string plus a few random substrings
+      (`prefix_suffix_patterns`, O(n) patterns instead of all O(n^2) substrings), and takes
+      the likely non-substrings from a fixed bank (`NON_SUBSTRING_BANK`).
     - For each of these patterns, it calls the `find()` method on both trees and
       verifies that their results (found or not found) are identical.
-    - Measures and reports the average time taken for character addition by each
-      implementation.
+    - Measures and reports the average and p50/p95/p99/max build time per string of
+      each implementation, plus the CPU time and peak RSS of the run; `--csv PATH`
+      writes the per-string times to a CSV file.
+The diagnostics of failing strings are written to stderr in one block after the run;
+`--fail-fast` stops at the first failing string and exits with status 1.
+The strings are split into chunks that are checked in parallel worker processes.
 
-Command-line arguments can be used to specify the number of test strings and their
-minimum/maximum lengths.
+Command-line arguments can be used to specify the number of test strings, their
+minimum/maximum lengths and the random seed (printed at the start of every run, so
+a failing run can be repeated exactly).
 
 Usage:
-    python test_online_suffix.py [num_strings] [min_len] [max_len]
+    python test_online_suffix.py [num_strings] [min_len] [max_len] [seed] [--csv PATH] [--fail-fast]
 
 Example:
     python test_online_suffix.py 1000 50 150
+    python test_online_suffix.py 1000 50 150 7 --csv build_times.csv
 '''
 import random
 import sys
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain
+import numpy as np
 
 # Determine the project root directory (parent of 'tests' and 'hadi_LZ_package' package dir)
 # __file__ is expected to be /path/to/project_root/tests/test_online_suffix.py
@@ -53,186 +66,402 @@ except ImportError as e:
     print("    └── test_online_suffix.py (this file)")
     sys.exit(1)
 
-def generate_random_binary_string(min_len: int = 30, max_len: int = 100) -> str:
-    """Generates a random binary string of a specified length range.
+from _bench import (make_progress_printer, report_interpreter, WARMUP_STRINGS, print_latency_percentiles,
+                    print_resource_usage)
+from _cli import parse_string_test_args
+
+def generate_random_binary_strings(num_strings: int, min_len: int = 30, max_len: int = 100,
+                                   rng: np.random.Generator | None = None) -> list[str]:
+    """Generates a batch of random binary strings with lengths in [min_len, max_len].
+
+    All lengths and all bits are drawn in two vectorized calls: the bits form one
+    contiguous ASCII '0'/'1' buffer of `sum(lengths)` characters, which is decoded
+    once and sliced at the cumulative-length offsets.
 
     Args:
-        min_len (int, optional): Minimum length of the string. Defaults to 30.
-        max_len (int, optional): Maximum length of the string. Defaults to 100.
+        num_strings (int): Number of strings to generate.
+        min_len (int, optional): Minimum length of each string. Defaults to 30.
+        max_len (int, optional): Maximum length of each string. Defaults to 100.
+        rng (np.random.Generator | None, optional): Random generator to use.
+                                                    Defaults to `np.random.default_rng()`.
 
     Returns:
-        str: A randomly generated binary string.
-             Returns an empty string if max_len < min_len or if max_len is < 0.
+        list[str]: The generated strings. Returns an empty list if num_strings <= 0,
+                   max_len < min_len or max_len < 0.
     """
-    if max_len < min_len or max_len < 0:
-        return ""
-    length = random.randint(min_len, max_len)
-    if length == 0:
-        return ""
-    return "".join(random.choices(['0', '1'], k=length))
+    if num_strings <= 0 or max_len < min_len or max_len < 0:
+        return []
+    if rng is None:
+        rng = np.random.default_rng()
+    lengths = rng.integers(max(min_len, 0), max_len + 1, size=num_strings)
+    ends = np.cumsum(lengths).tolist()
+    bits = rng.integers(0, 2, size=ends[-1], dtype=np.uint8) + np.uint8(ord('0'))
+    text = bits.tobytes().decode('ascii')
+    starts = [0] + ends[:-1]
+    return [text[start:end] for start, end in zip(starts, ends)]
+
+def prefix_suffix_patterns(s: str, num_random: int = 20, min_len: int = -1,
+                           rng: random.Random | None = None) -> list[str]:
+    """Returns every prefix and suffix of `s` plus a few random internal substrings, deduplicated.
+
+    This is an O(n) pattern suite (about 2n + `num_random` patterns) used instead of
+    enumerating all O(n^2) substrings: prefixes and suffixes exercise every path from
+    the root and every leaf, and the random `s[i:j]` cover internal nodes. The empty
+    string and `s` itself are included when `min_len` allows it.
 
-def get_all_substrings(s: str) -> list[str]:
-    """Generates a list of all unique substrings of a given string, including empty string.
+    Patterns are chosen as `(start, end)` ranges first: ranges shorter than or equal
+    to `min_len` are dropped and repeated random ranges are merged before any slice
+    is made, so only the patterns actually returned are materialized.
 
     Args:
         s: The input string.
+        num_random (int, optional): Number of random (i, j) pairs to draw. Defaults to 20.
+        min_len (int, optional): Only patterns longer than `min_len` are returned.
+            Defaults to -1 (every pattern, including the empty string).
+        rng (random.Random | None, optional): Generator for the random pairs. Defaults to
+            the global `random` module.
 
     Returns:
-        A list of all unique substrings of `s`.
+        list[str]: The distinct patterns, all of which are substrings of `s`.
     """
+    rng = rng or random
     n = len(s)
-    substrings = set() # Use a set to store unique substrings
-    # Add empty string as per original logic, it's a valid pattern for find()
-    substrings.add("") 
+    # Prefixes s[:k] and suffixes s[k:] longer than min_len; the full string is only in the prefixes.
+    ranges = [(0, k) for k in range(max(min_len + 1, 0), n + 1)]
+    ranges += [(k, n) for k in range(1, n - min_len)]
+    random_ranges = set()
+    for _ in range(num_random):
+        i, j = rng.randint(0, n), rng.randint(0, n)
+        if abs(j - i) > min_len:
+            random_ranges.add((min(i, j), max(i, j)))
+    ranges.extend(sorted(random_ranges))
+    # Different ranges can still spell the same pattern (e.g. a prefix equal to a suffix).
+    return list(dict.fromkeys(s[a:b] for a, b in ranges)) # Drop duplicates, keep order
+
+def build_python_trees(first_index: int, strings: list[str]) -> tuple[list[PythonOnlineSuffixTree | None], np.ndarray]:
+    """Builds one `PythonOnlineSuffixTree` per string with `add_string` (one Ukkonen phase per character).
+
+    Args:
+        first_index (int): Index of `strings[0]` in the full test set, for messages.
+        strings (list[str]): The strings to build trees for.
+
+    Returns:
+        tuple[list[PythonOnlineSuffixTree | None], np.ndarray]: The trees (None where the build
+            raised) and the int64 build time of every string in nanoseconds.
+    """
+    py_trees = []
+    times_ns = np.empty(len(strings), dtype=np.int64)
+    # One timer call per string: each string's time runs from the previous timestamp.
+    previous_ns = time.perf_counter_ns()
+    for offset, test_string in enumerate(strings):
+        py_tree = PythonOnlineSuffixTree()
+        try:
+            py_tree.add_string(test_string) # Text appended once, then one Ukkonen phase per char
+        except Exception as e_py_build:
+            print(f"  ERROR (PythonOnlineSuffixTree build, str {first_index+offset+1}): {e_py_build} for '{test_string[:50]}...'")
+            py_tree = None # We can't compare if the build fails
+        py_trees.append(py_tree)
+        now_ns = time.perf_counter_ns()
+        times_ns[offset] = now_ns - previous_ns
+        previous_ns = now_ns
+    return py_trees, times_ns
+
+def time_c_builds(strings: list[str], c_tree_wrapper: OnlineSuffixTreeWrapper) -> np.ndarray:
+    """Times building the C-backed tree for every string (reset + one `add_string` call each).
+
+    Build errors are not reported here; `check_one_string` rebuilds each tree and reports them.
+
+    Args:
+        strings (list[str]): The strings to build trees for.
+        c_tree_wrapper (OnlineSuffixTreeWrapper): C-backed tree to reuse (reset before every string).
+
+    Returns:
+        np.ndarray: The int64 build time of every string in nanoseconds.
+    """
+    reset = c_tree_wrapper.reset
+    add_string = c_tree_wrapper.add_string
+    times_ns = np.empty(len(strings), dtype=np.int64)
+    previous_ns = time.perf_counter_ns() # One timer call per string, as in `build_python_trees`
+    for offset, test_string in enumerate(strings):
+        try:
+            reset()
+            add_string(test_string) # One C call for the whole string
+        except Exception:
+            pass
+        now_ns = time.perf_counter_ns()
+        times_ns[offset] = now_ns - previous_ns
+        previous_ns = now_ns
+    return times_ns
+
+def build_non_substring_bank(max_len: int = 10, per_len: int = 10, seed: int = 0) -> list[str]:
+    """Builds a fixed list of candidate non-substring patterns for the `find()` comparison.
+
+    The bank contains a few hand-picked non-binary words plus, for every length
+    1..`max_len`, `per_len` random strings over '0', '1' and 'x' (drawn with a seeded
+    generator, so the bank is the same in every process and run). Candidates that
+    do occur in a given test string are filtered out per string.
+
+    Args:
+        max_len (int, optional): Longest random candidate. Defaults to 10.
+        per_len (int, optional): Random candidates per length. Defaults to 10.
+        seed (int, optional): Seed of the generator. Defaults to 0.
+
+    Returns:
+        list[str]: The distinct candidates, in a fixed order.
+    """
+    rng = random.Random(seed)
+    bank = ["alpha", "beta01", "x", "x0", "1x", "$01", "0$", "a", "01a10"]
+    for k in range(1, max_len + 1):
+        bank.extend("".join(rng.choices("01x", k=k)) for _ in range(per_len))
+    return list(dict.fromkeys(bank)) # Drop duplicates, keep order
+
+# Candidate non-substrings shared by all test strings (built once per process). Candidates with a
+# character other than '0'/'1' can never occur in a binary test string, so only the purely binary
+# ones (not already among the short patterns below) need a per-string check.
+NON_SUBSTRING_BANK = build_non_substring_bank()
+NON_BINARY_BANK = [p for p in NON_SUBSTRING_BANK if p.strip("01")]
+
+# Every binary pattern of length 0..SHORT_PATTERN_MAX_LEN, built once and tested against
+# every tree: short patterns are where random strings overlap most, so they are covered
+# exhaustively (found and not found) instead of being re-drawn per string.
+SHORT_PATTERN_MAX_LEN = 7
+SHORT_BINARY_PATTERNS = [""] + [format(value, f'0{length}b') for length in range(1, SHORT_PATTERN_MAX_LEN + 1)
+                                for value in range(1 << length)]
+BINARY_BANK = [p for p in NON_SUBSTRING_BANK if not p.strip("01") and len(p) > SHORT_PATTERN_MAX_LEN]
+
+def check_one_string(i: int, test_string: str, py_tree: PythonOnlineSuffixTree,
+                     c_tree_wrapper: OnlineSuffixTreeWrapper, rng: random.Random | None = None) -> str | None:
+    """Compares the `find()` results of the Python tree and the C-backed tree for one string.
+
+    1. Rebuilds `c_tree_wrapper` for `test_string` (reset first, untimed).
+    2. Generates a set of test patterns (short binary patterns, prefixes, suffixes, random
+       substrings and some non-substrings).
+    3. Compares the `find()` results for all patterns between the two trees and stops at
+       the first mismatch.
+
+    Nothing is printed here: the diagnostic of a failing string is returned, and the
+    caller writes all of them at once.
+
+    Args:
+        i (int): Index of the string, for messages.
+        test_string (str): The string to test.
+        py_tree (PythonOnlineSuffixTree): Python tree already built for `test_string`.
+        c_tree_wrapper (OnlineSuffixTreeWrapper): C-backed tree to reuse (reset before building).
+        rng (random.Random | None, optional): Generator for the random substrings. Defaults to
+            the global `random` module.
+
+    Returns:
+        str | None: None if every pattern matched, otherwise the (multi-line) diagnostic of
+            the build error, find error or first mismatch.
+    """
+    # --- Build the C-Wrapped Suffix Tree (timed separately by `time_c_builds`) --- 
+    try:
+        c_tree_wrapper.reset()
+        c_tree_wrapper.add_string(test_string)
+    except Exception as e_c_build:
+        return f"  ERROR (OnlineSuffixTreeWrapper build, str {i+1}): {e_c_build} for '{test_string[:50]}...'"
+
+    # --- Test 1: Accumulated text (Optional, as primary test is `find`) ---
+    # Note: `get_internal_text()` can be slow if called many times.
+    # py_text_content = py_tree.text
+    # c_text_content_wrapper = c_tree_wrapper.get_internal_text()
+    # if py_text_content != c_text_content_wrapper:
+    #     print(f"  MISMATCH (Text, str {i+1}) for '{test_string[:50]}...'")
+    #     return True
+
+    # --- Test 2: `find` method for short patterns, prefixes, suffixes, random substrings and non-substrings ---
+    # An O(n) structured suite instead of all O(n^2) substrings. All short binary patterns come
+    # from the shared SHORT_BINARY_PATTERNS, so only the longer substrings are taken per string.
+    substring_patterns = prefix_suffix_patterns(test_string, min_len=SHORT_PATTERN_MAX_LEN, rng=rng)
     
-    if not s: # If input string is empty, only empty string is a substring.
-        return list(substrings)
+    # Likely non-substrings come from the fixed bank, minus any that occur in the test string
+    # (`in` on a str is a fast substring search); the padded copies of the string never occur in it.
+    # For a binary string (`strip` leaves nothing) only the binary candidates need checking.
+    if test_string.strip("01"):
+        non_substrings_generated = [p for p in NON_SUBSTRING_BANK if p not in test_string]
+    else:
+        non_substrings_generated = NON_BINARY_BANK + [p for p in BINARY_BANK if p not in test_string]
+    non_substrings_generated.extend([test_string + '$', '$' + test_string])
+    
+    # Each distinct pattern is tested once per string, shortest first: successive `find()` calls
+    # then walk to similar depths of the trees, and the first mismatch reported is a shortest one.
+    # The sources are streamed into the dict (first occurrence kept) without a concatenated copy.
+    patterns_for_find_test = list(dict.fromkeys(chain(SHORT_BINARY_PATTERNS, substring_patterns, non_substrings_generated)))
+    patterns_for_find_test.sort(key=len) # Stable: equal-length patterns keep their order
+
+    for pattern_to_test in patterns_for_find_test:
+        try:
+            py_found_result = py_tree.find(pattern_to_test)
+        except Exception as e_py_find:
+            return f"  ERROR (Python find, str {i+1}, pattern '{pattern_to_test}'): {e_py_find}"
         
-    for i in range(n):
-        for j in range(i, n):
-            substrings.add(s[i:j+1])
-    return list(substrings)
+        try:
+            c_found_result = c_tree_wrapper.find(pattern_to_test)
+        except Exception as e_c_find:
+            return f"  ERROR (C wrapper find, str {i+1}, pattern '{pattern_to_test}'): {e_c_find}"
+
+        if py_found_result != c_found_result:
+            return (f"  MISMATCH (find(), str {i+1}) for pattern '{pattern_to_test}' on string '{test_string[:70]}...'\n"
+                    f"    PythonOnlineSuffixTree found: {py_found_result}\n"
+                    f"    OnlineSuffixTreeWrapper found: {c_found_result}")
+    return None
+
+_worker_warmed_up = False # Set by the first `_check_chunk` call in each worker process
+
+def _check_chunk(first_index: int, strings: list[str], seed: int,
+                 fail_fast: bool = False) -> tuple[int, list[str], np.ndarray, np.ndarray]:
+    """Worker for `run_tests`: checks one chunk of strings.
 
-def run_tests(num_strings: int = 10000, min_str_len: int = 30, max_str_len: int = 100):
+    Returns (number of strings checked, diagnostics, py ns, C ns per string). One
+    diagnostic is returned per failing string; with `fail_fast` the checks stop at the
+    first failing string of the chunk, so fewer strings may be checked than built (the
+    timings still cover the whole chunk).
+
+    The random substrings of string `k` (index in the full test set) are drawn from
+    `random.Random(seed + k)`, so the patterns tested for a string depend neither on the
+    chunk boundaries (which follow the number of CPUs) nor on the worker that runs it.
+
+    Each implementation is timed per string in its own pass over the chunk (one
+    `perf_counter_ns()` call per string), and the `find()` comparison runs afterwards
+    in an untimed pass. One C-backed tree is reset and reused for the whole chunk; the
+    `with` block frees its C state even if a check raises, and the chunk's Python trees
+    are dropped before returning.
+    The first chunk of every worker process is preceded by unmeasured builds of up to
+    `WARMUP_STRINGS` of its strings (JIT warmup).
+    """
+    global _worker_warmed_up
+    if not _worker_warmed_up:
+        with OnlineSuffixTreeWrapper() as warmup_tree:
+            build_python_trees(first_index, strings[:WARMUP_STRINGS])
+            time_c_builds(strings[:WARMUP_STRINGS], warmup_tree)
+        _worker_warmed_up = True
+    py_trees, py_times_ns = build_python_trees(first_index, strings)
+    failures = []
+    checked_count = 0
+    with OnlineSuffixTreeWrapper() as c_tree_wrapper:
+        c_times_ns = time_c_builds(strings, c_tree_wrapper)
+        for offset, (test_string, py_tree) in enumerate(zip(strings, py_trees)):
+            if py_tree is None: # The build error was printed by `build_python_trees`
+                failure = f"  ERROR (PythonOnlineSuffixTree build, str {first_index+offset+1}): no tree to compare"
+            else:
+                failure = check_one_string(first_index + offset, test_string, py_tree, c_tree_wrapper,
+                                           rng=random.Random(seed + first_index + offset))
+            checked_count += 1
+            if failure is not None:
+                failures.append(failure)
+                if fail_fast:
+                    break
+    del py_trees
+    return checked_count, failures, py_times_ns, c_times_ns
+
+def run_tests(num_strings: int = 10000, min_str_len: int = 30, max_str_len: int = 100, max_workers: int | None = None,
+              seed: int | None = None, csv_path: str | None = None, fail_fast: bool = False) -> bool:
     """Runs correctness and timing tests for Python vs C-wrapped suffix tree.
 
-    For each generated random string, it:
-    1. Builds the suffix tree using `PythonOnlineSuffixTree`.
-    2. Builds the suffix tree using `OnlineSuffixTreeWrapper` (C backend).
-    3. Generates a set of test patterns (all substrings and some non-substrings).
-    4. Compares the `find()` results for all patterns between the two trees.
-    5. Accumulates timing data for `add_char` operations.
+    Each generated random string is checked with `check_one_string`. Strings are
+    independent, so they are split into chunks (at least 64 strings each) that are
+    processed by a `ProcessPoolExecutor`; each chunk reuses one C-backed tree.
+    Within a chunk, the Python and C builds are timed in separate passes (see
+    `_check_chunk`). Counts and per-string build times (in ns) are gathered on the main
+    process, which reports the mean and p50/p95/p99/max build times of both implementations
+    and the CPU time and peak RSS of the run. The diagnostics of the failing strings are
+    collected from the workers and written to stderr in one block, in string order.
 
     Args:
         num_strings (int, optional): Number of random strings for testing. Defaults to 10,000.
         min_str_len (int, optional): Minimum length of generated strings. Defaults to 30.
         max_str_len (int, optional): Maximum length of generated strings. Defaults to 100.
+        max_workers (int | None, optional): Number of worker processes. Defaults to `os.cpu_count()`.
+        seed (int | None, optional): Seed for the test strings and the per-string pattern draws, so
+            a run (and any failure) can be reproduced. Defaults to a random seed, which is printed.
+        csv_path (str | None, optional): If given, one `index,length,py_ns,c_ns` row per string
+            is written to this CSV file. Defaults to None.
+        fail_fast (bool, optional): Stop at the first failing string: the remaining chunks are
+            cancelled and only the first diagnostic is reported. Defaults to False.
+
+    Returns:
+        bool: True if every tested string passed.
     """
+    if seed is None:
+        seed = random.randrange(2**32)
     print(f"--- Starting Online Suffix Tree Correctness & Performance Tests ---")
+    print(f"Seed: {seed}")
+    report_interpreter()
     print(f"Number of test strings: {num_strings:,}")
     print(f"String length range: {min_str_len}-{max_str_len}")
     
     success_count = 0
     fail_count = 0
-    total_py_add_char_time = 0
-    total_c_wrapper_add_char_time = 0
+    py_times_ns = np.zeros(num_strings, dtype=np.int64)
+    c_times_ns = np.zeros(num_strings, dtype=np.int64)
+    processed = np.zeros(num_strings, dtype=bool) # Strings of the chunks that completed
+    failure_messages = {} # Chunk start index -> diagnostics of that chunk
+    processed_count = 0
+    report = make_progress_printer(num_strings, "  Progress") # At most one line every 0.5s
 
-    for i in range(num_strings):
-        test_string = generate_random_binary_string(min_len=min_str_len, max_len=max_str_len)
-        current_test_iteration_failed = False # Tracks if any part of *this* string's test fails
+    # All test strings are generated up front in one vectorized batch.
+    test_strings = generate_random_binary_strings(num_strings, min_len=min_str_len, max_len=max_str_len,
+                                                  rng=np.random.default_rng(seed))
 
-        # --- Test Python Suffix Tree --- 
-        py_tree = PythonOnlineSuffixTree()
-        start_py_build_time = time.perf_counter()
-        try:
-            for char_val in test_string:
-                py_tree.add_char(char_val)
-        except Exception as e_py_build:
-            print(f"  ERROR (PythonOnlineSuffixTree build, str {i+1}): {e_py_build} for '{test_string[:50]}...'")
-            fail_count += 1
-            current_test_iteration_failed = True # Mark this iteration failed
-            # Continue to next string as we can't compare if build fails.
-            # Ensure time isn't added if it failed mid-way if that makes sense for avg.
-            # Here, we add time up to failure point for build, find won't run.
-            total_py_add_char_time += (time.perf_counter() - start_py_build_time)
-            continue 
-        total_py_add_char_time += (time.perf_counter() - start_py_build_time)
-
-        # --- Test C-Wrapped Suffix Tree --- 
-        c_tree_wrapper = None # Ensure it's defined for finally block
-        start_c_build_time = time.perf_counter()
-        try:
-            c_tree_wrapper = OnlineSuffixTreeWrapper()
-            for char_val in test_string:
-                c_tree_wrapper.add_char(char_val)
-        except Exception as e_c_build:
-            print(f"  ERROR (OnlineSuffixTreeWrapper build, str {i+1}): {e_c_build} for '{test_string[:50]}...'")
-            if not current_test_iteration_failed: fail_count += 1 # Avoid double count if Python also failed
-            current_test_iteration_failed = True
-            total_c_wrapper_add_char_time += (time.perf_counter() - start_c_build_time)
-            if c_tree_wrapper and hasattr(c_tree_wrapper, '_c_tree_state') and c_tree_wrapper._c_tree_state:
-                 c_tree_wrapper.c_lib.free_suffix_tree_c(c_tree_wrapper._c_tree_state)
-                 c_tree_wrapper._c_tree_state = None
-            continue
-        total_c_wrapper_add_char_time += (time.perf_counter() - start_c_build_time)
-
-        # --- Test 1: Accumulated text (Optional, as primary test is `find`) ---
-        # Note: `get_internal_text()` can be slow if called many times.
-        # py_text_content = py_tree.text
-        # c_text_content_wrapper = c_tree_wrapper.get_internal_text()
-        # if py_text_content != c_text_content_wrapper:
-        #     print(f"  MISMATCH (Text, str {i+1}) for '{test_string[:50]}...'")
-        #     # ... (details) ...
-        #     if not current_test_iteration_failed: fail_count += 1
-        #     current_test_iteration_failed = True
-
-        # --- Test 2: `find` method for all substrings and some non-substrings ---
-        # Generate patterns once per test_string
-        all_substrings_of_test_str = get_all_substrings(test_string)
-        
-        # Generate some likely non-substrings
-        non_substrings_generated = []
-        for _ in range(min(5, len(test_string) + 2)): # Generate a few, relative to string length
-            len_non_sub = random.randint(1, max(1, len(test_string) // 2)) # Shorter non-substrings
-            potential_non_sub = "".join(random.choices(['0', '1', 'x'], k=len_non_sub)) # Include 'x' to ensure it is non-binary
-            if potential_non_sub not in all_substrings_of_test_str and potential_non_sub not in non_substrings_generated:
-                non_substrings_generated.append(potential_non_sub)
-        if test_string: # Add specific non-substrings if string is not empty
-             non_substrings_generated.extend([
-                test_string + random.choice(['0','1','$']),
-                random.choice(['0','1','$']) + test_string,
-                "alpha", "beta01"
-            ])
-        else: # For empty test_string, non-substrings are any non-empty string.
-            non_substrings_generated.extend(["0", "1", "a"])
-        
-        patterns_for_find_test = list(set(all_substrings_of_test_str + non_substrings_generated))
-        # Limit number of patterns to test if it becomes too large, e.g. for very long strings.
-        if len(patterns_for_find_test) > 2 * len(test_string) + 10 and len(test_string) > 50:
-            patterns_for_find_test = random.sample(patterns_for_find_test, 2 * len(test_string) + 10)
-
-        for pattern_idx, pattern_to_test in enumerate(patterns_for_find_test):
-            py_found_result, c_found_result = False, False # Default if error occurs
-            try:
-                py_found_result = py_tree.find(pattern_to_test)
-            except Exception as e_py_find:
-                print(f"  ERROR (Python find, str {i+1}, pattern '{pattern_to_test}'): {e_py_find}")
-                if not current_test_iteration_failed: fail_count += 1
-                current_test_iteration_failed = True; break 
-            
-            try:
-                c_found_result = c_tree_wrapper.find(pattern_to_test)
-            except Exception as e_c_find:
-                print(f"  ERROR (C wrapper find, str {i+1}, pattern '{pattern_to_test}'): {e_c_find}")
-                if not current_test_iteration_failed: fail_count += 1
-                current_test_iteration_failed = True; break
-
-            if py_found_result != c_found_result:
-                print(f"  MISMATCH (find(), str {i+1}) for pattern '{pattern_to_test}' on string '{test_string[:70]}...'")
-                print(f"    PythonOnlineSuffixTree found: {py_found_result}")
-                print(f"    OnlineSuffixTreeWrapper found: {c_found_result}")
-                if not current_test_iteration_failed: fail_count += 1
-                current_test_iteration_failed = True; break 
-        
-        if not current_test_iteration_failed:
-            success_count += 1
-        
-        # Cleanup C-wrapper instance for this iteration to free C memory if not using __del__ reliably
-        if c_tree_wrapper and hasattr(c_tree_wrapper, '_c_tree_state') and c_tree_wrapper._c_tree_state:
-            c_tree_wrapper.c_lib.free_suffix_tree_c(c_tree_wrapper._c_tree_state)
-            c_tree_wrapper._c_tree_state = None
+    num_workers = max_workers or os.cpu_count() or 1
+    chunk_size = max(64, -(-num_strings // (num_workers * 4))) # ~4 chunks per worker
+    start_wall_time_ns = time.perf_counter_ns()
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = {executor.submit(_check_chunk, start, test_strings[start:start + chunk_size], seed, fail_fast): start
+                   for start in range(0, len(test_strings), chunk_size)}
+        for future in as_completed(futures):
+            start = futures[future]
+            chunk_checked, chunk_failures, chunk_py_times_ns, chunk_c_times_ns = future.result()
+            chunk_count = len(chunk_py_times_ns)
+            py_times_ns[start:start + chunk_count] = chunk_py_times_ns
+            c_times_ns[start:start + chunk_count] = chunk_c_times_ns
+            processed[start:start + chunk_count] = True
+            processed_count += chunk_count
+            fail_count += len(chunk_failures)
+            success_count += chunk_checked - len(chunk_failures)
+            if chunk_failures:
+                failure_messages[start] = chunk_failures
+            report(processed_count, f". Current Success: {success_count}, Fail: {fail_count}")
+            if fail_fast and chunk_failures:
+                executor.shutdown(wait=False, cancel_futures=True)
+                break
+    wall_time = (time.perf_counter_ns() - start_wall_time_ns) / 1e9
 
-        if (i + 1) % max(1, num_strings // 20) == 0 or (i+1) == num_strings:
-            progress = ((i + 1) / num_strings) * 100
-            print(f"  Progress: {progress:.1f}% ({i+1}/{num_strings}). Current Success: {success_count}, Fail: {fail_count}")
+    # Structured diagnostic dump: one write for all failures, in string order.
+    if failure_messages:
+        sys.stdout.flush()
+        dump = [message for start in sorted(failure_messages) for message in failure_messages[start]]
+        if fail_fast:
+            dump = dump[:1]
+        sys.stderr.write("\n".join(dump) + "\n")
+        sys.stderr.flush()
 
     print(f"\n--- Online Suffix Tree Test Summary ---")
-    print(f"Total strings tested: {num_strings:,}")
+    string_indices = np.arange(num_strings) # Index of every reported string in the full test set
+    if fail_fast and fail_count:
+        print(f"Stopped at the first failure (--fail-fast): {processed_count:,} of {num_strings:,} strings were built "
+              f"and timed, {success_count + fail_count:,} were checked.")
+        num_strings = processed_count
+        # Chunks finish out of order, so the built strings need not be contiguous.
+        string_indices = np.flatnonzero(processed)
+        py_times_ns, c_times_ns = py_times_ns[processed], c_times_ns[processed]
+        test_strings = [s for s, done in zip(test_strings, processed) if done]
+    print(f"Total strings tested: {success_count + fail_count:,}")
     print(f"Successful string tests (all patterns matched): {success_count:,}")
     print(f"Failed string tests (build error or pattern mismatch): {fail_count:,}")
+    print(f"Wall time over {num_workers} worker process(es): {wall_time:.4f}s")
     if num_strings > 0:
-        print(f"Average PythonOnlineSuffixTree add_char time per string: {total_py_add_char_time/num_strings:.6e}s")
-        print(f"Average OnlineSuffixTreeWrapper add_char time per string: {total_c_wrapper_add_char_time/num_strings:.6e}s")
+        print(f"Average PythonOnlineSuffixTree add_string time per string: {py_times_ns.sum()/num_strings/1e9:.6e}s")
+        print(f"Average OnlineSuffixTreeWrapper add_string time per string: {c_times_ns.sum()/num_strings/1e9:.6e}s")
+        print("Build time per string:")
+        print_latency_percentiles("PythonOnlineSuffixTree", py_times_ns)
+        print_latency_percentiles("OnlineSuffixTreeWrapper", c_times_ns)
+    print_resource_usage()
+    if csv_path is not None:
+        lengths = np.fromiter(map(len, test_strings), dtype=np.int64, count=num_strings)
+        rows = np.column_stack((string_indices, lengths, py_times_ns, c_times_ns))
+        np.savetxt(csv_path, rows, fmt="%d", delimiter=",", header="index,length,py_ns,c_ns", comments="")
+        print(f"Per-string build times written to {csv_path}")
 
     if fail_count == 0 and num_strings > 0:
         print("\nAll online suffix tree tests passed!")
@@ -241,28 +470,15 @@ def run_tests(num_strings: int = 10000, min_str_len: int = 30, max_str_len: int
     else:
         print(f"\n{fail_count} string test(s) failed. Please review mismatches or errors above.")
         # sys.exit(1) # Optionally exit with error code if tests fail
+    return fail_count == 0
 
 if __name__ == "__main__":
     # Check if C library exists, otherwise the wrapper will fail loudly.
     # The wrapper itself tries to load it and gives a hint.
-    num_test_strings_arg = 1000 # Default to a smaller number for quick __main__ execution
-    min_len_arg = 10
-    max_len_arg = 50
-    
-    # Allow overriding from command line for quick tests
-    if len(sys.argv) > 1:
-        try:
-            num_test_strings_arg = int(sys.argv[1])
-            if num_test_strings_arg <=0: raise ValueError("Number of strings must be positive.")
-            if len(sys.argv) > 2: 
-                min_len_arg = int(sys.argv[2])
-                if min_len_arg <=0: raise ValueError("Min length must be positive.")
-            if len(sys.argv) > 3: 
-                max_len_arg = int(sys.argv[3])
-                if max_len_arg < min_len_arg: raise ValueError("Max length must be >= min length.")
-        except ValueError as e_args:
-            print(f"Invalid argument: {e_args}")
-            print("Usage: python test_online_suffix.py [num_strings (int>0)] [min_len (int>0)] [max_len (int>=min_len)]")
-            sys.exit(1)
-
-    run_tests(num_strings=num_test_strings_arg, min_str_len=min_len_arg, max_str_len=max_len_arg)
+    # Defaults are small for a quick __main__ execution.
+    args = parse_string_test_args(description="Compares the Python and C-backed online suffix trees on random strings.",
+                                  num_strings_default=1000, min_len_default=10, max_len_default=50)
+    all_passed = run_tests(num_strings=args.num_strings, min_str_len=args.min_len, max_str_len=args.max_len,
+                           seed=args.seed, csv_path=args.csv_path, fail_fast=args.fail_fast)
+    if args.fail_fast and not all_passed:
+        sys.exit(1) # --fail-fast also reports the failure through the exit status